@@ -1,10 +1,67 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
-def fetch_internshala(role, location, job_type):
+from html_parsing import get_extractor
+
+# Pages from every source are fetched at once over one pooled keep-alive session
+AGGREGATOR_MAX_WORKERS = int(os.getenv("AGGREGATOR_MAX_WORKERS", "16"))
+
+# Timeout for a single page request, and how long aggregate_jobs waits for a
+# source before returning whatever pages have arrived
+AGGREGATOR_REQUEST_TIMEOUT = float(os.getenv("AGGREGATOR_REQUEST_TIMEOUT", "10"))
+AGGREGATOR_SOURCE_DEADLINE = float(os.getenv("AGGREGATOR_SOURCE_DEADLINE", "8"))
+
+INTERNSHALA_BASE_URL = "https://internshala.com"
+
+class JobSource(NamedTuple):
+    """A job board: which pages to fetch for a query and how to read one"""
+    name: str
+    # (role, location, job_type) -> page URLs
+    page_urls: Callable[[str, str, str], List[str]]
+    # (raw html, location, job_type) -> job dicts
+    parse: Callable[[bytes, str, str], List[Dict]]
+    deadline: float = AGGREGATOR_SOURCE_DEADLINE
+
+_session: Optional[requests.Session] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+def _get_session() -> requests.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=AGGREGATOR_MAX_WORKERS)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=AGGREGATOR_MAX_WORKERS, thread_name_prefix="aggregator")
+        return _executor
+
+def fetch_page(url: str) -> bytes:
+    """
+    GET one page over the shared session; raises for network errors and
+    non-200 responses. Returns the raw body: parsers decode it themselves,
+    which skips requests' charset detection over the whole page.
+    """
+    response = _get_session().get(url, timeout=AGGREGATOR_REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+def internshala_urls(role, location, job_type, base_url=INTERNSHALA_BASE_URL, pages=2):
     # Build the search URL based on provided parameters
-    base_url = "https://internshala.com/internships/"
-    url = base_url
+    url = f"{base_url}/internships/"
     if location and role:
         url += f"{location}-internship/jobs/{role}"
     elif location:
@@ -13,45 +70,135 @@ def fetch_internshala(role, location, job_type):
         url += f"work-from-home-{role}-internship"
     else:
         url += "work-from-home-internship"
+    return [url + (f"/page-{page}" if page > 1 else "") for page in range(1, pages + 1)]
+
+# Elements read from each Internshala search result card
+INTERNSHALA_CARD = ('div', 'individual_internship')
+INTERNSHALA_FIELDS = {
+    'title': ('div', 'heading_4_5'),
+    'company': ('a', 'link_display_like_text'),
+    'href': ('a', 'view_detail_button', 'href'),
+    'description': ('div', 'internship_other_details_container'),
+    'stipend': ('span', 'stipend'),
+    'start_date': ('div', 'start_immediately_desktop'),
+    'duration': ('div', 'other_detail_item duration'),
+}
 
+def parse_internshala(html, location, job_type):
     jobs = []
-    for page in range(1, 3):  # Scrape first 2 pages
-        paged_url = url + (f"/page-{page}" if page > 1 else "")
-        try:
-            response = requests.get(paged_url, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                for job_card in soup.find_all('div', class_='individual_internship'):
-                    title_tag = job_card.find('div', class_='heading_4_5')
-                    company_tag = job_card.find('a', class_='link_display_like_text')
-                    link_tag = job_card.find('a', class_='view_detail_button')
-                    desc_tag = job_card.find('div', class_='internship_other_details_container')
-                    stipend_tag = job_card.find('span', class_='stipend')
-                    start_date_tag = job_card.find('div', class_='start_immediately_desktop')
-                    duration_tag = job_card.find('div', class_='other_detail_item duration')
-                    title = title_tag.text.strip() if title_tag else 'N/A'
-                    company = company_tag.text.strip() if company_tag else 'N/A'
-                    link = f"https://internshala.com{link_tag['href']}" if link_tag and link_tag.has_attr('href') else ''
-                    desc = desc_tag.text.strip() if desc_tag else ''
-                    stipend = stipend_tag.text.strip() if stipend_tag else ''
-                    start_date = start_date_tag.text.strip() if start_date_tag else ''
-                    duration = duration_tag.text.strip() if duration_tag else ''
-                    jobs.append({
-                        'title': title,
-                        'company': company,
-                        'location': location or 'N/A',
-                        'type': job_type or 'Internship',
-                        'link': link,
-                        'description': desc,
-                        'stipend': stipend,
-                        'start_date': start_date,
-                        'duration': duration
-                    })
-        except Exception as e:
-            # Log or handle error if needed
-            pass
+    for card in get_extractor()(html, INTERNSHALA_CARD, INTERNSHALA_FIELDS):
+        jobs.append({
+            'title': card['title'] or 'N/A',
+            'company': card['company'] or 'N/A',
+            'location': location or 'N/A',
+            'type': job_type or 'Internship',
+            'link': f"{INTERNSHALA_BASE_URL}{card['href']}" if card['href'] is not None else '',
+            'description': card['description'] or '',
+            'stipend': card['stipend'] or '',
+            'start_date': card['start_date'] or '',
+            'duration': card['duration'] or ''
+        })
     return jobs
 
+def internshala_source(base_url: str = INTERNSHALA_BASE_URL, pages: int = 2,
+                       deadline: float = AGGREGATOR_SOURCE_DEADLINE) -> JobSource:
+    """Internshala search results, first `pages` pages"""
+    return JobSource(
+        name="internshala",
+        page_urls=lambda role, location, job_type: internshala_urls(role, location, job_type, base_url, pages),
+        parse=parse_internshala,
+        deadline=deadline
+    )
+
+# Sources queried by aggregate_jobs; add Glassdoor/LinkedIn/Indeed here once implemented
+SOURCES: List[JobSource] = [internshala_source()]
+
+def _fetch_jobs(source: JobSource, url: str, location, job_type) -> Tuple[List[Dict], float]:
+    """Jobs on one page tagged with their source, plus when the page was done"""
+    jobs = source.parse(fetch_page(url), location, job_type)
+    for job in jobs:
+        job['source'] = source.name
+    return jobs, time.perf_counter()
+
+def aggregate_jobs(
+    role,
+    location,
+    job_type,
+    sources: Optional[Sequence[JobSource]] = None,
+    pages: slice = slice(None)
+) -> Dict:
+    """
+    Fetch every page of every source concurrently and merge the listings.
+    `pages` selects a subset of each source's pages, e.g. slice(0, 1) for the first.
+
+    Each source gets its own deadline, counted from the start of the call.
+    Pages still outstanding at that point are dropped, so one slow board
+    returns partial results instead of holding up the others. Returns
+    {"jobs": [...], "sources": {name: {"status", "pages", "pagesFetched",
+    "jobs", "errors", "elapsedMs"}}} where status is "ok", "partial",
+    "timeout" or "error".
+    """
+    sources = SOURCES if sources is None else sources
+    start = time.perf_counter()
+    pool = _get_executor()
+    submitted: Dict[str, List[Future]] = {
+        source.name: [
+            pool.submit(_fetch_jobs, source, url, location, job_type)
+            for url in source.page_urls(role, location, job_type)[pages]
+        ]
+        for source in sources
+    }
+
+    jobs_by_source: Dict[str, List[Dict]] = {}
+    report: Dict[str, Dict] = {}
+    # Deadlines all run from `start`, so waiting on sources in deadline order never overshoots one
+    for source in sorted(sources, key=lambda source: source.deadline):
+        futures = submitted[source.name]
+        _, not_done = wait(futures, timeout=max(0.0, start + source.deadline - time.perf_counter()))
+        for future in not_done:
+            future.cancel()
+
+        jobs: List[Dict] = []
+        errors: List[str] = []
+        fetched = 0
+        finished = start
+        for future in futures:
+            if future in not_done:
+                finished = start + source.deadline
+                continue
+            error = future.exception()
+            if error is not None:
+                errors.append(str(error))
+                continue
+            page_jobs, page_finished = future.result()
+            jobs.extend(page_jobs)
+            finished = max(finished, page_finished)
+            fetched += 1
+
+        if fetched == len(futures):
+            status = "ok"
+        elif fetched:
+            status = "partial"
+        else:
+            status = "timeout" if not_done else "error"
+        jobs_by_source[source.name] = jobs
+        report[source.name] = {
+            "status": status,
+            "pages": len(futures),
+            "pagesFetched": fetched,
+            "jobs": len(jobs),
+            "errors": errors,
+            "elapsedMs": round((finished - start) * 1000)
+        }
+
+    return {
+        "jobs": [job for source in sources for job in jobs_by_source[source.name]],
+        "sources": report
+    }
+
+def fetch_internshala(role, location, job_type):
+    return aggregate_jobs(role, location, job_type, [internshala_source()])["jobs"]
+
 def fetch_glassdoor(role, location, job_type):
     # TODO: Implement Glassdoor scraping or API
     return []
@@ -62,4 +209,4 @@ def fetch_linkedin(role, location, job_type):
 
 def fetch_indeed(role, location, job_type):
     # TODO: Implement Indeed scraping or API
-    return [] 
\ No newline at end of file
+    return []
@@ -0,0 +1,248 @@
+import json
+import os
+import re
+import threading
+from typing import Annotated, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, ValidationError
+
+# Times the model is asked to fix a response that cannot be repaired locally
+AI_RESPONSE_REPAIR_ATTEMPTS = int(os.getenv("AI_RESPONSE_REPAIR_ATTEMPTS", "1"))
+
+# Repair prompts carry at most this many characters of the broken response
+REPAIR_MAX_RESPONSE_CHARS = 8000
+
+CODE_FENCE_PATTERN = re.compile(r"```(?:json|JSON)?\s*(.*?)\s*```", re.DOTALL)
+# A string literal (kept as is) or a comma directly before a closing bracket; the
+# string-aware substitution only runs when the cheap check finds a candidate
+TRAILING_COMMA_PATTERN = re.compile(r'("(?:[^"\\]|\\.)*")|,(\s*[}\]])')
+TRAILING_COMMA_CHECK = re.compile(r",\s*[}\]]")
+
+REPAIR_PROMPT = """The response below was supposed to be a single JSON object for a resume analysis, but it could not be used: {error}
+
+Return only the corrected JSON object, with no explanation and no code fences. Keep every value the response already has; "ats_score" must be an integer from 0 to 100.
+
+RESPONSE:
+{response}
+"""
+
+
+def _round_number(value):
+    # Models sometimes answer 7.5 for an integer score
+    return round(value) if isinstance(value, float) else value
+
+
+Score = Annotated[int, BeforeValidator(_round_number), Field(ge=0, le=100)]
+SubScore = Annotated[int, BeforeValidator(_round_number), Field(ge=0, le=10)]
+
+
+class KeywordAnalysis(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    matched_keywords: List[str] = []
+    missing_keywords: List[str] = []
+    keyword_match_percentage: Optional[Score] = None
+    technical_keywords: List[str] = []
+    soft_skills: List[str] = []
+    industry_terms: List[str] = []
+
+
+class ContentStrength(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    action_verbs_score: Optional[SubScore] = None
+    quantified_achievements: Optional[Annotated[int, BeforeValidator(_round_number), Field(ge=0)]] = None
+    relevance_score: Optional[SubScore] = None
+    professional_language_score: Optional[SubScore] = None
+
+
+class AIAnalysis(BaseModel):
+    """The ai_analysis schema that build_analysis_prompt asks Gemini for"""
+    model_config = ConfigDict(extra="allow")
+
+    ats_score: Score
+    keyword_analysis: KeywordAnalysis = KeywordAnalysis()
+    content_strength: ContentStrength = ContentStrength()
+    improvement_suggestions: List[str] = []
+    role_fit_analysis: Optional[str] = None
+    inferred_role: Optional[str] = None
+    general_feedback: Optional[str] = None
+    critical_gaps: List[str] = []
+
+
+class AnalysisParseError(ValueError):
+    """A model response that is not a valid analysis, even after repair"""
+
+
+class ParseStats:
+    """Counters of how model responses were parsed, reported by /health"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            "responses": 0,
+            "parsed": 0,
+            "repaired": 0,
+            "repairPrompts": 0,
+            "failures": 0,
+            "repairs": {"codeFence": 0, "extractedObject": 0, "trailingCommas": 0}
+        }
+
+    def record(self, outcome: str, repairs: Tuple[str, ...] = ()) -> None:
+        with self._lock:
+            self._counters[outcome] += 1
+            for repair in repairs:
+                self._counters["repairs"][repair] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._counters, "repairs": dict(self._counters["repairs"])}
+
+
+parse_stats = ParseStats()
+
+
+_decoder = json.JSONDecoder()
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """The first balanced {...} in text, skipping braces inside string literals"""
+    start = text.find("{")
+    while start != -1:
+        try:
+            # Valid JSON: the C decoder finds where the object ends
+            _, end = _decoder.raw_decode(text, start)
+            return text[start:end]
+        except ValueError:
+            pass
+        depth = 0
+        in_string = escaped = False
+        for index in range(start, len(text)):
+            char = text[index]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:index + 1]
+        start = text.find("{", start + 1)
+    return None
+
+
+def repair_json(text: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Fix what models commonly wrap around or get wrong in JSON: code fences,
+    prose before or after the object, and trailing commas. Returns the
+    repaired text and the names of the repairs applied.
+    """
+    repairs = []
+    fenced = CODE_FENCE_PATTERN.search(text) if "```" in text else None
+    if fenced:
+        text = fenced.group(1)
+        repairs.append("codeFence")
+
+    stripped = text.strip()
+    if not (stripped.startswith("{") and stripped.endswith("}")):
+        extracted = extract_json_object(stripped)
+        if extracted is not None:
+            stripped = extracted
+            repairs.append("extractedObject")
+
+    if TRAILING_COMMA_CHECK.search(stripped):
+        without_commas = TRAILING_COMMA_PATTERN.sub(lambda match: match.group(1) or match.group(2), stripped)
+        if without_commas != stripped:
+            stripped = without_commas
+            repairs.append("trailingCommas")
+    return stripped, tuple(repairs)
+
+
+def validate_analysis(text: str) -> Dict:
+    """Parse and validate a JSON analysis; raises ValueError (or ValidationError, a subclass)"""
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+    return AIAnalysis.model_validate(data).model_dump(exclude_unset=True)
+
+
+def _parse_locally(response_text: str) -> Tuple[Optional[Dict], str]:
+    """(analysis, "") on success, or (None, reason it failed)"""
+    try:
+        analysis = validate_analysis(response_text)
+        parse_stats.record("parsed")
+        return analysis, ""
+    except ValueError as error:
+        reason = _describe(error)
+
+    repaired, repairs = repair_json(response_text)
+    if repairs:
+        try:
+            analysis = validate_analysis(repaired)
+            parse_stats.record("repaired", repairs)
+            return analysis, ""
+        except ValueError as error:
+            reason = _describe(error)
+    return None, reason
+
+
+def _describe(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        first = error.errors()[0]
+        location = ".".join(str(part) for part in first["loc"]) or "response"
+        return f"{location}: {first['msg']}"
+    return str(error)
+
+
+def build_repair_prompt(response_text: str, reason: str) -> str:
+    return REPAIR_PROMPT.format(error=reason, response=response_text[:REPAIR_MAX_RESPONSE_CHARS])
+
+
+def parse_analysis(response_text: str, regenerate: Optional[Callable[[str], str]] = None) -> Dict:
+    """
+    Validated analysis from a model response. Responses that fail are
+    repaired locally first; if that is not enough and `regenerate(prompt)`
+    is given, the model is asked to fix its own output (only the broken
+    response is sent, not the resume) up to AI_RESPONSE_REPAIR_ATTEMPTS times.
+    Raises AnalysisParseError when nothing works.
+    """
+    parse_stats.record("responses")
+    analysis, reason = _parse_locally(response_text)
+    attempts = AI_RESPONSE_REPAIR_ATTEMPTS if regenerate else 0
+    for _ in range(attempts):
+        if analysis is not None:
+            break
+        parse_stats.record("repairPrompts")
+        response_text = regenerate(build_repair_prompt(response_text, reason))
+        analysis, reason = _parse_locally(response_text)
+    if analysis is None:
+        parse_stats.record("failures")
+        raise AnalysisParseError(f"Could not parse AI response ({reason})")
+    return analysis
+
+
+async def parse_analysis_async(
+    response_text: str,
+    regenerate: Optional[Callable[[str], Awaitable[str]]] = None
+) -> Dict:
+    """parse_analysis with an async `regenerate`"""
+    parse_stats.record("responses")
+    analysis, reason = _parse_locally(response_text)
+    attempts = AI_RESPONSE_REPAIR_ATTEMPTS if regenerate else 0
+    for _ in range(attempts):
+        if analysis is not None:
+            break
+        parse_stats.record("repairPrompts")
+        response_text = await regenerate(build_repair_prompt(response_text, reason))
+        analysis, reason = _parse_locally(response_text)
+    if analysis is None:
+        parse_stats.record("failures")
+        raise AnalysisParseError(f"Could not parse AI response ({reason})")
+    return analysis
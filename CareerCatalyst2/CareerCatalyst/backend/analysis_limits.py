@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from regex_engine import regex_stats
+
+# Longest resume or job description text (in characters) that is analyzed;
+# a dense 25-page CV is about 100k characters
+ANALYSIS_MAX_CHARS = int(os.getenv("ANALYSIS_MAX_CHARS", "100000"))
+
+# CPU seconds one analysis may spend on detectors, local scoring and the
+# report (time waiting for Gemini is not counted); 0 disables the budget
+ANALYSIS_CPU_SECONDS = float(os.getenv("ANALYSIS_CPU_SECONDS", "2"))
+
+# Long detector loops check the budget once per this many iterations
+BUDGET_CHECK_INTERVAL = 1024
+
+
+class CpuBudgetExceeded(ValueError):
+    """An analysis that used up its CPU time budget"""
+
+
+class LimitStats:
+    """Counters of analyses rejected for their size or stopped by the CPU budget, reported by /health"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {"oversizedInputs": 0, "budgetExceeded": 0}
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._counters[outcome] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._counters, "maxChars": ANALYSIS_MAX_CHARS, "cpuSeconds": ANALYSIS_CPU_SECONDS,
+                "regex": regex_stats()
+            }
+
+
+limit_stats = LimitStats()
+
+# The budget charged by the code running in this thread or task, if any
+_current_budget: ContextVar[Optional["CpuBudget"]] = ContextVar("cpu_budget", default=None)
+
+
+def check_text_size(text: str, what: str = "Resume") -> None:
+    """Raise ValueError for text longer than ANALYSIS_MAX_CHARS, before any detector scans it"""
+    if len(text) > ANALYSIS_MAX_CHARS:
+        limit_stats.record("oversizedInputs")
+        raise ValueError(f"{what} is too long ({len(text)} characters). The limit is {ANALYSIS_MAX_CHARS} characters.")
+
+
+class CpuBudget:
+    """
+    CPU time one analysis may use. Only time inside charge() counts, and it
+    is measured per thread, so neither waiting for Gemini nor other requests'
+    coroutines running between awaits use up the budget. Work is stopped
+    with CpuBudgetExceeded when a charge starts over budget, or when a long
+    loop inside one calls check_cpu_budget().
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = ANALYSIS_CPU_SECONDS if seconds is None else seconds
+        self.spent = 0.0
+        self._started: Optional[float] = None
+
+    def used(self) -> float:
+        """CPU seconds charged so far, including the charge in progress"""
+        running = time.thread_time() - self._started if self._started is not None else 0.0
+        return self.spent + running
+
+    def check(self) -> None:
+        if self.seconds > 0 and self.used() > self.seconds:
+            limit_stats.record("budgetExceeded")
+            raise CpuBudgetExceeded(
+                f"Analysis stopped after {self.used():.2f}s of CPU time (the limit is {self.seconds:g}s). "
+                "Try a shorter or simpler resume."
+            )
+
+    @contextmanager
+    def charge(self) -> Iterator[None]:
+        """Count the CPU time of the block against the budget; nested charges count once"""
+        if self._started is not None:
+            yield
+            return
+        self.check()
+        token = _current_budget.set(self)
+        self._started = time.thread_time()
+        try:
+            yield
+        finally:
+            self.spent += time.thread_time() - self._started
+            self._started = None
+            _current_budget.reset(token)
+
+
+def check_cpu_budget() -> None:
+    """Stop the analysis being charged here if it is over budget (does nothing outside a charge)"""
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.check()
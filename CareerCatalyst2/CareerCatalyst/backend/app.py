@@ -1,35 +1,64 @@
-from fastapi import FastAPI, UploadFile, Form, HTTPException, File
-from fastapi.responses import JSONResponse
+from dotenv import load_dotenv
+from log_config import configure_logging
+
+# Load environment variables and set up structured logs at LOG_LEVEL before
+# the backend modules are imported, so warnings they log while loading are
+# formatted too; per-request debug output is off unless LOG_LEVEL=DEBUG
+load_dotenv()
+configure_logging()
+
+from fastapi import FastAPI, UploadFile, Form, HTTPException, File, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from ats_analyzer import analyzeResume
-import pdfplumber
-from typing import Optional
-import io
+from ats_analyzer import (
+    MODEL_NAME, analysis_flights, analyzeResumeAsync, analyzeResumeStream, result_cache, validate_input_size,
+    validate_scoring_mode
+)
+from analysis_limits import check_text_size, limit_stats
+from llm_client import generate_content_async, llm_stats
+import model_registry
+from model_registry import get_gemini_model
+from text_extraction import extract_text_from_stream
+from job_store import JobStore
+from job_matching import JobMatcher
+from semantic_matching import SEMANTIC_ENCODER, SemanticJobIndex
+from job_descriptions import CompiledJobDescription, JobDescription, JobDescriptionStore
+from prompt_compaction import prompt_stats
+from ai_response import parse_stats
+from incremental_analysis import analyzeResumeIncremental, incremental_stats
+from single_flight import SingleFlight
+from metrics import render_metrics
+from batch_analysis import (
+    BATCH_MAX_FILE_BYTES, BATCH_MAX_RESUMES, BATCH_MAX_TOTAL_BYTES, extract_job_description,
+    iter_batch_analysis, ranking_summary, read_zip_resumes
+)
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import hashlib
+import logging
 import os
-from dotenv import load_dotenv
-import google.generativeai as genai
 import json
 
-# Try to import docx, handle if not available
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-    print("Warning: python-docx not installed. DOCX support disabled.")
-
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Configure Gemini AI
+# Gemini is configured lazily and shared with the analyzer (see model_registry)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-pro')
-else:
-    model = None
-    print("Warning: GEMINI_API_KEY not found. AI assistant will use fallback responses.")
+if not GEMINI_API_KEY:
+    logger.warning("GEMINI_API_KEY not found. AI assistant will use fallback responses.")
+
+# Aggregated job listings, served from SQLite and refreshed in the background
+job_store = JobStore.from_env()
+job_matcher = JobMatcher(job_store, {"semantic": SemanticJobIndex} if SEMANTIC_ENCODER != "off" else None)
+
+# Job descriptions compiled once and referenced by ID from later analyses
+job_descriptions = JobDescriptionStore.from_env()
+
+# Identical assistant questions in flight (same prompt) share one Gemini call
+assistant_flights = SingleFlight()
+
+# Batch uploads are read in chunks of this size, so an oversized file is rejected early
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
 # Create FastAPI app
 app = FastAPI(title="CareerCatalyst API", version="1.0.0")
@@ -49,58 +78,150 @@ def home():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "resultCache": result_cache.stats(),
+        "jobStore": job_store.stats(),
+        "jobMatcher": job_matcher.stats(),
+        "jobDescriptions": job_descriptions.stats(),
+        "prompts": prompt_stats.stats(),
+        "aiResponses": parse_stats.stats(),
+        "llm": llm_stats(),
+        "coalescing": {"analysis": analysis_flights.stats(), "assistant": assistant_flights.stats()},
+        "incremental": incremental_stats.stats(),
+        "limits": limit_stats.stats(),
+        "loadedModels": model_registry.loaded()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Stage latency histograms and LLM token/error counters of this worker, for Prometheus to scrape"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 class ResumeRequest(BaseModel):
     resume: str
     jobDescription: Optional[str] = None
+    jobDescriptionId: Optional[str] = None  # from POST /job-descriptions; takes precedence over jobDescription
+    scoringMode: str = "ai"  # "ai" or "heuristic" (local scoring, no LLM call)
+    incremental: bool = False  # reuse findings of sections unchanged since an earlier submission
 
 def extract_text_from_file(file: UploadFile) -> str:
     """Extract text from uploaded PDF or DOCX file"""
-    filename = file.filename.lower()
-    
-    # Read file content into memory
-    file_content = file.file.read()
+    # Read straight from the spooled upload instead of copying it into memory
+    file.file.seek(0)
+    text = extract_text_from_stream(file.filename, file.file)
     file.file.seek(0)  # Reset file pointer
-    
-    if filename.endswith('.pdf'):
-        try:
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-                return text.strip()
-        except Exception as e:
-            raise ValueError(f"Error processing PDF file: {str(e)}")
-            
-    elif filename.endswith('.docx'):
-        if not DOCX_AVAILABLE:
-            raise ValueError("DOCX support not available. Please install python-docx: pip install python-docx")
+    return text
+
+def lookup_job_description(job_description_id: str) -> CompiledJobDescription:
+    """Compiled job description for an ID, or a 404 telling the client to compile it again"""
+    compiled = job_descriptions.get(job_description_id)
+    if compiled is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown or expired job description ID '{job_description_id}'. Compile it again with POST /job-descriptions"
+        )
+    return compiled
+
+def resolve_job_description(
+    job_description_text: Optional[str],
+    job_description_file: Optional[UploadFile],
+    job_description_id: Optional[str] = None
+) -> Optional[JobDescription]:
+    """Job description from a compiled ID, an uploaded file or pasted text, in that order"""
+    if job_description_id:
+        return lookup_job_description(job_description_id)
+    if job_description_file:
+        # Extract text from job description file
         try:
-            doc = Document(io.BytesIO(file_content))
-            text = "\n".join([para.text for para in doc.paragraphs])
-            return text.strip()
+            return extract_text_from_file(job_description_file)
         except Exception as e:
-            raise ValueError(f"Error processing DOCX file: {str(e)}")
-            
-    elif filename.endswith('.txt'):
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Could not extract text from job description file: {str(e)}"
+            )
+    elif job_description_text and job_description_text.strip():
+        # Use provided text
+        return job_description_text.strip()
+    return None
+
+def check_scoring_mode(scoring_mode: str) -> None:
+    """Reject unknown scoring modes with a 400 before any work starts"""
+    try:
+        validate_scoring_mode(scoring_mode)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+def check_input_size(resume_text: str, job_description: Optional[JobDescription] = None) -> None:
+    """Reject a resume or job description too long to analyze with a 400 before any work starts"""
+    try:
+        validate_input_size(resume_text, job_description)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+async def read_upload(upload: UploadFile, limit: int) -> bytes:
+    """Read an upload in chunks, raising ValueError as soon as it is larger than limit bytes"""
+    if upload.size is not None and upload.size > limit:
+        raise ValueError(f"{upload.filename} is larger than {limit} bytes")
+    chunks = []
+    size = 0
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return b"".join(chunks)
+        size += len(chunk)
+        if size > limit:
+            raise ValueError(f"{upload.filename} is larger than {limit} bytes")
+        chunks.append(chunk)
+
+def stream_analysis_response(stages: AsyncIterator[Tuple[str, Dict]], request: Request) -> StreamingResponse:
+    """
+    Stream analysis stages as Server-Sent Events when the client accepts
+    text/event-stream, otherwise as NDJSON ({"stage": ..., "data": ...} per line)
+    """
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+    
+    def encode(stage: str, data: Dict) -> str:
+        if use_sse:
+            return f"event: {stage}\ndata: {json.dumps(data)}\n\n"
+        return json.dumps({"stage": stage, "data": data}) + "\n"
+    
+    async def body():
         try:
-            text = file_content.decode('utf-8')
-            return text.strip()
+            async for stage, data in stages:
+                yield encode(stage, data)
         except Exception as e:
-            raise ValueError(f"Error processing TXT file: {str(e)}")
-    else:
-        raise ValueError("Unsupported file type. Only PDF, DOCX, and TXT files are supported.")
+            logger.exception("Streaming analysis error: %s", e)
+            yield encode("error", {"detail": f"Analysis failed: {str(e)}"})
+    
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type)
 
 @app.post("/analyze-resume")
-def analyze_resume(req: ResumeRequest):
+async def analyze_resume(req: ResumeRequest):
     """Analyze resume text with optional job description"""
-    result = analyzeResume(req.resume, req.jobDescription)
+    check_scoring_mode(req.scoringMode)
+    job_description = (
+        await run_in_threadpool(lookup_job_description, req.jobDescriptionId) if req.jobDescriptionId
+        else req.jobDescription
+    )
+    # Async so that double submissions and identical template resumes share one Gemini call
+    analyze = analyzeResumeIncremental if req.incremental else analyzeResumeAsync
+    try:
+        result = await analyze(req.resume, job_description, scoring_mode=req.scoringMode)
+    except ValueError as ve:
+        # Resume too long, or analysis stopped by the CPU budget
+        raise HTTPException(status_code=400, detail=str(ve))
     return result
 
 @app.post("/analyze-resume-file")
 async def analyze_resume_file(
     resume_file: UploadFile = File(...),
     job_description_text: Optional[str] = Form(None),
-    job_description_file: Optional[UploadFile] = File(None)
+    job_description_file: Optional[UploadFile] = File(None),
+    job_description_id: Optional[str] = Form(None),
+    scoring_mode: str = Form("ai"),
+    incremental: bool = Form(False)
 ):
     """
     Analyze resume file with optional job description (text or file)
@@ -108,30 +229,20 @@ async def analyze_resume_file(
     """
     try:
         # Extract resume text
-        resume_text = extract_text_from_file(resume_file)
+        resume_text = await run_in_threadpool(extract_text_from_file, resume_file)
         if not resume_text.strip():
             raise HTTPException(status_code=400, detail="Could not extract text from resume file")
         
         # Handle job description
-        job_description = None
-        
-        if job_description_file:
-            # Extract text from job description file
-            try:
-                job_description = extract_text_from_file(job_description_file)
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Could not extract text from job description file: {str(e)}"
-                )
-        elif job_description_text and job_description_text.strip():
-            # Use provided text
-            job_description = job_description_text.strip()
+        job_description = resolve_job_description(job_description_text, job_description_file, job_description_id)
         
         # Analyze resume
-        result = analyzeResume(resume_text, job_description)
+        analyze = analyzeResumeIncremental if incremental else analyzeResumeAsync
+        result = await analyze(resume_text, job_description, scoring_mode=scoring_mode)
         return JSONResponse(content=result)
         
+    except HTTPException:
+        raise
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
@@ -139,26 +250,178 @@ async def analyze_resume_file(
 
 @app.post("/analyze-resume-quick")
 async def analyze_resume_quick(
-    resume_file: UploadFile = File(...)
+    resume_file: UploadFile = File(...),
+    scoring_mode: str = Form("ai")
 ):
     """
     Quick resume analysis without job description
     For general ATS compatibility check
     """
     try:
-        resume_text = extract_text_from_file(resume_file)
+        resume_text = await run_in_threadpool(extract_text_from_file, resume_file)
         if not resume_text.strip():
             raise HTTPException(status_code=400, detail="Could not extract text from resume file")
         
         # Analyze without job description
-        result = analyzeResume(resume_text, None)
+        result = await analyzeResumeAsync(resume_text, None, scoring_mode=scoring_mode)
         return JSONResponse(content=result)
         
+    except HTTPException:
+        raise
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+@app.post("/analyze-resume-stream")
+def analyze_resume_stream(req: ResumeRequest, request: Request):
+    """Streaming variant of /analyze-resume (NDJSON, or SSE with Accept: text/event-stream)"""
+    check_scoring_mode(req.scoringMode)
+    job_description = lookup_job_description(req.jobDescriptionId) if req.jobDescriptionId else req.jobDescription
+    check_input_size(req.resume, job_description)
+    stages = analyzeResumeStream(req.resume, job_description, req.scoringMode)
+    return stream_analysis_response(stages, request)
+
+@app.post("/analyze-resume-file-stream")
+async def analyze_resume_file_stream(
+    request: Request,
+    resume_file: UploadFile = File(...),
+    job_description_text: Optional[str] = Form(None),
+    job_description_file: Optional[UploadFile] = File(None),
+    job_description_id: Optional[str] = Form(None),
+    scoring_mode: str = Form("ai")
+):
+    """
+    Streaming variant of /analyze-resume-file and /analyze-resume-quick.
+    Sections and formatting issues arrive first, followed by the AI analysis,
+    the score and the markdown report.
+    """
+    check_scoring_mode(scoring_mode)
+    try:
+        resume_text = await run_in_threadpool(extract_text_from_file, resume_file)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    if not resume_text.strip():
+        raise HTTPException(status_code=400, detail="Could not extract text from resume file")
+    
+    job_description = resolve_job_description(job_description_text, job_description_file, job_description_id)
+    check_input_size(resume_text, job_description)
+    stages = analyzeResumeStream(resume_text, job_description, scoring_mode)
+    return stream_analysis_response(stages, request)
+
+@app.post("/analyze-resume-batch")
+async def analyze_resume_batch(
+    resume_files: Optional[List[UploadFile]] = File(None),
+    resume_zip: Optional[UploadFile] = File(None),
+    job_description_text: Optional[str] = Form(None),
+    job_description_file: Optional[UploadFile] = File(None),
+    job_description_id: Optional[str] = Form(None),
+    scoring_mode: str = Form("ai")
+):
+    """
+    Analyze many resumes (individual files and/or a zip) against one job description.
+    Streams NDJSON: one {"event": "result"} line per resume as it finishes,
+    then a final {"event": "ranking"} line ordered by totalScore.
+    Use scoring_mode=heuristic to pre-screen a large pool without LLM calls,
+    and job_description_id to send only the condensed requirements to Gemini.
+    """
+    check_scoring_mode(scoring_mode)
+    resumes = []
+    total_bytes = 0
+    try:
+        for upload in resume_files or []:
+            content = await read_upload(upload, BATCH_MAX_FILE_BYTES)
+            total_bytes += len(content)
+            if total_bytes > BATCH_MAX_TOTAL_BYTES:
+                raise ValueError(f"Batch is limited to {BATCH_MAX_TOTAL_BYTES} bytes of resumes")
+            resumes.append((upload.filename, content))
+        if resume_zip:
+            archive = await read_upload(resume_zip, BATCH_MAX_TOTAL_BYTES)
+            resumes.extend(read_zip_resumes(archive, BATCH_MAX_TOTAL_BYTES - total_bytes))
+        
+        job_description = None
+        if job_description_id:
+            job_description = await run_in_threadpool(lookup_job_description, job_description_id)
+        elif job_description_file:
+            job_description = extract_job_description(
+                job_description_file.filename, await read_upload(job_description_file, BATCH_MAX_FILE_BYTES)
+            )
+        elif job_description_text and job_description_text.strip():
+            job_description = job_description_text.strip()
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    
+    if not resumes:
+        raise HTTPException(status_code=400, detail="No resume files provided")
+    if len(resumes) > BATCH_MAX_RESUMES:
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {BATCH_MAX_RESUMES} resumes")
+    # Resumes are size-checked one by one as they are extracted
+    check_input_size("", job_description)
+    
+    async def stream_results():
+        completed = []
+        async for item in iter_batch_analysis(resumes, job_description, scoring_mode):
+            completed.append(item)
+            yield json.dumps({"event": "result", **item}) + "\n"
+        yield json.dumps({"event": "ranking", "ranking": ranking_summary(completed)}) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@app.post("/job-descriptions")
+async def create_job_description(
+    job_description_text: Optional[str] = Form(None),
+    job_description_file: Optional[UploadFile] = File(None)
+):
+    """
+    Compile a job description once: requirements, keywords, normalized skills
+    and token counts. Pass the returned jobDescriptionId as job_description_id
+    (or jobDescriptionId) to the analyze endpoints to reuse that work; Gemini
+    then receives the condensed requirements instead of the whole posting.
+    """
+    text = resolve_job_description(job_description_text, job_description_file)
+    if not text:
+        raise HTTPException(status_code=400, detail="No job description provided")
+    try:
+        check_text_size(text, "Job description")
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    compiled = await run_in_threadpool(job_descriptions.compile, text)
+    return compiled.to_dict()
+
+@app.get("/job-descriptions/{job_description_id}")
+def get_job_description(job_description_id: str):
+    """A compiled job description by ID (404 once it has expired)"""
+    return lookup_job_description(job_description_id).to_dict()
+
+@app.get("/jobs/search")
+async def search_jobs(role: str = "", location: str = "", job_type: str = ""):
+    """
+    Listings from every job board, deduplicated. Repeat queries are answered
+    from the job store and refreshed in the background once stale ("cache");
+    "sources" has the per-board status of the last crawl.
+    """
+    return await run_in_threadpool(job_store.search, role.strip(), location.strip(), job_type.strip())
+
+class JobMatchRequest(BaseModel):
+    resume: str
+    limit: int = 20
+    method: str = "bm25"  # "bm25" (shared terms) or "semantic" (embedding similarity)
+
+@app.post("/jobs/match")
+async def match_jobs(req: JobMatchRequest):
+    """
+    Rank every listing in the job store against a resume. "bm25" scores
+    listing titles and descriptions by the terms they share with the resume
+    (listed in matchedTerms); "semantic" by embedding cosine similarity.
+    """
+    if not req.resume.strip():
+        raise HTTPException(status_code=400, detail="Resume text is empty")
+    check_input_size(req.resume)
+    try:
+        return await run_in_threadpool(job_matcher.match, req.resume, req.limit, req.method)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
 class AIAssistantRequest(BaseModel):
     message: str
     resume_data: Optional[dict] = None
@@ -187,6 +450,7 @@ Current Resume Data:
 """
 
         # Use Gemini AI if available, otherwise fallback
+        model = get_gemini_model(MODEL_NAME)
         if model and GEMINI_API_KEY:
             try:
                 prompt = f"""
@@ -201,11 +465,11 @@ Provide specific, actionable advice. Include examples when helpful. Keep respons
 Focus on ATS optimization, keyword usage, quantifiable achievements, and professional formatting.
 """
                 
-                response = model.generate_content(prompt)
-                ai_response = response.text
+                prompt_key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+                ai_response = await assistant_flights.run(prompt_key, lambda: generate_content_async(model, prompt))
                 
             except Exception as e:
-                print(f"Gemini API error: {e}")
+                logger.warning("Gemini API error: %s", e)
                 ai_response = get_fallback_response(user_message)
         else:
             ai_response = get_fallback_response(user_message)
@@ -216,7 +480,7 @@ Focus on ATS optimization, keyword usage, quantifiable achievements, and profess
         })
         
     except Exception as e:
-        print(f"AI Assistant error: {e}")
+        logger.exception("AI Assistant error: %s", e)
         return JSONResponse(
             status_code=500,
             content={
@@ -6,6 +6,9 @@ from typing import Optional
 import io
 import os
 from dotenv import load_dotenv
+from skills_taxonomy import skill_taxonomy
+from job_descriptions import CompiledJobDescription, JobDescription
+from analysis_limits import CpuBudget, check_cpu_budget, check_text_size
 
 # Load environment variables
 load_dotenv()
@@ -234,18 +237,27 @@ PROJECTS
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
 
-def simple_ats_analysis(resume_text: str, job_description: Optional[str] = None) -> dict:
-    """Simple ATS analysis without heavy dependencies"""
+def simple_ats_analysis(resume_text: str, job_description: Optional[JobDescription] = None) -> dict:
+    """
+    Simple ATS analysis without heavy dependencies. A compiled job
+    description skips re-scanning the posting for every resume. Raises
+    ValueError for text longer than ANALYSIS_MAX_CHARS.
+    """
+    check_text_size(resume_text, "Resume")
+    if isinstance(job_description, str):
+        check_text_size(job_description, "Job description")
     
     # Basic keyword analysis
     resume_lower = resume_text.lower()
     
-    # Common ATS-friendly keywords
-    technical_keywords = ['python', 'java', 'javascript', 'sql', 'html', 'css', 'react', 'node', 'api', 'database', 'git', 'docker', 'kubernetes', 'aws', 'azure', 'mongodb', 'postgresql', 'django', 'flask', 'vue', 'angular', 'typescript', 'machine learning', 'data science', 'artificial intelligence', 'blockchain']
-    soft_skills = ['communication', 'leadership', 'teamwork', 'problem-solving', 'analytical', 'creative', 'project management', 'time management', 'adaptability', 'critical thinking']
-    
-    found_technical = [kw for kw in technical_keywords if kw in resume_lower]
-    found_soft = [kw for kw in soft_skills if kw in resume_lower]
+    # ATS-friendly skills, normalized through the skills taxonomy ("k8s" -> "kubernetes"),
+    # with where each one is mentioned, found in one pass
+    resume_hits = skill_taxonomy.find_by_category(resume_text)
+    found_technical = list(resume_hits["technical"])
+    found_soft = list(resume_hits["soft"])
+    keyword_spans = {**resume_hits["technical"], **resume_hits["soft"]}
+    resume_keywords = set(found_technical + found_soft)
+    check_cpu_budget()
     
     # Job matching logic
     job_match_percentage = 0
@@ -253,18 +265,19 @@ def simple_ats_analysis(resume_text: str, job_description: Optional[str] = None)
     job_keywords_missing = []
     
     if job_description:
-        job_desc_lower = job_description.lower()
-        
         # Extract keywords from job description
-        job_technical = [kw for kw in technical_keywords if kw in job_desc_lower]
-        job_soft = [kw for kw in soft_skills if kw in job_desc_lower]
+        if isinstance(job_description, CompiledJobDescription):
+            job_skills = job_description.skills_by_category
+        else:
+            job_skills = skill_taxonomy.skills_by_category(job_description)
+            check_cpu_budget()
         
-        all_job_keywords = job_technical + job_soft
+        all_job_keywords = job_skills["technical"] + job_skills["soft"]
         
         if all_job_keywords:
             # Find matching keywords between resume and job description
-            job_keywords_found = [kw for kw in all_job_keywords if kw in resume_lower]
-            job_keywords_missing = [kw for kw in all_job_keywords if kw not in resume_lower]
+            job_keywords_found = [kw for kw in all_job_keywords if kw in resume_keywords]
+            job_keywords_missing = [kw for kw in all_job_keywords if kw not in resume_keywords]
             
             # Calculate job match percentage
             job_match_percentage = round((len(job_keywords_found) / len(all_job_keywords)) * 100)
@@ -330,6 +343,8 @@ def simple_ats_analysis(resume_text: str, job_description: Optional[str] = None)
         "jobMatchPercentage": job_match_percentage,
         "skillsAnalysis": {
             "matchedKeywords": found_technical + found_soft,
+            "keywordCounts": {keyword: len(spans) for keyword, spans in keyword_spans.items()},
+            "keywordPositions": {keyword: [list(span) for span in spans] for keyword, spans in keyword_spans.items()},
             "keywordMatchPercentage": min((len(found_technical) + len(found_soft)) * 10, 100),
             "jobKeywordsFound": job_keywords_found,
             "jobKeywordsMissing": job_keywords_missing
@@ -369,9 +384,15 @@ This is a simplified analysis. For advanced AI analysis, ensure all dependencies
 async def analyze_resume_quick(resume_file: UploadFile = File(...)):
     """Quick resume analysis - simplified version"""
     try:
-        resume_text = extract_text_simple(resume_file)
-        result = simple_ats_analysis(resume_text, None)
+        with CpuBudget().charge():
+            resume_text = extract_text_simple(resume_file)
+            result = simple_ats_analysis(resume_text, None)
         return JSONResponse(content=result)
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        # Resume too long, or analysis stopped by the CPU budget
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
@@ -383,16 +404,21 @@ async def analyze_resume_file(
 ):
     """Resume analysis with job description - simplified version"""
     try:
-        resume_text = extract_text_simple(resume_file)
-        
-        job_description = None
-        if job_description_file:
-            job_description = extract_text_simple(job_description_file)
-        elif job_description_text and job_description_text.strip():
-            job_description = job_description_text.strip()
-        
-        result = simple_ats_analysis(resume_text, job_description)
+        with CpuBudget().charge():
+            resume_text = extract_text_simple(resume_file)
+            
+            job_description = None
+            if job_description_file:
+                job_description = extract_text_simple(job_description_file)
+            elif job_description_text and job_description_text.strip():
+                job_description = job_description_text.strip()
+            
+            result = simple_ats_analysis(resume_text, job_description)
         return JSONResponse(content=result)
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
@@ -1,143 +1,105 @@
-import google.generativeai as genai
-import re
-import json
+import asyncio
+import logging
 import os
-from typing import Dict, List, Optional
-import spacy
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from section_detector import scan_sections
+from formatting_rules import formatting_issue_locations, formatting_issues_from_signals, scan_formatting
+from result_cache import ResultCache, make_cache_key
+from llm_client import estimate_tokens, generate_content, generate_content_async
+from heuristic_scoring import generate_heuristic_analysis
+from skills_taxonomy import skill_taxonomy
+from model_registry import get_gemini_model
+from semantic_matching import semantic_match_score
+from single_flight import SingleFlight
+from metrics import time_stage, timed
+from analysis_limits import CpuBudget, check_text_size
+from job_descriptions import CompiledJobDescription, JobDescription, job_description_skills, job_description_text
+from ai_response import AnalysisParseError, parse_analysis, parse_analysis_async
+from prompt_compaction import (
+    PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET, PROMPT_RESUME_TOKEN_BUDGET, compact_text, prompt_stats
+)
 
 # Load environment variables
 load_dotenv()
 
-# Load NLP models
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Warning: spaCy model not found. Install with: python -m spacy download en_core_web_sm")
-    nlp = None
-
-# Configure Gemini API
-api_key = os.getenv('GEMINI_API_KEY')
-if not api_key:
-    print("Warning: GEMINI_API_KEY not found in environment variables. Please set it in your .env file.")
-    print("Get your API key from: https://makersuite.google.com/app/apikey")
-else:
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-1.5-flash')
-
-def detect_resume_sections(resume_text: str) -> Dict[str, bool]:
+# Bump PROMPT_VERSION whenever the prompts or scoring change so cached results are invalidated
+MODEL_NAME = 'gemini-1.5-flash'
+PROMPT_VERSION = '4'
+
+# Gemini JSON mode: the answer is a bare JSON object, without prose or code fences
+JSON_OUTPUT_CONFIG = {"response_mime_type": "application/json"}
+
+# "ai" asks Gemini for the analysis; "heuristic" scores locally without any LLM call
+SCORING_MODES = ("ai", "heuristic")
+
+# Cache of complete analysis results, keyed by resume/job description content
+result_cache = ResultCache.from_env()
+
+# Identical analyses already waiting on Gemini (same result cache key) share that one call
+analysis_flights = SingleFlight()
+
+logger = logging.getLogger(__name__)
+
+# The Gemini client itself is created on first use (see model_registry)
+if not os.getenv('GEMINI_API_KEY'):
+    logger.warning(
+        "GEMINI_API_KEY not found in environment variables. Please set it in your .env file "
+        "(get a key from https://makersuite.google.com/app/apikey)."
+    )
+
+@timed("section_detection")
+def detect_resume_sections(resume_text: str, formatting: Optional[Dict] = None) -> Dict[str, bool]:
     """Detect which standard resume sections are present"""
-    sections = {
-        "Contact Info": False,
-        "Summary / Objective": False,
-        "Skills": False,
-        "Work Experience": False,
-        "Education": False,
-        "Certifications": False,
-        "Projects": False,
-        "Languages": False
-    }
-    
-    text_lower = resume_text.lower()
-    
-    # Contact Info - check for email and phone
-    if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', resume_text):
-        sections["Contact Info"] = True
-    
-    # Summary/Objective
-    summary_patterns = [r'\bsummary\b', r'\bobjective\b', r'\bprofile\b', r'\babout\s+me\b']
-    if any(re.search(pattern, text_lower) for pattern in summary_patterns):
-        sections["Summary / Objective"] = True
-    
-    # Skills
-    skill_patterns = [r'\bskills\b', r'\btechnical\s+skills\b', r'\bcore\s+competencies\b', r'\bexpertise\b']
-    if any(re.search(pattern, text_lower) for pattern in skill_patterns):
-        sections["Skills"] = True
-    
-    # Work Experience
-    exp_patterns = [r'\bexperience\b', r'\bemployment\b', r'\bwork\s+history\b', r'\bprofessional\s+experience\b']
-    if any(re.search(pattern, text_lower) for pattern in exp_patterns):
-        sections["Work Experience"] = True
-    
-    # Education
-    edu_patterns = [r'\beducation\b', r'\bacademic\b', r'\bdegree\b', r'\buniversity\b', r'\bcollege\b']
-    if any(re.search(pattern, text_lower) for pattern in edu_patterns):
-        sections["Education"] = True
-    
-    # Certifications
-    cert_patterns = [r'\bcertifications?\b', r'\bcertified\b', r'\blicenses?\b']
-    if any(re.search(pattern, text_lower) for pattern in cert_patterns):
-        sections["Certifications"] = True
-    
-    # Projects
-    proj_patterns = [r'\bprojects?\b', r'\bportfolio\b']
-    if any(re.search(pattern, text_lower) for pattern in proj_patterns):
-        sections["Projects"] = True
-    
-    # Languages
-    lang_patterns = [r'\blanguages?\b', r'\bmultilingual\b', r'\bfluent\s+in\b']
-    if any(re.search(pattern, text_lower) for pattern in lang_patterns):
-        sections["Languages"] = True
-    
+    sections, _ = scan_sections(resume_text, formatting)
     return sections
 
+def detect_section_offsets(resume_text: str) -> Dict[str, int]:
+    """Return the character offset where each detected section first appears"""
+    _, offsets = scan_sections(resume_text)
+    return offsets
+
+def detect_skills(text: str) -> List[str]:
+    """Canonical skills mentioned in text, normalized through the skills taxonomy"""
+    return skill_taxonomy.skills_in(text)
+
+@timed("formatting_checks")
+def formatting_signals(resume_text: str) -> Dict:
+    """Where each formatting rule first fires, found in one pass (see formatting_rules)"""
+    return scan_formatting(resume_text)
+
 def detect_formatting_issues(resume_text: str) -> List[str]:
     """Detect ATS-unfriendly formatting issues"""
-    issues = []
-    
-    # Check for tables (multiple tabs)
-    if re.search(r'\t{2,}', resume_text):
-        issues.append("Contains table formatting which may not be ATS-friendly")
-    
-    # Check for image references
-    if re.search(r'\.(jpg|png|svg|jpeg|gif|pdf)', resume_text, re.IGNORECASE):
-        issues.append("Contains image/file references - ATS systems cannot read embedded images")
-    
-    # Check for special characters that might break parsing
-    special_chars = ['•', '◦', '▪', '■', '●', '○']
-    if any(char in resume_text for char in special_chars):
-        issues.append("Uses special bullet characters - consider using standard hyphens (-) or asterisks (*)")
-    
-    # Check for multiple columns (indicated by excessive spaces)
-    if re.search(r' {10,}', resume_text):
-        issues.append("Possible multi-column layout detected - use single column format for better ATS compatibility")
-    
-    # Check contact information format
-    if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', resume_text):
-        issues.append("Missing or improperly formatted email address")
-    
-    if not re.search(r'[\+]?[1-9]?[\d\s\-\(\)]{10,}', resume_text):
-        issues.append("Missing or improperly formatted phone number")
-    
-    # Check for inconsistent date formats
-    date_formats = [
-        r'\d{1,2}/\d{1,2}/\d{4}',  # MM/DD/YYYY
-        r'\d{4}-\d{2}-\d{2}',       # YYYY-MM-DD
-        r'\w+\s+\d{4}',             # Month YYYY
-        r'\d{4}\s*-\s*\d{4}'        # YYYY - YYYY
-    ]
-    found_formats = sum(1 for fmt in date_formats if re.search(fmt, resume_text))
-    if found_formats > 2:
-        issues.append("Inconsistent date formats detected - use consistent format throughout")
-    
-    return issues
-
-def generate_ai_analysis(resume_text: str, job_description: Optional[str] = None) -> Dict:
-    """Use Gemini AI to perform sophisticated resume analysis"""
+    return formatting_issues_from_signals(formatting_signals(resume_text))
+
+def run_detectors(resume_text: str) -> Tuple[Dict[str, bool], List[str], List[Dict]]:
+    """
+    Detected sections, formatting issues and the line and column of each
+    issue. Section detection reuses the email address the formatting scan found.
+    """
+    formatting = formatting_signals(resume_text)
+    sections = detect_resume_sections(resume_text, formatting)
+    return sections, formatting_issues_from_signals(formatting), formatting_issue_locations(resume_text, formatting)
+
+def fallback_analysis(resume_text: str, job_description: Optional[JobDescription], reason: str) -> Dict:
+    """
+    Local heuristic analysis used when Gemini gives no usable answer, marked
+    with the reason so it is neither cached nor mistaken for an AI score
+    """
+    analysis = generate_heuristic_analysis(resume_text, job_description, detect_resume_sections(resume_text))
+    analysis["error"] = reason
+    return analysis
+
+def build_analysis_prompt(resume_text: str, job_description: Optional[JobDescription] = None) -> str:
+    """
+    Build the Gemini prompt for a resume, with or without a job description.
+    A compiled job description contributes only its condensed requirements.
+    """
     
-    # Check if API key is available
-    if not os.getenv('GEMINI_API_KEY'):
-        return {
-            "ats_score": 70,
-            "improvement_suggestions": [
-                "Set up Gemini API key for advanced AI analysis",
-                "Review resume formatting for ATS compatibility",
-                "Include relevant keywords from job description",
-                "Add quantified achievements with specific numbers",
-                "Use strong action verbs to describe accomplishments"
-            ],
-            "error": "Gemini API key not configured. Using fallback analysis."
-        }
+    if isinstance(job_description, CompiledJobDescription):
+        job_section = f"JOB REQUIREMENTS (condensed from the posting):\n{job_description.condensed}"
+    else:
+        job_section = f"JOB DESCRIPTION:\n{job_description}"
     
     # Create the prompt based on whether job description is provided
     if job_description:
@@ -147,8 +109,7 @@ You are a smart AI hiring assistant and ATS evaluator. Analyze this resume again
 RESUME TEXT:
 {resume_text}
 
-JOB DESCRIPTION:
-{job_description}
+{job_section}
 
 Provide analysis in this exact JSON format:
 {{
@@ -204,32 +165,91 @@ Provide analysis in this exact JSON format:
 }}
 """
     
+    return prompt
+
+@timed("prompt_building")
+def prepare_analysis_prompt(resume_text: str, job_description: Optional[JobDescription] = None) -> Tuple[str, Dict]:
+    """
+    Build the analysis prompt from resume and job description text compacted
+    to their token budgets. Returns the prompt and its estimated token usage.
+    """
+    resume = compact_text(resume_text, PROMPT_RESUME_TOKEN_BUDGET)
+    job = None
+    if isinstance(job_description, CompiledJobDescription):
+        job = compact_text(job_description.condensed, PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET)
+        job_description = job_description._replace(condensed=job.text)
+    elif job_description:
+        job = compact_text(job_description, PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET)
+        job_description = job.text
+    
+    prompt = build_analysis_prompt(resume.text, job_description)
+    prompt_tokens = estimate_tokens(prompt)
+    tokens_saved = resume.original_tokens - resume.tokens + (job.original_tokens - job.tokens if job else 0)
+    over_budget = any(part.dropped_sections or part.truncated_sections for part in (resume, job) if part)
+    prompt_stats.record(prompt_tokens, tokens_saved, over_budget)
+    
+    return prompt, {
+        "estimatedTokens": prompt_tokens,
+        "tokensSaved": tokens_saved,
+        "resumeTokens": resume.tokens,
+        "jobDescriptionTokens": job.tokens if job else None,
+        "droppedSections": resume.dropped_sections,
+        "truncatedSections": resume.truncated_sections
+    }
+
+def generate_ai_analysis(resume_text: str, job_description: Optional[JobDescription] = None) -> Dict:
+    """Use Gemini AI to perform sophisticated resume analysis"""
+    
+    # Check if API key is available
+    if not os.getenv('GEMINI_API_KEY'):
+        return fallback_analysis(resume_text, job_description, "Gemini API key not configured. Using fallback analysis.")
+    
+    prompt, prompt_usage = prepare_analysis_prompt(resume_text, job_description)
+    model = get_gemini_model(MODEL_NAME)
+    
+    def regenerate(repair_prompt: str) -> str:
+        return generate_content(model, repair_prompt, generation_config=JSON_OUTPUT_CONFIG)
+    
     try:
-        response = model.generate_content(prompt)
-        # Extract JSON from response
-        response_text = response.text.strip()
-        
-        # Try to extract JSON from the response
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}') + 1
-        
-        if json_start != -1 and json_end != -1:
-            json_str = response_text[json_start:json_end]
-            return json.loads(json_str)
-        else:
-            # Fallback if JSON extraction fails
-            return {
-                "ats_score": 70,
-                "improvement_suggestions": ["Review resume format and content"],
-                "error": "Could not parse AI response"
-            }
+        response_text = generate_content(model, prompt, generation_config=JSON_OUTPUT_CONFIG)
+        analysis = parse_analysis(response_text, regenerate)
+    except AnalysisParseError as e:
+        logger.warning("Gemini response error: %s", e)
+        analysis = fallback_analysis(resume_text, job_description, str(e))
     except Exception as e:
-        print(f"Gemini API error: {e}")
-        return {
-            "ats_score": 60,
-            "improvement_suggestions": ["Could not analyze with AI - check API connection"],
-            "error": str(e)
-        }
+        logger.warning("Gemini API error: %s", e)
+        analysis = fallback_analysis(resume_text, job_description, str(e) or type(e).__name__)
+    
+    analysis["prompt_usage"] = prompt_usage
+    return analysis
+
+async def generate_ai_analysis_async(resume_text: str, job_description: Optional[JobDescription] = None) -> Dict:
+    """Non-blocking generate_ai_analysis with a concurrency limit and timeout"""
+    
+    if not os.getenv('GEMINI_API_KEY'):
+        return fallback_analysis(resume_text, job_description, "Gemini API key not configured. Using fallback analysis.")
+    
+    prompt, prompt_usage = prepare_analysis_prompt(resume_text, job_description)
+    model = get_gemini_model(MODEL_NAME)
+    
+    async def regenerate(repair_prompt: str) -> str:
+        return await generate_content_async(model, repair_prompt, generation_config=JSON_OUTPUT_CONFIG)
+    
+    try:
+        response_text = await generate_content_async(model, prompt, generation_config=JSON_OUTPUT_CONFIG)
+        analysis = await parse_analysis_async(response_text, regenerate)
+    except AnalysisParseError as e:
+        logger.warning("Gemini response error: %s", e)
+        analysis = fallback_analysis(resume_text, job_description, str(e))
+    except asyncio.TimeoutError:
+        logger.warning("Gemini API error: request timed out")
+        analysis = fallback_analysis(resume_text, job_description, "Gemini request timed out")
+    except Exception as e:
+        logger.warning("Gemini API error: %s", e)
+        analysis = fallback_analysis(resume_text, job_description, str(e) or type(e).__name__)
+    
+    analysis["prompt_usage"] = prompt_usage
+    return analysis
 
 def calculate_comprehensive_score(
     ai_analysis: Dict,
@@ -241,7 +261,6 @@ def calculate_comprehensive_score(
     
     # Base score from AI analysis - more conservative capping
     ai_score = ai_analysis.get("ats_score", 60)
-    print(f"🔍 DEBUG - Raw AI score: {ai_score}")
     
     # More aggressive capping based on AI score range
     if ai_score > 90:
@@ -251,17 +270,13 @@ def calculate_comprehensive_score(
     else:
         ai_score = min(ai_score, 65)  # Cap moderate scores lower
     
-    print(f"🔍 DEBUG - Adjusted AI base score: {ai_score}")
-    
     # Section completeness score (max 12 points, more conservative)
     essential_sections = ["Contact Info", "Work Experience", "Skills", "Education"]
     present_essential = sum(1 for section in essential_sections if sections.get(section, False))
     section_score = present_essential * 3  # 3 points per essential section
-    print(f"🔍 DEBUG - Section score: {section_score} ({present_essential}/{len(essential_sections)} essential sections)")
     
     # Enhanced formatting penalty (max -25 points, more severe)
     formatting_penalty = min(len(formatting_issues) * 5, 25)
-    print(f"🔍 DEBUG - Formatting penalty: {formatting_penalty} (issues: {len(formatting_issues)})")
     
     # Content quality bonus - more conservative (max 5 points)
     content_bonus = 0
@@ -274,7 +289,6 @@ def calculate_comprehensive_score(
             content_bonus = 5
         elif action_verb_score >= 7 or achievements >= 3:
             content_bonus = 2
-    print(f"🔍 DEBUG - Content bonus: {content_bonus}")
     
     # Suggestions penalty - NEW: Penalize based on number of improvement suggestions
     suggestions = ai_analysis.get("improvement_suggestions", [])
@@ -285,22 +299,31 @@ def calculate_comprehensive_score(
         suggestion_penalty = 10  # Several suggestions = moderate issues
     elif len(suggestions) > 2:
         suggestion_penalty = 5   # Few suggestions = minor issues
-    print(f"🔍 DEBUG - Suggestion penalty: {suggestion_penalty} (suggestions: {len(suggestions)})")
     
     # Missing sections penalty - NEW: More severe penalty for missing essential sections
     missing_essential = len(essential_sections) - present_essential
     missing_section_penalty = missing_essential * 8  # 8 points per missing essential section
-    print(f"🔍 DEBUG - Missing section penalty: {missing_section_penalty} (missing: {missing_essential})")
     
     # Calculate final score with more realistic approach
     final_score = (ai_score + section_score + content_bonus - 
                   formatting_penalty - suggestion_penalty - missing_section_penalty)
     
-    print(f"🔍 DEBUG - Calculation: {ai_score} + {section_score} + {content_bonus} - {formatting_penalty} - {suggestion_penalty} - {missing_section_penalty} = {final_score}")
-    
     # More realistic score boundaries
     final_score = max(15, min(95, final_score))  # Minimum 15, maximum 95 (rarely perfect)
-    print(f"🔍 DEBUG - Final score (bounded): {final_score}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("score calculated", extra={
+            "raw_ai_score": ai_analysis.get("ats_score", 60),
+            "ai_base_score": ai_score,
+            "section_score": section_score,
+            "essential_sections": f"{present_essential}/{len(essential_sections)}",
+            "content_bonus": content_bonus,
+            "formatting_penalty": formatting_penalty,
+            "formatting_issues": len(formatting_issues),
+            "suggestion_penalty": suggestion_penalty,
+            "suggestions": len(suggestions),
+            "missing_section_penalty": missing_section_penalty,
+            "final_score": final_score
+        })
     
     return {
         "total_score": round(final_score),
@@ -311,23 +334,199 @@ def calculate_comprehensive_score(
         "suggestion_penalty": suggestion_penalty,
         "missing_section_penalty": missing_section_penalty
     }
-def analyzeResume(resume_text: str, job_description: Optional[str] = None) -> Dict:
+def validate_scoring_mode(scoring_mode: str) -> None:
+    """Raise ValueError for anything other than a known scoring mode"""
+    if scoring_mode not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode '{scoring_mode}'. Use one of: {', '.join(SCORING_MODES)}")
+
+def validate_input_size(resume_text: str, job_description: Optional[JobDescription] = None) -> None:
+    """
+    Raise ValueError for a resume or pasted job description too long to
+    analyze (ANALYSIS_MAX_CHARS); compiled job descriptions were checked when compiled
+    """
+    check_text_size(resume_text, "Resume")
+    if isinstance(job_description, str):
+        check_text_size(job_description, "Job description")
+
+def analysis_cache_key(resume_text: str, job_description: Optional[JobDescription], scoring_mode: str) -> str:
+    """
+    Result cache key; heuristic results are cached separately from Gemini
+    ones, and analyses of a compiled job description (condensed prompt)
+    separately from analyses of the pasted text
+    """
+    model_name = MODEL_NAME if scoring_mode == "ai" else scoring_mode
+    if isinstance(job_description, CompiledJobDescription):
+        job_description = f"compiled:{job_description.id}"
+    return make_cache_key(resume_text, job_description, PROMPT_VERSION, model_name)
+
+def analyzeResume(
+    resume_text: str,
+    job_description: Optional[JobDescription] = None,
+    scoring_mode: str = "ai"
+) -> Dict:
     """
     Enhanced ATS resume analysis using AI and comprehensive scoring
     """
+    validate_scoring_mode(scoring_mode)
+    validate_input_size(resume_text, job_description)
+    budget = CpuBudget()
+    
+    # 0. Serve repeated submissions from the result cache
+    cache_key = analysis_cache_key(resume_text, job_description, scoring_mode)
+    cached_result = result_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+    
+    # 1-2. Detect resume sections and formatting issues
+    with budget.charge():
+        sections, formatting_issues, formatting_locations = run_detectors(resume_text)
+    
+    # 3. Get AI analysis (or the local heuristic equivalent)
+    if scoring_mode == "heuristic":
+        with budget.charge():
+            ai_analysis = generate_heuristic_analysis(resume_text, job_description, sections)
+    else:
+        ai_analysis = generate_ai_analysis(resume_text, job_description)
     
-    # 1. Detect resume sections
-    sections = detect_resume_sections(resume_text)
-    missing_sections = [section for section, present in sections.items() if not present]
+    with budget.charge():
+        result = build_analysis_result(
+            resume_text, job_description, sections, formatting_issues, ai_analysis, scoring_mode, formatting_locations
+        )
+    
+    # Only cache real AI results; fallbacks should be retried on the next request
+    if "error" not in ai_analysis:
+        result_cache.set(cache_key, result)
+    
+    return result
+
+async def analyzeResumeAsync(
+    resume_text: str,
+    job_description: Optional[JobDescription] = None,
+    sections: Optional[Dict[str, bool]] = None,
+    formatting_issues: Optional[List[str]] = None,
+    scoring_mode: str = "ai",
+    formatting_locations: Optional[List[Dict]] = None
+) -> Dict:
+    """
+    analyzeResume for async endpoints: the Gemini call is awaited instead of
+    blocking the event loop. Detector output that was already computed
+    elsewhere (e.g. in a worker process) can be passed in to skip that work,
+    as can a compiled job description instead of the posting's text.
+    """
+    validate_scoring_mode(scoring_mode)
+    validate_input_size(resume_text, job_description)
+    budget = CpuBudget()
+    
+    cache_key = analysis_cache_key(resume_text, job_description, scoring_mode)
+    cached_result = await result_cache.get_async(cache_key)
+    if cached_result is not None:
+        return cached_result
+    
+    if sections is None or formatting_issues is None:
+        with budget.charge():
+            detected_sections, detected_issues, formatting_locations = run_detectors(resume_text)
+        sections = sections if sections is not None else detected_sections
+        formatting_issues = formatting_issues if formatting_issues is not None else detected_issues
+    ai_analysis = await _get_ai_analysis_async(resume_text, job_description, scoring_mode, sections, cache_key, budget)
+    
+    with budget.charge():
+        result = build_analysis_result(
+            resume_text, job_description, sections, formatting_issues, ai_analysis, scoring_mode, formatting_locations
+        )
+    
+    if "error" not in ai_analysis:
+        result_cache.set(cache_key, result)
+    
+    return result
+
+async def _get_ai_analysis_async(
+    resume_text: str,
+    job_description: Optional[JobDescription],
+    scoring_mode: str,
+    sections: Dict[str, bool],
+    cache_key: str,
+    budget: CpuBudget
+) -> Dict:
+    if scoring_mode == "heuristic":
+        with budget.charge():
+            return generate_heuristic_analysis(resume_text, job_description, sections)
+    return await analysis_flights.run(cache_key, lambda: generate_ai_analysis_async(resume_text, job_description))
+
+# Result keys sent by each stage of analyzeResumeStream, in emission order
+STREAM_STAGES = [
+    ("detectors", [
+        "hasJobDescription", "scoringMode", "detectedSections", "formattingIssues", "formattingIssueLocations"
+    ]),
+    ("analysis", ["skillsAnalysis", "contentStrength", "aiAnalysis"]),
+    ("score", ["totalScore", "scoreCategory", "scoreEmoji", "scoreBreakdown", "suggestions"]),
+    ("report", ["markdownReport"]),
+]
+
+async def analyzeResumeStream(
+    resume_text: str,
+    job_description: Optional[JobDescription] = None,
+    scoring_mode: str = "ai"
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """
+    Yield (stage, partial result) pairs as soon as each stage is ready: the
+    detector results first (milliseconds), then the AI analysis, the score
+    and the markdown report. Merging all partials gives analyzeResumeAsync's result.
+    """
+    validate_scoring_mode(scoring_mode)
+    validate_input_size(resume_text, job_description)
+    budget = CpuBudget()
+    
+    cache_key = analysis_cache_key(resume_text, job_description, scoring_mode)
+    result = await result_cache.get_async(cache_key)
+    
+    if result is None:
+        with budget.charge():
+            sections, formatting_issues, formatting_locations = run_detectors(resume_text)
+        yield "detectors", {
+            "hasJobDescription": job_description is not None,
+            "scoringMode": scoring_mode,
+            "detectedSections": {
+                "present": [section for section, present in sections.items() if present],
+                "missing": [section for section, present in sections.items() if not present]
+            },
+            "formattingIssues": formatting_issues,
+            "formattingIssueLocations": formatting_locations
+        }
+        
+        ai_analysis = await _get_ai_analysis_async(
+            resume_text, job_description, scoring_mode, sections, cache_key, budget
+        )
+        with budget.charge():
+            result = build_analysis_result(
+                resume_text, job_description, sections, formatting_issues, ai_analysis, scoring_mode, formatting_locations
+            )
+        if "error" not in ai_analysis:
+            result_cache.set(cache_key, result)
+        remaining_stages = STREAM_STAGES[1:]
+    else:
+        remaining_stages = STREAM_STAGES
     
-    # 2. Detect formatting issues
-    formatting_issues = detect_formatting_issues(resume_text)
+    for stage, keys in remaining_stages:
+        yield stage, {key: result[key] for key in keys}
+
+def build_analysis_result(
+    resume_text: str,
+    job_description: Optional[JobDescription],
+    sections: Dict[str, bool],
+    formatting_issues: List[str],
+    ai_analysis: Dict,
+    scoring_mode: str = "ai",
+    formatting_locations: Optional[List[Dict]] = None
+) -> Dict:
+    """Combine detector output and AI analysis into the API response"""
     
-    # 3. Get AI analysis
-    ai_analysis = generate_ai_analysis(resume_text, job_description)
+    missing_sections = [section for section, present in sections.items() if not present]
     
     # 4. Calculate comprehensive score
-    scoring = calculate_comprehensive_score(ai_analysis, sections, formatting_issues, resume_text)
+    with time_stage("scoring"):
+        scoring = calculate_comprehensive_score(ai_analysis, sections, formatting_issues, resume_text)
+        # Embedding similarity to the job description (informational, not part of total_score)
+        scoring["semantic_match"] = semantic_match_score(resume_text, job_description_text(job_description))
     
     # 5. Determine score category and emoji with more realistic thresholds
     total_score = scoring["total_score"]
@@ -368,12 +567,17 @@ def analyzeResume(resume_text: str, job_description: Optional[str] = None) -> Di
         matched_keywords = skills_analysis.get("technical_keywords", [])
         missing_keywords = []
     
+    # Report skills under their canonical taxonomy names ("K8s" -> "kubernetes")
+    matched_keywords = skill_taxonomy.normalize_all(matched_keywords)
+    missing_keywords = skill_taxonomy.normalize_all(missing_keywords)
+    
     # 8. Build response
     result = {
         "totalScore": total_score,
         "scoreCategory": score_category,
         "scoreEmoji": score_emoji,
         "hasJobDescription": job_description is not None,
+        "scoringMode": scoring_mode,
         
         # Section Analysis
         "detectedSections": {
@@ -383,12 +587,18 @@ def analyzeResume(resume_text: str, job_description: Optional[str] = None) -> Di
         
         # Formatting Issues
         "formattingIssues": formatting_issues,
+        # Where each issue was first found: {"issue", "line", "column"} (1-based; None for missing contact details)
+        "formattingIssueLocations": formatting_locations or [],
         
         # Skills/Keywords
         "skillsAnalysis": {
             "matchedKeywords": matched_keywords[:15],
             "missingKeywords": missing_keywords[:10],
-            "keywordMatchPercentage": skills_analysis.get("keyword_match_percentage", 0) if job_description else None
+            "keywordMatchPercentage": skills_analysis.get("keyword_match_percentage", 0) if job_description else None,
+            "normalizedSkills": {
+                "resume": detect_skills(resume_text),
+                "jobDescription": job_description_skills(job_description) if job_description else None
+            }
         },
         
         # Content Strength
@@ -401,7 +611,11 @@ def analyzeResume(resume_text: str, job_description: Optional[str] = None) -> Di
         "aiAnalysis": {
             "roleMatch": ai_analysis.get("role_fit_analysis", "") if job_description else ai_analysis.get("general_feedback", ""),
             "inferredRole": ai_analysis.get("inferred_role", "") if not job_description else None,
-            "criticalGaps": ai_analysis.get("critical_gaps", [])
+            "criticalGaps": ai_analysis.get("critical_gaps", []),
+            # Estimated size of the Gemini prompt (None when scored locally)
+            "prompt": ai_analysis.get("prompt_usage"),
+            # Why Gemini's answer was replaced by local heuristic scoring, if it was
+            "fallbackReason": ai_analysis.get("error")
         },
         
         # Score Breakdown
@@ -416,6 +630,7 @@ def analyzeResume(resume_text: str, job_description: Optional[str] = None) -> Di
     
     return result
 
+@timed("report_rendering")
 def generate_markdown_report(
     total_score: int, 
     score_emoji: str, 
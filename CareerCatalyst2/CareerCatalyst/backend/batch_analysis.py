@@ -0,0 +1,166 @@
+import asyncio
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from analysis_limits import CpuBudget
+from ats_analyzer import analyzeResumeAsync, run_detectors, validate_input_size
+from job_descriptions import JobDescription
+from text_extraction import SUPPORTED_EXTENSIONS, extract_text
+
+# Worker processes for extraction and the deterministic detectors
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", str(os.cpu_count() or 2)))
+
+# Upper bounds for one batch request
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "200"))
+BATCH_MAX_FILE_BYTES = int(os.getenv("BATCH_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+# Uploaded resumes plus uncompressed zip members, together
+BATCH_MAX_TOTAL_BYTES = int(os.getenv("BATCH_MAX_TOTAL_BYTES", str(100 * 1024 * 1024)))
+
+# (filename, raw file bytes) or (name, already extracted text)
+ResumeInput = Tuple[str, Union[bytes, str]]
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=BATCH_MAX_WORKERS)
+    return _process_pool
+
+
+def prepare_resume(filename: str, content: Union[bytes, str]) -> Dict:
+    """Extract text and run the deterministic detectors (runs in a worker process)"""
+    # Already inside a worker process, so extract pages serially
+    text = extract_text(filename, content, parallel=False) if isinstance(content, bytes) else content.strip()
+    validate_input_size(text)
+    with CpuBudget().charge():
+        sections, formatting_issues, formatting_locations = run_detectors(text)
+    return {
+        "text": text,
+        "sections": sections,
+        "formattingIssues": formatting_issues,
+        "formattingLocations": formatting_locations
+    }
+
+
+@lru_cache(maxsize=32)
+def extract_job_description(filename: str, content: bytes) -> str:
+    """Extract a job description file once, however many batches reuse it"""
+    return extract_text(filename, content)
+
+
+def read_zip_resumes(zip_bytes: bytes, max_total_bytes: int = BATCH_MAX_TOTAL_BYTES) -> List[ResumeInput]:
+    """
+    Return (filename, bytes) for every supported resume inside a zip archive.
+    Members are read at most BATCH_MAX_FILE_BYTES each and max_total_bytes
+    together, whatever sizes the archive declares.
+    """
+    resumes = []
+    total_bytes = 0
+    try:
+        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith("__MACOSX/") or not name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                if info.file_size > BATCH_MAX_FILE_BYTES:
+                    raise ValueError(f"{name} is larger than {BATCH_MAX_FILE_BYTES} bytes")
+                with archive.open(info) as member:
+                    content = member.read(BATCH_MAX_FILE_BYTES + 1)
+                if len(content) > BATCH_MAX_FILE_BYTES:
+                    raise ValueError(f"{name} is larger than {BATCH_MAX_FILE_BYTES} bytes")
+                total_bytes += len(content)
+                if total_bytes > max_total_bytes:
+                    raise ValueError(f"Batch is limited to {BATCH_MAX_TOTAL_BYTES} bytes of resumes")
+                resumes.append((os.path.basename(name), content))
+                if len(resumes) > BATCH_MAX_RESUMES:
+                    raise ValueError(f"Batch is limited to {BATCH_MAX_RESUMES} resumes")
+    except zipfile.BadZipFile:
+        raise ValueError("Uploaded archive is not a valid zip file")
+    return resumes
+
+
+async def iter_batch_analysis(
+    resumes: Sequence[ResumeInput],
+    job_description: Optional[JobDescription] = None,
+    scoring_mode: str = "ai"
+) -> AsyncIterator[Dict]:
+    """
+    Analyze many resumes against one job description, yielding
+    {"filename", "result"} or {"filename", "error"} as each one finishes.
+
+    Extraction and detectors run in the process pool; Gemini calls are
+    bounded by llm_client's concurrency limit.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_process_pool()
+
+    async def analyze(filename: str, content: Union[bytes, str]) -> Dict:
+        try:
+            prepared = await loop.run_in_executor(pool, prepare_resume, filename, content)
+        except Exception as e:
+            return {"filename": filename, "error": str(e)}
+        if not prepared["text"]:
+            return {"filename": filename, "error": "Could not extract text from resume file"}
+        try:
+            result = await analyzeResumeAsync(
+                prepared["text"], job_description, prepared["sections"], prepared["formattingIssues"],
+                scoring_mode=scoring_mode, formatting_locations=prepared["formattingLocations"]
+            )
+        except Exception as e:
+            # One resume over its CPU budget (or failing otherwise) must not end the batch
+            return {"filename": filename, "error": str(e)}
+        return {"filename": filename, "result": result}
+
+    tasks = [asyncio.ensure_future(analyze(filename, content)) for filename, content in resumes]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away or the caller stopped early: drop the remaining work
+        for task in tasks:
+            task.cancel()
+
+
+def rank_batch_results(items: List[Dict]) -> List[Dict]:
+    """Sort batch items by totalScore (best first); failed items go last"""
+    return sorted(
+        items,
+        key=lambda item: item["result"]["totalScore"] if "result" in item else float("-inf"),
+        reverse=True
+    )
+
+
+def ranking_summary(items: List[Dict]) -> List[Dict]:
+    """Compact ranking table for the end of a streamed batch"""
+    return [
+        {
+            "rank": rank,
+            "filename": item["filename"],
+            "totalScore": item["result"]["totalScore"],
+            "scoreCategory": item["result"]["scoreCategory"]
+        }
+        for rank, item in enumerate(rank_batch_results(items), 1)
+        if "result" in item
+    ]
+
+
+def analyze_batch(
+    resumes: Sequence[ResumeInput],
+    job_description: Optional[JobDescription] = None,
+    scoring_mode: str = "ai"
+) -> List[Dict]:
+    """
+    Analyze many resumes against one job description and return them ranked
+    by totalScore. For use outside an event loop; async code should iterate
+    iter_batch_analysis instead.
+    """
+    async def collect():
+        return [item async for item in iter_batch_analysis(resumes, job_description, scoring_mode)]
+
+    return rank_batch_results(asyncio.run(collect()))
@@ -0,0 +1,159 @@
+"""
+Job aggregator against a local stub server serving saved Internshala pages.
+
+Starts an HTTP server on localhost that answers every search URL with the
+HTML fixtures in benchmarks/fixtures, after a configurable delay per board.
+It then compares:
+- the old approach: one requests.get per page, one page after another
+- aggregate_jobs: all boards and pages at once over the pooled session
+It also checks that a slow board past its deadline yields partial results
+without delaying the others, and that the job store answers repeat searches
+locally and refreshes only first pages when nothing changed. Exits non-zero
+if any check fails.
+
+Run from the backend directory:
+    python benchmarks/bench_aggregator.py [--boards 4] [--pages 5] [--latency 0.2]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregator import aggregate_jobs, internshala_source, parse_internshala  # noqa: E402
+from job_store import JobStore  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURE_JOBS_PER_PAGE = 40
+
+
+def load_fixture(page):
+    with open(os.path.join(FIXTURES_DIR, f"internshala_page_{page}.html"), "rb") as fixture:
+        return fixture.read()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves page 1 or page 2 of the fixture; the first path segment picks the board's delay"""
+    protocol_version = "HTTP/1.1"
+    pages = {1: load_fixture(1), 2: load_fixture(2)}
+    delays = {}
+    requests_served = 0
+
+    def do_GET(self):
+        StubHandler.requests_served += 1
+        board = self.path.strip("/").split("/")[0]
+        time.sleep(self.delays.get(board, 0.0))
+        body = self.pages[2 if "/page-" in self.path else 1]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def board_sources(base_url, boards, pages, deadline=8.0):
+    return [
+        internshala_source(f"{base_url}/board{i}", pages, deadline)._replace(name=f"board{i}")
+        for i in range(boards)
+    ]
+
+
+def sequential_fetch(sources, role, location, job_type):
+    """The pre-aggregator behaviour: a fresh connection per page, one page at a time"""
+    jobs = []
+    for source in sources:
+        for url in source.page_urls(role, location, job_type):
+            response = requests.get(url, timeout=10)
+            if response.status_code == 200:
+                jobs.extend(parse_internshala(response.text, location, job_type))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--boards", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="server delay per page in seconds")
+    parser.add_argument("--deadline", type=float, default=3.0, help="per-board deadline for the slow-board check")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    StubHandler.delays = {f"board{i}": args.latency for i in range(args.boards)}
+    query = ("python", "bangalore", "Internship")
+    expected = args.boards * args.pages * FIXTURE_JOBS_PER_PAGE
+    failures = 0
+
+    sources = board_sources(base_url, args.boards, args.pages)
+    start = time.perf_counter()
+    sequential_jobs = sequential_fetch(sources, *query)
+    sequential_elapsed = time.perf_counter() - start
+
+    aggregate_jobs(*query, sources=sources)  # warm up the pool and connections
+    start = time.perf_counter()
+    result = aggregate_jobs(*query, sources=sources)
+    aggregate_elapsed = time.perf_counter() - start
+
+    print(f"{args.boards} boards x {args.pages} pages, {args.latency * 1000:.0f} ms per page")
+    print(f"  sequential      {sequential_elapsed * 1000:8.0f} ms  {len(sequential_jobs)} jobs")
+    print(f"  aggregate_jobs  {aggregate_elapsed * 1000:8.0f} ms  {len(result['jobs'])} jobs")
+    print(f"  speedup         {sequential_elapsed / aggregate_elapsed:8.1f}x")
+    for count, label in ((len(sequential_jobs), "sequential"), (len(result["jobs"]), "aggregate_jobs")):
+        if count != expected:
+            print(f"  MISMATCH: {label} returned {count} jobs, expected {expected}")
+            failures += 1
+
+    # One board is far slower than its deadline: the others must still come back on time
+    deadline = args.deadline
+    StubHandler.delays["board0"] = deadline * 2
+    sources = board_sources(base_url, args.boards, args.pages, deadline)
+    start = time.perf_counter()
+    result = aggregate_jobs(*query, sources=sources)
+    elapsed = time.perf_counter() - start
+    print(f"\nboard0 at {deadline * 2:.1f} s per page, {deadline:.1f} s deadline: {elapsed * 1000:.0f} ms total")
+    for name, report in result["sources"].items():
+        print(f"  {name:8} {report['status']:8} {report['pagesFetched']}/{report['pages']} pages  "
+              f"{report['jobs']:4} jobs  {report['elapsedMs']} ms")
+    if result["sources"]["board0"]["status"] != "timeout" or elapsed > deadline + 0.5:
+        print("  MISMATCH: slow board was not cut off at its deadline")
+        failures += 1
+    if len(result["jobs"]) != expected - args.pages * FIXTURE_JOBS_PER_PAGE:
+        print("  MISMATCH: partial results are missing listings from the fast boards")
+        failures += 1
+
+    # Job store: a repeat search is served locally, a refresh re-fetches only first pages
+    StubHandler.delays["board0"] = args.latency
+    store = JobStore(":memory:", fresh_seconds=60, sources=board_sources(base_url, args.boards, args.pages))
+    timings = {}
+    for label in ("miss", "fresh"):
+        start = time.perf_counter()
+        result = store.search(*query)
+        timings[label] = time.perf_counter() - start
+        if result["cache"]["status"] != label:
+            print(f"  MISMATCH: expected a {label} search, got {result['cache']['status']}")
+            failures += 1
+    served = StubHandler.requests_served
+    store.refresh(*query)
+    refresh_requests = StubHandler.requests_served - served
+    print(f"\njob store: first search {timings['miss'] * 1000:.0f} ms, repeat {timings['fresh'] * 1000:.1f} ms, "
+          f"{len(result['jobs'])} unique of {expected} listings")
+    print(f"  refresh with nothing new: {refresh_requests} page requests instead of {args.boards * args.pages}")
+    if refresh_requests != args.boards:
+        print("  MISMATCH: refresh fetched more than the first page of each board")
+        failures += 1
+
+    server.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
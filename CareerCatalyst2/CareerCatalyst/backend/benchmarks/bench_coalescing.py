@@ -0,0 +1,93 @@
+"""
+Request coalescing: Gemini calls made for bursts of identical requests.
+
+Sends concurrent requests through the FastAPI app (in process, over ASGI)
+with a local stub model, and counts the model calls each burst causes:
+  - double clicks: every resume submitted twice at the same moment
+  - hiring drive: many students uploading one of a few template resumes
+  - assistant: the same question asked by many users at once
+Exits non-zero if a burst makes more model calls than it has distinct
+requests.
+
+Run from the backend directory:
+    python benchmarks/bench_coalescing.py [--latency 0.3] [--requests 200]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "stub-key")
+
+from bench_section_detection import synthetic_resume  # noqa: E402
+import app as backend  # noqa: E402
+import model_registry  # noqa: E402
+from ats_analyzer import MODEL_NAME, analysis_flights, result_cache  # noqa: E402
+from stub_model import StubModel  # noqa: E402
+
+
+async def burst(requests):
+    """Send (path, json) requests all at once; return the elapsed seconds"""
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post(path, json=body) for path, body in requests))
+        elapsed = time.perf_counter() - start
+    failed = [response.status_code for response in responses if response.status_code != 200]
+    if failed:
+        sys.exit(f"requests failed with status {failed[:5]}")
+    return elapsed
+
+
+def run(name, model, requests, distinct, flights):
+    result_cache.clear()
+    calls_before = model.calls
+    coalesced_before = flights.stats()["coalesced"]
+    elapsed = asyncio.run(burst(requests))
+    calls = model.calls - calls_before
+    coalesced = flights.stats()["coalesced"] - coalesced_before
+    print(f"  {name:<28}  {len(requests):>8}  {distinct:>8}  {calls:>11}  {coalesced:>9}  {elapsed:>8.2f}")
+    return calls <= distinct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.3, help="stub model latency in seconds")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--templates", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    model = StubModel(latency=args.latency)
+    model_registry.set_gemini_model(MODEL_NAME, model)
+    rng = random.Random(7)
+    ok = True
+
+    print(f"stub model latency {args.latency * 1000:.0f} ms")
+    print(f"  {'burst':<28}  {'requests':>8}  {'distinct':>8}  {'model calls':>11}  {'coalesced':>9}  {'seconds':>8}")
+
+    resumes = [synthetic_resume(rng, 400) for _ in range(args.requests // 2)]
+    requests = [("/analyze-resume", {"resume": resume}) for resume in resumes for _ in range(2)]
+    ok &= run("double clicks", model, requests, len(resumes), analysis_flights)
+
+    templates = [synthetic_resume(rng, 400) for _ in range(args.templates)]
+    requests = [("/analyze-resume", {"resume": rng.choice(templates), "jobDescription": "Python developer"})
+                for _ in range(args.requests)]
+    ok &= run("hiring drive (templates)", model, requests, len(templates), analysis_flights)
+
+    requests = [("/ai-assistant", {"message": "How do I write a strong summary?"}) for _ in range(args.requests)]
+    ok &= run("assistant, same question", model, requests, 1, backend.assistant_flights)
+
+    if not ok:
+        print("FAIL: identical in-flight requests were not coalesced")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Formatting rule engine: agreement with the original checks, speed, and linear time on adversarial input.
+
+Compares formatting_rules.scan_formatting (plus section detection reusing
+its email hit) with the original detectors, one re.search per rule and an
+email search of its own in section detection:
+  - the issues and detected sections must be identical on the synthetic
+    corpus and on short random strings built from the characters the rules
+    look at (digits, blanks, tabs, "@", ".", "/", hyphens, bullets)
+  - time per resume on the corpus
+  - time on adversarial texts (long runs of letters, digits, blanks and
+    dotted words, many "@"s) at growing sizes. The original "Month YYYY"
+    and email patterns take quadratic time on some of them, so they are
+    only timed up to --legacy-chars.
+Exits non-zero on any disagreement, or if time per character on the largest
+adversarial texts is more than --max-growth times that on the smallest.
+
+Run from the backend directory:
+    python benchmarks/bench_formatting_rules.py [--sizes 25000 100000 400000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_section_detection import legacy_detect_resume_sections, synthetic_resume  # noqa: E402
+from corpus import RESUME_SIZES, generate_corpus  # noqa: E402
+from formatting_rules import formatting_issues_from_signals, scan_formatting  # noqa: E402
+from section_detector import scan_sections  # noqa: E402
+
+
+def legacy_detect_formatting_issues(resume_text):
+    """The original checks: one uncompiled re.search per rule over the whole text"""
+    issues = []
+    if re.search(r'\t{2,}', resume_text):
+        issues.append("Contains table formatting which may not be ATS-friendly")
+    if re.search(r'\.(jpg|png|svg|jpeg|gif|pdf)', resume_text, re.IGNORECASE):
+        issues.append("Contains image/file references - ATS systems cannot read embedded images")
+    if any(char in resume_text for char in ['•', '◦', '▪', '■', '●', '○']):
+        issues.append("Uses special bullet characters - consider using standard hyphens (-) or asterisks (*)")
+    if re.search(r' {10,}', resume_text):
+        issues.append("Possible multi-column layout detected - use single column format for better ATS compatibility")
+    if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', resume_text):
+        issues.append("Missing or improperly formatted email address")
+    if not re.search(r'[\+]?[1-9]?[\d\s\-\(\)]{10,}', resume_text):
+        issues.append("Missing or improperly formatted phone number")
+    date_formats = [r'\d{1,2}/\d{1,2}/\d{4}', r'\d{4}-\d{2}-\d{2}', r'\w+\s+\d{4}', r'\d{4}\s*-\s*\d{4}']
+    if sum(1 for fmt in date_formats if re.search(fmt, resume_text)) > 2:
+        issues.append("Inconsistent date formats detected - use consistent format throughout")
+    return issues
+
+
+def legacy_detectors(text):
+    return legacy_detect_resume_sections(text), legacy_detect_formatting_issues(text)
+
+
+def detectors(text):
+    formatting = scan_formatting(text)
+    sections, _ = scan_sections(text, formatting)
+    return sections, formatting_issues_from_signals(formatting)
+
+
+FUZZ_PIECES = list("0123456789") * 3 + list(" \t\n-()/+@._%abcXYZé") + [
+    "•", ".pdf", ".JPG", "com", "@x.com", "   ", "\t\t", "2021", "May ",
+]
+
+# name -> text of about n characters
+ADVERSARIAL = {
+    "letters": lambda n: "a" * n,
+    "dotted words": lambda n: "a." * (n // 2),
+    "dotted local part": lambda n: "a." * (n // 2) + "@",
+    "digits": lambda n: "1" * n,
+    "short digit runs": lambda n: "1 2 3 4 5x" * (n // 10),
+    "blanks": lambda n: " " * n,
+    "short blank runs": lambda n: (" " * 9 + "x") * (n // 10),
+    "at signs": lambda n: "a@" * (n // 2),
+    "dotted domain": lambda n: "x@" + "a." * (n // 2),
+    "words and years": lambda n: "word 12 " * (n // 8),
+}
+
+
+def per_call(function, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--per-size", type=int, default=20, help="corpus resumes per size")
+    parser.add_argument("--fuzz", type=int, default=50000, help="random strings compared with the original checks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25000, 100000, 400000],
+                        help="adversarial text sizes in characters")
+    parser.add_argument("--legacy-chars", type=int, default=8000, help="largest adversarial text the original checks get")
+    parser.add_argument("--max-growth", type=float, default=2.0,
+                        help="allowed growth of time per character from the smallest to the largest size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = generate_corpus(args.seed, args.per_size)
+    texts = [resume.text for resume in corpus] + [synthetic_resume(rng, 600) for _ in range(args.per_size * 5)]
+    texts += ["".join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(0, 40))) for _ in range(args.fuzz)]
+    failures = [f"differs from the original checks on {text!r:.80}" for text in texts
+                if detectors(text) != legacy_detectors(text)]
+    print(f"agreement: {len(texts) - len(failures)} of {len(texts)} texts identical "
+          f"({len(corpus) + args.per_size * 5} resumes, {args.fuzz} random strings)")
+
+    print(f"  {'resume':<10}  {'original us':>12}  {'rule engine us':>15}")
+    for size in RESUME_SIZES:
+        resumes = [resume.text for resume in corpus if resume.size == size]
+        legacy = sum(per_call(legacy_detectors, text, args.repeat) for text in resumes) / len(resumes)
+        engine = sum(per_call(detectors, text, args.repeat) for text in resumes) / len(resumes)
+        print(f"  {size:<10}  {legacy * 1e6:>12.0f}  {engine * 1e6:>15.0f}")
+
+    legacy_sizes = [args.legacy_chars // 4, args.legacy_chars]
+    print(f"\nadversarial input, ms (original at {' and '.join(map(str, legacy_sizes))} chars; "
+          f"rule engine at {', '.join(map(str, args.sizes))} chars)")
+    for name, make in ADVERSARIAL.items():
+        legacy = [per_call(legacy_detectors, make(size), 1) * 1000 for size in legacy_sizes]
+        engine = [per_call(detectors, make(size), args.repeat) * 1000 for size in args.sizes]
+        growth = (engine[-1] / args.sizes[-1]) / (engine[0] / args.sizes[0])
+        print(f"  {name:<18}  original {' '.join(f'{ms:9.2f}' for ms in legacy)}   "
+              f"engine {' '.join(f'{ms:8.2f}' for ms in engine)}   per-char growth {growth:.2f}x")
+        if growth > args.max_growth:
+            failures.append(f"{name}: time per character grew {growth:.2f}x (limit {args.max_growth}x)")
+
+    for failure in failures[:20]:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
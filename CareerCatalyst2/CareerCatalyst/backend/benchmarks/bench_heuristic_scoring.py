@@ -0,0 +1,61 @@
+"""
+Throughput of the local heuristic scoring mode (no LLM calls).
+
+Measures generate_heuristic_analysis on its own and the full
+analyzeResume(..., scoring_mode="heuristic") pipeline on synthetic resumes.
+
+Run from the backend directory (needs the backend requirements installed):
+    python benchmarks/bench_heuristic_scoring.py [--resumes 2000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ats_analyzer  # noqa: E402
+from bench_section_detection import synthetic_resume  # noqa: E402
+from heuristic_scoring import generate_heuristic_analysis  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer with Python, Django, PostgreSQL, Docker and AWS "
+    "experience. Strong communication and leadership skills; agile/scrum background preferred."
+)
+
+
+def rate(func, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        func(text)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [synthetic_resume(rng, args.words) for _ in range(args.resumes)]
+
+    # Measure the work itself, not cache hits
+    ats_analyzer.result_cache = ResultCache(max_entries=0)
+
+    heuristic_only = rate(lambda text: generate_heuristic_analysis(text, JOB_DESCRIPTION), corpus)
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = rate(lambda text: ats_analyzer.analyzeResume(text, JOB_DESCRIPTION, "heuristic"), corpus)
+
+    print(f"corpus: {len(corpus)} resumes, ~{args.words} words each")
+    print(f"generate_heuristic_analysis:           {heuristic_only:10.0f} resumes/s")
+    print(f"analyzeResume(scoring_mode=heuristic): {pipeline:10.0f} resumes/s")
+
+
+if __name__ == "__main__":
+    main()
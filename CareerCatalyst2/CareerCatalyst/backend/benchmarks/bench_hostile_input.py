@@ -0,0 +1,204 @@
+"""
+Hostile input: size limits, the CPU budget and linear-time detector patterns.
+
+Feeds the detectors texts made to slow down backtracking regexes and checks
+that a crafted upload cannot keep a worker busy:
+  - QUANTIFIED_PATTERN finds a quantified achievement in exactly the same
+    random strings (digits, commas, dots, blanks, "%", currency signs, count
+    nouns) as the original pattern, which takes quadratic time on long runs
+    of digits. Non-ASCII characters are only included with REGEX_ENGINE=re:
+    RE2's \\d, \\w and \\b are ASCII-only.
+  - time of each detector pattern on adversarial texts at growing sizes;
+    time per character may not grow more than --max-growth times (texts a
+    pattern gets through in under a millisecond are not checked)
+  - a heuristic analysis of each adversarial text at ANALYSIS_MAX_CHARS
+    stays within the CPU budget, and with the budget cut to a quarter of
+    the time it needs, stops no more than --max-overshoot-ms past it
+  - 5 MB hostile uploads and request bodies are rejected with a 400 within
+    --max-reject-ms, by app and by app_simple
+Exits non-zero if any check fails. Run it again with REGEX_ENGINE=re to
+check the fallback engine.
+
+Run from the backend directory:
+    python benchmarks/bench_hostile_input.py [--sizes 25000 100000 400000]
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "stub-key")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import analysis_limits  # noqa: E402
+from analysis_limits import ANALYSIS_MAX_CHARS, CpuBudgetExceeded  # noqa: E402
+from ats_analyzer import analyzeResume, result_cache  # noqa: E402
+from bench_formatting_rules import ADVERSARIAL, per_call  # noqa: E402
+from heuristic_scoring import FIRST_PERSON_PATTERN, QUANTIFIED_PATTERN  # noqa: E402
+from regex_engine import regex_stats  # noqa: E402
+from section_detector import SECTION_REGEX  # noqa: E402
+import app  # noqa: E402
+import app_simple  # noqa: E402
+
+LEGACY_QUANTIFIED_PATTERN = re.compile(
+    r'\d+(?:\.\d+)?\s*%'
+    r'|[$€£₹]\s?\d[\d,]*(?:\.\d+)?\s*[kmb]?\b'
+    r'|\b\d+(?:\.\d+)?x\b'
+    r'|\b\d[\d,]*\+?\s+(?:users|customers|clients|people|engineers|developers|members|projects|countries|requests|transactions)\b',
+    re.IGNORECASE
+)
+
+FUZZ_PIECES = list("0123456789,,..  %$€£x_a+kKb\t") + ["users", "Users", " people", "X", "mb"]
+NON_ASCII_PIECES = ["é", "١", "\xa0", "₹"]
+
+# name -> text of about n characters
+HOSTILE = {
+    **ADVERSARIAL,
+    "digit commas": lambda n: "1," * (n // 2),
+    "digit dots": lambda n: "1." * (n // 2),
+    "digits and blanks": lambda n: ("1" * 40 + " ") * (n // 41),
+    "number and blanks": lambda n: "1" + " " * (n - 1),
+    "headings and blanks": lambda n: ("about" + " " * 45) * (n // 50),
+}
+
+PATTERNS = {
+    "quantified": QUANTIFIED_PATTERN.search,
+    "first person": FIRST_PERSON_PATTERN.findall,
+    "sections": lambda text: list(SECTION_REGEX.finditer(text.lower())),
+}
+
+
+def check_quantified_agreement(rng, count, non_ascii):
+    pieces = FUZZ_PIECES + (NON_ASCII_PIECES if non_ascii else [])
+    failures = []
+    for _ in range(count):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 16)))
+        if bool(QUANTIFIED_PATTERN.search(text)) != bool(LEGACY_QUANTIFIED_PATTERN.search(text)):
+            failures.append(f"QUANTIFIED_PATTERN differs from the original pattern on {text!r}")
+    return failures
+
+
+def cpu_time_of(function, *args):
+    """(CPU seconds, exception or None) of one call"""
+    start = time.thread_time()
+    try:
+        function(*args)
+    except CpuBudgetExceeded as e:
+        return time.thread_time() - start, e
+    return time.thread_time() - start, None
+
+
+def heuristic_analysis_of(text):
+    result_cache.clear()
+    analyzeResume(text, None, scoring_mode="heuristic")
+
+
+def check_rejections(max_reject_ms):
+    """(label, status, ms) of each 5 MB request, and failures"""
+    hostile = "1" * (5 * 1024 * 1024)
+    requests = [
+        ("app /analyze-resume-file", TestClient(app.app), "/analyze-resume-file",
+         {"files": {"resume_file": ("resume.txt", hostile.encode())}, "data": {"scoring_mode": "heuristic"}}),
+        ("app /analyze-resume", TestClient(app.app), "/analyze-resume",
+         {"json": {"resume": hostile, "scoringMode": "heuristic"}}),
+        ("app /analyze-resume-stream", TestClient(app.app), "/analyze-resume-stream",
+         {"json": {"resume": hostile, "scoringMode": "heuristic"}}),
+        ("app_simple /analyze-resume-quick", TestClient(app_simple.app), "/analyze-resume-quick",
+         {"files": {"resume_file": ("resume.txt", hostile.encode())}}),
+    ]
+    rows, failures = [], []
+    for label, client, path, kwargs in requests:
+        start = time.perf_counter()
+        response = client.post(path, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        rows.append((label, response.status_code, elapsed_ms))
+        if response.status_code != 400:
+            failures.append(f"{label}: 5 MB request got {response.status_code}, expected 400")
+        if elapsed_ms > max_reject_ms:
+            failures.append(f"{label}: rejecting a 5 MB request took {elapsed_ms:.0f} ms (limit {max_reject_ms} ms)")
+    return rows, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fuzz", type=int, default=200000, help="random strings compared with the original pattern")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25000, 100000, 400000],
+                        help="adversarial text sizes in characters")
+    parser.add_argument("--legacy-chars", type=int, default=4000,
+                        help="largest adversarial text the original quantified pattern gets")
+    parser.add_argument("--max-growth", type=float, default=2.0,
+                        help="allowed growth of time per character from the smallest to the largest size")
+    parser.add_argument("--max-overshoot-ms", type=float, default=100.0,
+                        help="allowed CPU time spent after the budget ran out")
+    parser.add_argument("--max-reject-ms", type=float, default=1500.0,
+                        help="allowed time to reject a 5 MB request")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    engine = regex_stats()["engine"]
+    rng = random.Random(args.seed)
+    failures = check_quantified_agreement(rng, args.fuzz, non_ascii=engine == "re")
+    print(f"regex engine: {engine}; quantified pattern: {args.fuzz - len(failures)} of {args.fuzz} "
+          f"random strings agree with the original pattern")
+
+    legacy_sizes = [args.legacy_chars // 4, args.legacy_chars]
+    print(f"\nadversarial text, ms (original quantified pattern at {' and '.join(map(str, legacy_sizes))} chars; "
+          f"detector patterns at {args.sizes[-1]} chars, with the largest growth of time per character "
+          f"from {args.sizes[0]} chars)")
+    print(f"  {'text':<20}  {'original':>17}  " + "  ".join(f"{pattern:>12}" for pattern in PATTERNS) + "  growth")
+    for name, make in HOSTILE.items():
+        legacy = [per_call(LEGACY_QUANTIFIED_PATTERN.search, make(size), 1) * 1000 for size in legacy_sizes]
+        largest = []
+        growths = []
+        for pattern, function in PATTERNS.items():
+            times = [per_call(function, make(size), args.repeat) * 1000 for size in args.sizes]
+            largest.append(times[-1])
+            if times[-1] < 1.0:
+                continue
+            growth = (times[-1] / args.sizes[-1]) / (times[0] / args.sizes[0])
+            growths.append(growth)
+            if growth > args.max_growth:
+                failures.append(f"{pattern} on {name}: time per character grew {growth:.2f}x (limit {args.max_growth}x)")
+        print(f"  {name:<20}  {' '.join(f'{ms:8.2f}' for ms in legacy)}  "
+              + "  ".join(f"{ms:12.2f}" for ms in largest)
+              + (f"  {max(growths):.2f}x" if growths else "  -"))
+
+    budget = analysis_limits.ANALYSIS_CPU_SECONDS
+    print(f"\nheuristic analysis at {ANALYSIS_MAX_CHARS} chars, CPU ms (budget {budget * 1000:.0f} ms; "
+          "then with a quarter of the time it needs)")
+    for name, make in HOSTILE.items():
+        text = make(ANALYSIS_MAX_CHARS)[:ANALYSIS_MAX_CHARS]
+        analysis_limits.ANALYSIS_CPU_SECONDS = budget
+        used, stopped = cpu_time_of(heuristic_analysis_of, text)
+        if stopped:
+            failures.append(f"{name}: analysis ran out of its {budget}s CPU budget after {used * 1000:.0f} ms")
+        analysis_limits.ANALYSIS_CPU_SECONDS = used / 4
+        cut_used, cut_stopped = cpu_time_of(heuristic_analysis_of, text)
+        overshoot_ms = (cut_used - used / 4) * 1000
+        print(f"  {name:<20} {used * 1000:8.1f}   cut to {used / 4 * 1000:6.1f}: "
+              f"{'stopped' if cut_stopped else 'finished'} after {cut_used * 1000:6.1f} (+{overshoot_ms:.1f})")
+        if overshoot_ms > args.max_overshoot_ms:
+            failures.append(f"{name}: ran {overshoot_ms:.0f} ms past its CPU budget (limit {args.max_overshoot_ms} ms)")
+    analysis_limits.ANALYSIS_CPU_SECONDS = budget
+
+    rows, rejection_failures = check_rejections(args.max_reject_ms)
+    failures += rejection_failures
+    print("\n5 MB of digits")
+    for label, status, elapsed_ms in rows:
+        print(f"  {label:<34} {status}  {elapsed_ms:7.1f} ms")
+
+    for failure in failures[:20]:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Internshala card parsing throughput for each installed HTML parser backend.
+
+Parses the recorded search result pages in benchmarks/fixtures with every
+backend html_parsing can find (selectolax, lxml, BeautifulSoup with a
+SoupStrainer, BeautifulSoup with html.parser). Input is the raw response
+bytes, as the aggregator sees them. html.parser is also timed on decoded
+text, the old response.text path. Exits non-zero if a backend extracts
+different cards from html.parser.
+
+Run from the backend directory:
+    python benchmarks/bench_html_parsing.py [--seconds 2]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregator import INTERNSHALA_CARD, INTERNSHALA_FIELDS  # noqa: E402
+from html_parsing import available_backends, get_extractor  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def cards_per_second(extract, pages, seconds):
+    cards = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for page in pages:
+            cards += len(extract(page, INTERNSHALA_CARD, INTERNSHALA_FIELDS))
+    return cards / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time spent per backend")
+    args = parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "internshala_page_*.html"))):
+        with open(path, "rb") as fixture:
+            pages.append(fixture.read())
+    reference = [get_extractor("html.parser")(page, INTERNSHALA_CARD, INTERNSHALA_FIELDS) for page in pages]
+    print(f"{len(pages)} recorded pages, {sum(len(cards) for cards in reference)} cards")
+
+    baseline = cards_per_second(get_extractor("html.parser"), [page.decode("utf-8") for page in pages], args.seconds)
+    print(f"  {'html.parser (str)':18} {baseline:9.0f} cards/s   1.0x")
+
+    mismatches = 0
+    for name in available_backends():
+        extract = get_extractor(name)
+        if [extract(page, INTERNSHALA_CARD, INTERNSHALA_FIELDS) for page in pages] != reference:
+            print(f"  {name:18} MISMATCH: extracted cards differ from html.parser")
+            mismatches += 1
+            continue
+        rate = cards_per_second(extract, pages, args.seconds)
+        print(f"  {name + ' (bytes)':18} {rate:9.0f} cards/s {rate / baseline:6.1f}x")
+    print(f"\nHTML_PARSER=auto uses {available_backends()[0]}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
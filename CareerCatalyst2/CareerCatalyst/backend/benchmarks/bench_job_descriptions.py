@@ -0,0 +1,103 @@
+"""
+Compiled job descriptions: per-resume CPU time and prompt size for one posting.
+
+Scores a pool of synthetic resumes against one realistic posting twice with
+local heuristic scoring: once passing the posting's text to every analysis,
+and once passing a compiled job description. Reports time per resume and
+the estimated Gemini prompt tokens of each variant. Exits non-zero if the
+two variants disagree on any skills analysis.
+
+Run from the backend directory:
+    python benchmarks/bench_job_descriptions.py [--resumes 500]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_section_detection import synthetic_resume  # noqa: E402
+from ats_analyzer import analyzeResume, build_analysis_prompt, result_cache  # noqa: E402
+from job_descriptions import compile_job_description  # noqa: E402
+from llm_client import estimate_tokens  # noqa: E402
+
+POSTING = """Senior Backend Engineer (Payments Platform)
+
+About us
+We are a fast-growing fintech company building payment infrastructure for small
+businesses. Since our founding we have processed billions in transactions for more than
+40,000 merchants. Our engineering culture values ownership, curiosity, written
+communication and shipping small changes often. We are a remote-first team spread over
+six time zones and meet in person twice a year.
+
+What you'll do
+- Design, build and operate scalable REST APIs and event-driven services in Python
+- Own services end to end, from design documents to deployment on Kubernetes
+- Improve reliability and latency of our ledger and payouts systems
+- Work with product managers and designers to scope new features
+- Mentor other engineers and take part in code reviews and on-call
+
+What we're looking for
+- 5+ years of professional experience in backend development
+- Strong knowledge of Python and one web framework such as Django or Flask
+- Experience with PostgreSQL, Redis and message queues like Kafka or RabbitMQ
+- Hands-on experience with AWS, Docker and CI/CD pipelines
+- Understanding of distributed systems, observability and secure coding practices
+- Excellent communication skills and a habit of writing things down
+
+Nice to have
+- Experience in payments, banking or other regulated industries
+- Familiarity with Go or Rust
+
+Benefits
+Competitive salary and equity. Health insurance for you and your dependants. A yearly
+learning budget, a home office stipend, 25 days of paid leave plus local holidays, and
+a four-day work week in August. We are an equal opportunity employer and welcome
+applicants of every background.
+"""
+
+
+def run(resumes, job_description):
+    result_cache.clear()
+    start = time.perf_counter()
+    results = [analyzeResume(resume, job_description, "heuristic") for resume in resumes]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--words", type=int, default=600)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    resumes = [synthetic_resume(rng, args.words) for _ in range(args.resumes)]
+
+    start = time.perf_counter()
+    compiled = compile_job_description(POSTING)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    plain_results, plain_s = run(resumes, POSTING)
+    compiled_results, compiled_s = run(resumes, compiled)
+
+    plain_tokens = estimate_tokens(build_analysis_prompt(resumes[0], POSTING))
+    compiled_tokens = estimate_tokens(build_analysis_prompt(resumes[0], compiled))
+
+    print(f"{args.resumes} resumes against one posting ({compiled.token_count} tokens, "
+          f"{compiled.condensed_token_count} condensed); compiled once in {compile_ms:.1f} ms")
+    print(f"  {'':<22}  {'ms/resume':>10}  {'prompt tokens':>14}")
+    print(f"  {'posting text':<22}  {plain_s / args.resumes * 1000:>10.3f}  {plain_tokens:>14}")
+    print(f"  {'compiled description':<22}  {compiled_s / args.resumes * 1000:>10.3f}  {compiled_tokens:>14}")
+    print(f"  time {plain_s / compiled_s:.2f}x faster, "
+          f"{100 * (1 - compiled_tokens / plain_tokens):.0f}% fewer prompt tokens")
+
+    for plain, fast in zip(plain_results, compiled_results):
+        if plain["skillsAnalysis"] != fast["skillsAnalysis"]:
+            print("FAIL: compiled job description changed the skills analysis")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Resume-to-job matching: BM25 index build time and query latency by corpus size.
+
+Generates synthetic listings whose words follow a Zipf distribution over a
+made-up vocabulary, the way words in real postings do. For each corpus size
+it builds a JobIndex and ranks synthetic resumes against every listing. It
+first checks the sparse-matrix scores against a plain Python BM25 on a small
+corpus. Exits non-zero if the scores disagree or if p95 query latency at
+the largest size is over budget.
+
+Run from the backend directory:
+    python benchmarks/bench_job_matching.py [--max-listings 100000] [--budget-ms 50]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_keyword_matching import synthetic_terms  # noqa: E402
+from job_matching import BM25_B, BM25_K1, JobIndex, index_terms, listing_text  # noqa: E402
+
+
+def synthetic_texts(rng, vocabulary, count, words):
+    """`count` texts of about `words` words, word frequencies following Zipf's law"""
+    ranks = rng.zipf(1.3, size=count * words) % len(vocabulary)
+    lengths = rng.integers(words // 2, words * 3 // 2, size=count)
+    texts, start = [], 0
+    for length in lengths:
+        texts.append(" ".join(vocabulary[rank] for rank in ranks[start:start + length]))
+        start += length
+    return texts
+
+
+def synthetic_listings(rng, vocabulary, count, words=120):
+    titles = synthetic_texts(rng, vocabulary, count, 4)
+    descriptions = synthetic_texts(rng, vocabulary, count, words)
+    return [(i, {"title": title, "description": description})
+            for i, (title, description) in enumerate(zip(titles, descriptions))]
+
+
+def reference_scores(listings, resume):
+    """Textbook BM25, one listing at a time"""
+    docs = [Counter(index_terms(listing_text(job))) for _, job in listings]
+    avg_length = sum(sum(doc.values()) for doc in docs) / len(docs)
+    query = set(index_terms(resume))
+    scores = []
+    for doc in docs:
+        length = sum(doc.values())
+        score = 0.0
+        for term in query:
+            if term not in doc:
+                continue
+            df = sum(1 for other in docs if term in other)
+            idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            tf = doc[term]
+            score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+        scores.append(score)
+    return scores
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-listings", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--resume-words", type=int, default=600)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    vocabulary = synthetic_terms(random.Random(7), args.vocabulary)
+    vocabulary = [term.split()[0] for term in vocabulary]
+    rng = np.random.default_rng(7)
+    resumes = synthetic_texts(rng, vocabulary, args.queries, args.resume_words)
+
+    small = synthetic_listings(rng, vocabulary, 300)
+    index = JobIndex.build(small)
+    expected = np.array(reference_scores(small, resumes[0]))
+    actual = index.scores(index.query_terms(resumes[0]))
+    if not np.allclose(actual, expected, rtol=1e-4, atol=1e-4):
+        print(f"FAIL: BM25 scores differ from the reference by up to {np.abs(actual - expected).max():.5f}")
+        sys.exit(1)
+    print(f"BM25 scores match the reference implementation on {len(small)} listings")
+
+    print(f"{args.queries} resumes of ~{args.resume_words} words, top {args.limit}")
+    print(f"  {'listings':>9}  {'vocab':>7}  {'build s':>8}  {'MB':>6}  {'p50 ms':>7}  {'p95 ms':>7}  {'p99 ms':>7}")
+    count = 1000
+    while True:
+        count = min(count, args.max_listings)
+        listings = synthetic_listings(rng, vocabulary, count)
+        start = time.perf_counter()
+        index = JobIndex.build(listings)
+        build_s = time.perf_counter() - start
+        weights = index._weights
+        size_mb = (weights.data.nbytes + weights.indices.nbytes + weights.indptr.nbytes) / 2 ** 20
+
+        latencies = []
+        for resume in resumes:
+            start = time.perf_counter()
+            index.rank(resume, args.limit)
+            latencies.append((time.perf_counter() - start) * 1000)
+        p50, p95, p99 = (percentile(latencies, pct) for pct in (50, 95, 99))
+        print(f"  {count:>9}  {index.vocabulary_size:>7}  {build_s:>8.2f}  {size_mb:>6.1f}"
+              f"  {p50:>7.2f}  {p95:>7.2f}  {p99:>7.2f}")
+        if count >= args.max_listings:
+            break
+        count *= 10
+
+    if p95 > args.budget_ms:
+        print(f"FAIL: p95 query latency {p95:.1f} ms at {count} listings is over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
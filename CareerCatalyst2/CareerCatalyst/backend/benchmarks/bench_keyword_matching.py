@@ -0,0 +1,75 @@
+"""
+Keyword matching: per-keyword substring scans vs KeywordMatcher.
+
+Compares the old `[kw for kw in keywords if kw in text]` loop with the
+token-indexed matcher on synthetic resumes, then shows how the matcher
+scales as the vocabulary grows to tens of thousands of terms.
+
+Run from the backend directory:
+    python benchmarks/bench_keyword_matching.py [--resumes 500] [--max-terms 40000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_section_detection import synthetic_resume  # noqa: E402
+from keyword_matcher import SOFT_SKILLS, TECHNICAL_KEYWORDS, KeywordMatcher  # noqa: E402
+
+KEYWORDS = TECHNICAL_KEYWORDS + SOFT_SKILLS
+
+
+def substring_keywords(text, keywords):
+    text_lower = text.lower()
+    return [kw for kw in keywords if kw in text_lower]
+
+
+def per_doc_us(func, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        func(text)
+    return (time.perf_counter() - start) / len(corpus) * 1e6
+
+
+def synthetic_terms(rng, count):
+    """Made-up one to three word skill names that never occur in the corpus"""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    terms = set()
+    while len(terms) < count:
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(rng.randint(1, 3))]
+        terms.add(" ".join(words))
+    return list(terms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--max-terms", type=int, default=40000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    corpus = [synthetic_resume(rng, args.words) for _ in range(args.resumes)]
+    matcher = KeywordMatcher(KEYWORDS)
+
+    print(f"{args.resumes} resumes, {args.words} words each, {len(KEYWORDS)} keywords")
+    print(f"  substring scan        {per_doc_us(lambda t: substring_keywords(t, KEYWORDS), corpus):8.1f} us/resume")
+    print(f"  KeywordMatcher.terms  {per_doc_us(matcher.terms_in, corpus):8.1f} us/resume")
+    print(f"  KeywordMatcher.find   {per_doc_us(matcher.find, corpus):8.1f} us/resume")
+
+    print("\nVocabulary scaling (us/resume)")
+    print(f"  {'terms':>8}  {'substring':>10}  {'matcher':>10}")
+    size = len(KEYWORDS)
+    while size <= args.max_terms:
+        vocabulary = KEYWORDS + synthetic_terms(rng, size - len(KEYWORDS))
+        scaled = KeywordMatcher(vocabulary)
+        substring = per_doc_us(lambda t: substring_keywords(t, vocabulary), corpus[:50])
+        print(f"  {size:>8}  {substring:>10.1f}  {per_doc_us(scaled.terms_in, corpus):>10.1f}")
+        size *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+LLM client resilience: retries, attempt deadlines, hedging and the circuit breaker.
+
+Runs batches of concurrent calls through llm_client.generate_content_async
+against a FaultyStubModel, one scenario at a time:
+  - transient 503s: success rate with and without retries
+  - hung requests: every call still finishes, inside the attempt deadline
+  - slow tail: p99 latency with and without hedged requests
+  - outage: the breaker opens, later calls are rejected at once and
+    analyzeResumeAsync falls back to local scoring; after the reset
+    period one trial call closes the circuit and traffic flows again
+Exits non-zero if any of those expectations fails.
+
+Run from the backend directory:
+    python benchmarks/bench_llm_resilience.py [--calls 200]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "stub-key")
+
+from bench_job_matching import percentile  # noqa: E402
+import ats_analyzer  # noqa: E402
+import llm_client  # noqa: E402
+import model_registry  # noqa: E402
+from llm_client import CircuitBreaker, CircuitOpenError, generate_content_async  # noqa: E402
+from stub_model import FaultyStubModel  # noqa: E402
+
+# Scaled down from the production defaults so the scenarios finish in seconds
+SETTINGS = {
+    "LLM_RETRY_BASE_SECONDS": 0.02,
+    "LLM_RETRY_MAX_SECONDS": 0.2,
+    "LLM_ATTEMPT_TIMEOUT_SECONDS": 0.5,
+    "LLM_TIMEOUT_SECONDS": 3.0,
+}
+
+
+def configure(**overrides):
+    for name, value in {**SETTINGS, **overrides}.items():
+        setattr(llm_client, name, value)
+    llm_client.llm_breaker = CircuitBreaker(failure_threshold=5, reset_seconds=0.5)
+
+
+async def run_calls(model, calls, concurrency=8):
+    """(latencies in ms, successes, errors by type)"""
+    limiter = asyncio.Semaphore(concurrency)
+    latencies, errors = [], {}
+
+    async def one(index):
+        async with limiter:
+            start = time.perf_counter()
+            try:
+                await generate_content_async(model, f"prompt {index}")
+            except Exception as error:
+                errors[type(error).__name__] = errors.get(type(error).__name__, 0) + 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return latencies, calls - sum(errors.values()), errors
+
+
+def report(name, calls, latencies, successes, errors):
+    print(f"  {name:<38}  {successes:>4}/{calls:<4}  p50 {percentile(latencies, 50):7.1f}"
+          f"  p95 {percentile(latencies, 95):7.1f}  p99 {percentile(latencies, 99):7.1f} ms  {errors or ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    calls = args.calls
+    failures = []
+
+    print(f"{calls} calls per scenario, 8 at a time, stub latency {args.latency * 1000:.0f} ms")
+
+    for retries in (0, 2):
+        configure(LLM_MAX_RETRIES=retries, LLM_HEDGE_AFTER_SECONDS=0)
+        model = FaultyStubModel(latency=args.latency, error_rate=0.2)
+        latencies, successes, errors = asyncio.run(run_calls(model, calls))
+        report(f"20% transient 503s, {retries} retries", calls, latencies, successes, errors)
+    if successes < calls * 0.97:
+        failures.append(f"only {successes}/{calls} calls succeeded with retries at a 20% error rate")
+
+    configure(LLM_MAX_RETRIES=2, LLM_HEDGE_AFTER_SECONDS=0)
+    model = FaultyStubModel(latency=args.latency, hang_rate=0.03)
+    latencies, successes, errors = asyncio.run(run_calls(model, calls))
+    report("3% hung requests, 0.5 s attempt limit", calls, latencies, successes, errors)
+    if max(latencies) > llm_client.LLM_TIMEOUT_SECONDS * 1000 + 100:
+        failures.append("a hung request outlived the call deadline")
+
+    tails = {}
+    for hedge in (0, 0.15):
+        configure(LLM_MAX_RETRIES=2, LLM_HEDGE_AFTER_SECONDS=hedge)
+        model = FaultyStubModel(latency=args.latency, slow_rate=0.05, slow_latency=0.45)
+        latencies, successes, errors = asyncio.run(run_calls(model, calls))
+        tails[hedge] = percentile(latencies, 99)
+        label = f"5% slow, hedge after {hedge * 1000:.0f} ms" if hedge else "5% slow, no hedging"
+        report(label, calls, latencies, successes, errors)
+    if tails[0.15] >= tails[0]:
+        failures.append("hedging did not reduce p99 latency")
+
+    configure(LLM_MAX_RETRIES=2, LLM_HEDGE_AFTER_SECONDS=0)
+    model = FaultyStubModel(latency=args.latency)
+    model.down = True
+    latencies, successes, errors = asyncio.run(run_calls(model, calls))
+    report("provider down", calls, latencies, successes, errors)
+    breaker = llm_client.llm_breaker.stats()
+    print(f"    breaker {breaker['state']}, opened {breaker['opened']}x, "
+          f"{breaker['rejected']} calls rejected, model called {model.calls}x")
+    if model.calls > calls // 4 or errors.get(CircuitOpenError.__name__, 0) == 0:
+        failures.append("the circuit breaker did not stop calls to a provider that is down")
+
+    model_registry.set_gemini_model(ats_analyzer.MODEL_NAME, model)
+    result = asyncio.run(ats_analyzer.analyzeResumeAsync("Jane Doe jane@example.com\nSKILLS\nPython"))
+    print(f"    analysis while down: score {result['totalScore']}, fallback: {result['aiAnalysis']['fallbackReason']}")
+    if not result["aiAnalysis"]["fallbackReason"]:
+        failures.append("analysis during an outage was not marked as a fallback")
+
+    model.down = False
+    time.sleep(llm_client.llm_breaker.reset_seconds)
+    _, trial_ok, _ = asyncio.run(run_calls(model, 1))
+    latencies, successes, errors = asyncio.run(run_calls(model, calls))
+    report("provider back, after one trial call", calls, latencies, successes, errors)
+    if not trial_ok or successes != calls or llm_client.llm_breaker.state != "closed":
+        failures.append("the circuit did not close after the provider recovered")
+
+    print(f"  counters: {llm_client.llm_stats()}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
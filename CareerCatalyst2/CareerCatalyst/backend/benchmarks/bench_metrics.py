@@ -0,0 +1,118 @@
+"""
+Instrumentation: per-stage latency from /metrics and the cost of recording it.
+
+Uploads resumes to /analyze-resume-file (with a local stub model), scrapes
+/metrics and prints each pipeline stage's count and mean time. Also times
+one time_stage block, and compares the old per-request debug prints in
+calculate_comprehensive_score with the debug log call that replaced them
+(at the default INFO level). Exits non-zero if a stage is missing from
+/metrics or the instrumentation costs more than --max-overhead-us per stage.
+
+Run from the backend directory:
+    python benchmarks/bench_metrics.py [--resumes 200]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "stub-key")
+os.environ.setdefault("LOG_LEVEL", "INFO")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from bench_section_detection import synthetic_resume  # noqa: E402
+import app as backend  # noqa: E402
+import model_registry  # noqa: E402
+from ats_analyzer import MODEL_NAME, logger, result_cache  # noqa: E402
+from metrics import STAGES, time_stage  # noqa: E402
+from stub_model import StubModel  # noqa: E402
+
+SAMPLE_RE = re.compile(r'^careercatalyst_stage_duration_seconds_(sum|count)\{stage="([^"]+)"\} (\S+)$', re.M)
+
+
+def old_debug_prints(out):
+    """The nine f-string prints calculate_comprehensive_score made on every request"""
+    values = (78, 65, 9, 3, 4, 10, 2, 2, 5, 3, 8, 1, 68)
+    with contextlib.redirect_stdout(out):
+        print(f"🔍 DEBUG - Raw AI score: {values[0]}")
+        print(f"🔍 DEBUG - Adjusted AI base score: {values[1]}")
+        print(f"🔍 DEBUG - Section score: {values[2]} ({values[3]}/{values[4]} essential sections)")
+        print(f"🔍 DEBUG - Formatting penalty: {values[5]} (issues: {values[6]})")
+        print(f"🔍 DEBUG - Content bonus: {values[7]}")
+        print(f"🔍 DEBUG - Suggestion penalty: {values[8]} (suggestions: {values[9]})")
+        print(f"🔍 DEBUG - Missing section penalty: {values[10]} (missing: {values[11]})")
+        print(f"🔍 DEBUG - Calculation: {values[1]} + {values[2]} + {values[7]} - {values[5]} = {values[12]}")
+        print(f"🔍 DEBUG - Final score (bounded): {values[12]}")
+
+
+def new_debug_log():
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("score calculated", extra={"final_score": 68})
+
+
+def per_call_us(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def empty_stage():
+    with time_stage("bench"):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=100000)
+    parser.add_argument("--max-overhead-us", type=float, default=20.0)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    model_registry.set_gemini_model(MODEL_NAME, StubModel(latency=0.005))
+    result_cache.clear()
+    client = TestClient(backend.app)
+    rng = random.Random(7)
+    for index in range(args.resumes):
+        upload = {"resume_file": (f"resume{index}.txt", synthetic_resume(rng, 400).encode("utf-8"))}
+        response = client.post("/analyze-resume-file", files=upload)
+        if response.status_code != 200:
+            sys.exit(f"analysis failed with status {response.status_code}")
+
+    samples = {}
+    for kind, stage, value in SAMPLE_RE.findall(client.get("/metrics").text):
+        samples.setdefault(stage, {})[kind] = float(value)
+    failures = [f"stage '{stage}' missing from /metrics" for stage in STAGES if stage not in samples]
+
+    print(f"{args.resumes} uploads, stub model latency 5 ms")
+    print(f"  {'stage':<20}  {'count':>6}  {'mean ms':>8}")
+    for stage in STAGES:
+        sample = samples.get(stage, {"count": 0, "sum": 0.0})
+        mean_ms = sample["sum"] / sample["count"] * 1000 if sample["count"] else 0.0
+        print(f"  {stage:<20}  {sample['count']:>6.0f}  {mean_ms:>8.3f}")
+
+    stage_us = per_call_us(empty_stage, args.repeat)
+    out = io.StringIO()
+    prints_us = per_call_us(lambda: old_debug_prints(out), args.repeat // 10)
+    log_us = per_call_us(new_debug_log, args.repeat)
+    print(f"  time_stage overhead {stage_us:.2f} us per stage")
+    print(f"  score debug output per request: {prints_us:.2f} us as prints, {log_us:.2f} us as a disabled debug log")
+    if stage_us > args.max_overhead_us:
+        failures.append(f"time_stage costs {stage_us:.1f} us (limit {args.max_overhead_us} us)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
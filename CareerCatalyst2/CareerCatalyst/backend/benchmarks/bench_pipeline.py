@@ -0,0 +1,229 @@
+"""
+Pipeline benchmark suite: throughput and p50/p95/p99 latency per stage and end to end.
+
+Generates a synthetic corpus (see corpus.py) and measures, with a
+deterministic stub model in place of Gemini:
+  - extract_text_from_file on PDF, DOCX and TXT uploads of every resume size
+  - analyzeResume end to end per resume size, with and without a job
+    description, and each pipeline stage inside it (from the time_stage timings)
+  - simple_ats_analysis per resume size
+  - fetch_internshala's aggregation against a local server serving the saved
+    Internshala pages, and parse_internshala on those pages
+Results can be saved as JSON (--output) and compared with an earlier run
+(--compare): the run exits non-zero if any benchmark's p50 is more than
+--max-regression slower than in the baseline (and by more than
+--noise-floor-ms, so sub-millisecond jitter is not reported).
+
+Run from the backend directory:
+    python benchmarks/bench_pipeline.py [--per-size 20] [--output run.json] [--compare baseline.json]
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "stub-key")
+
+from fastapi import UploadFile  # noqa: E402
+
+from bench_aggregator import StubHandler, load_fixture  # noqa: E402
+from bench_job_matching import percentile  # noqa: E402
+from corpus import JOB_DESCRIPTION_SIZES, RESUME_SIZES, generate_corpus, generate_job_description, render_files  # noqa: E402
+import app as backend  # noqa: E402
+import model_registry  # noqa: E402
+from aggregator import aggregate_jobs, internshala_source, parse_internshala  # noqa: E402
+from app_simple import simple_ats_analysis  # noqa: E402
+from ats_analyzer import MODEL_NAME, analyzeResume, result_cache  # noqa: E402
+from metrics import stage_seconds  # noqa: E402
+from stub_model import BlockingStubModel  # noqa: E402
+
+
+class Recorder:
+    """Latency samples (seconds) per benchmark name"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def measure(self, name, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        self.samples[name].append(time.perf_counter() - start)
+        return result
+
+    def capture_stages(self):
+        """Also record every time_stage timing as a 'stage/<name>' sample"""
+        observe = stage_seconds.observe
+
+        def observe_and_record(stage, seconds):
+            observe(stage, seconds)
+            self.samples[f"stage/{stage}"].append(seconds)
+        stage_seconds.observe = observe_and_record
+
+    def results(self):
+        results = {}
+        for name, samples in self.samples.items():
+            total = sum(samples)
+            results[name] = {
+                "count": len(samples),
+                "throughputPerSecond": round(len(samples) / total, 2) if total else None,
+                "meanMs": round(total / len(samples) * 1000, 4),
+                "p50Ms": round(percentile(samples, 50) * 1000, 4),
+                "p95Ms": round(percentile(samples, 95) * 1000, 4),
+                "p99Ms": round(percentile(samples, 99) * 1000, 4),
+            }
+        return results
+
+
+def upload(name, content):
+    return UploadFile(io.BytesIO(content), filename=name)
+
+
+def warm_up(corpus):
+    """Load the lazily imported parsers and models before anything is timed"""
+    for extension, content in render_files(corpus[0]).items():
+        backend.extract_text_from_file(upload(f"warmup.{extension}", content))
+    analyzeResume(corpus[0].text)
+    result_cache.clear()
+
+
+def bench_extraction(recorder, corpus, rounds):
+    files = [(resume, render_files(resume)) for resume in corpus]
+    for _ in range(rounds):
+        for resume, rendered in files:
+            for extension, content in rendered.items():
+                recorder.measure(f"extract_text_from_file/{extension}/{resume.size}",
+                                 backend.extract_text_from_file, upload(f"{resume.name}.{extension}", content))
+
+
+def bench_analysis(recorder, corpus, job_descriptions, rounds):
+    for _ in range(rounds):
+        for resume in corpus:
+            for label, job_description in [("no-jd", None)] + [(f"jd-{size}", text) for size, text in job_descriptions]:
+                result_cache.clear()
+                recorder.measure(f"analyzeResume/{resume.size}/{label}", analyzeResume, resume.text, job_description)
+
+
+def bench_simple_analysis(recorder, corpus, job_descriptions, rounds):
+    for _ in range(rounds):
+        for resume in corpus:
+            recorder.measure(f"simple_ats_analysis/{resume.size}", simple_ats_analysis, resume.text)
+            recorder.measure(f"simple_ats_analysis/{resume.size}/jd", simple_ats_analysis,
+                             resume.text, job_descriptions[-1][1])
+
+
+def bench_job_fetching(recorder, fetches):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # fetch_internshala, pointed at the local server instead of internshala.com
+    sources = [internshala_source(f"http://127.0.0.1:{server.server_address[1]}")]
+    query = ("python", "bangalore", "Internship")
+    aggregate_jobs(*query, sources=sources)
+    for _ in range(fetches):
+        recorder.measure("fetch_internshala/local-server", aggregate_jobs, *query, sources)
+    server.shutdown()
+
+    pages = [load_fixture(1).decode("utf-8"), load_fixture(2).decode("utf-8")]
+    for _ in range(fetches):
+        for page in pages:
+            recorder.measure("parse_internshala/page", parse_internshala, page, "bangalore", "Internship")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline_path, max_regression, noise_floor_ms):
+    """Print p50 changes against a baseline run; return the names that regressed"""
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    print(f"\ncompared with {baseline_path} (p50)")
+    regressed = []
+    for name in sorted(set(results) & set(baseline)):
+        before, after = baseline[name]["p50Ms"], results[name]["p50Ms"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > max_regression and after - before > noise_floor_ms:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:<40}  {before:>10.3f}  {after:>10.3f} ms  {change:>+7.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--per-size", type=int, default=20, help="resumes per size")
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the corpus")
+    parser.add_argument("--fetches", type=int, default=20)
+    parser.add_argument("--model-latency", type=float, default=0.0, help="stub model latency in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed p50 slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument("--noise-floor-ms", type=float, default=0.05, help="smaller p50 slowdowns are ignored")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    model_registry.set_gemini_model(MODEL_NAME, BlockingStubModel(latency=args.model_latency))
+    corpus = generate_corpus(args.seed, args.per_size)
+    rng = random.Random(args.seed)
+    job_descriptions = [(size, generate_job_description(rng, size)) for size in JOB_DESCRIPTION_SIZES]
+
+    warm_up(corpus)
+    recorder = Recorder()
+    recorder.capture_stages()
+    start = time.perf_counter()
+    bench_extraction(recorder, corpus, args.rounds)
+    bench_analysis(recorder, corpus, job_descriptions, args.rounds)
+    bench_simple_analysis(recorder, corpus, job_descriptions, args.rounds)
+    bench_job_fetching(recorder, args.fetches)
+    elapsed = time.perf_counter() - start
+
+    results = recorder.results()
+    print(f"{len(corpus)} resumes ({', '.join(RESUME_SIZES)}), {args.rounds} rounds, "
+          f"stub model latency {args.model_latency * 1000:.0f} ms, {elapsed:.1f} s total")
+    print(f"  {'benchmark':<40}  {'count':>6}  {'per s':>9}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}")
+    for name in sorted(results):
+        result = results[name]
+        print(f"  {name:<40}  {result['count']:>6}  {result['throughputPerSecond'] or 0:>9.1f}  "
+              f"{result['p50Ms']:>9.3f}  {result['p95Ms']:>9.3f}  {result['p99Ms']:>9.3f}")
+
+    if args.output:
+        run = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "args": vars(args),
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as out:
+            json.dump(run, out, indent=2)
+        print(f"\nsaved results to {args.output}")
+
+    if args.compare:
+        regressed = compare(results, args.compare, args.max_regression, args.noise_floor_ms)
+        for name in regressed:
+            print(f"FAIL: {name} p50 is more than {args.max_regression:.0%} slower than the baseline")
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
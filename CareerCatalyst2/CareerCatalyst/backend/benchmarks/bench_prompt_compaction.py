@@ -0,0 +1,176 @@
+"""
+Prompt compaction: Gemini prompt size and end-to-end analysis latency by resume length.
+
+Generates realistic one- to four-page resumes, including what PDF extraction
+leaves in them: a repeated page header and footer, "Page 2 of 3" markers,
+column padding and runs of blank lines. Each resume is analyzed against a
+real posting with analyzeResumeAsync and a local stub model whose latency
+grows with prompt length. This is done once with the raw text in the prompt
+and once with the compacted text. Exits non-zero if a compacted resume is
+over its token budget or loses its Skills or Work Experience section.
+
+Run from the backend directory (set PROMPT_RESUME_TOKEN_BUDGET to try other budgets):
+    python benchmarks/bench_prompt_compaction.py [--resumes-per-size 10] [--seconds-per-1k-tokens 0.1]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "stub-key")
+
+from bench_job_descriptions import POSTING  # noqa: E402
+from bench_job_matching import percentile  # noqa: E402
+import ats_analyzer  # noqa: E402
+import model_registry  # noqa: E402
+from llm_client import estimate_tokens  # noqa: E402
+from prompt_compaction import PROMPT_RESUME_TOKEN_BUDGET, compact_text  # noqa: E402
+from section_detector import scan_sections  # noqa: E402
+from stub_model import StubModel  # noqa: E402
+
+TECHNOLOGIES = [
+    "Python", "Go", "Java", "TypeScript", "React", "PostgreSQL", "Redis", "Kafka", "Docker",
+    "Kubernetes", "AWS", "Terraform", "GraphQL", "Spark", "Airflow", "gRPC", "Django", "FastAPI",
+]
+ACHIEVEMENTS = [
+    "Designed and shipped a {tech} service handling {n}k requests per second with p99 latency under {m} ms",
+    "Migrated {n} legacy jobs to {tech}, cutting infrastructure cost by {m}% and on-call pages by half",
+    "Led a team of {m} engineers to rebuild the billing pipeline on {tech} ahead of a {n}-week deadline",
+    "Introduced {tech}-based integration tests that raised coverage from {m}% to {n}% across core services",
+    "Reduced page load time by {m}% by moving rendering to {tech} and caching {n} hot endpoints",
+    "Automated deployments with {tech}, taking release time from {n} hours to {m} minutes",
+    "Mentored {m} junior engineers and ran a weekly {tech} reading group attended by {n} people",
+    "Partnered with product and data science to launch a {tech} recommendation feature used by {n}k customers",
+]
+TITLES = ["Senior Software Engineer", "Software Engineer", "Backend Engineer", "Staff Engineer", "Tech Lead"]
+COMPANIES = ["Northwind Labs", "Acme Payments", "Globex Cloud", "Initech Analytics", "Umbrella Health", "Hooli"]
+
+
+def bullet(rng):
+    template = rng.choice(ACHIEVEMENTS)
+    return "• " + template.format(tech=rng.choice(TECHNOLOGIES), n=rng.randint(2, 90), m=rng.randint(3, 60))
+
+
+def realistic_resume(rng, pages):
+    """A resume of about `pages` pages as text extraction returns it from a PDF"""
+    number = rng.randint(1, 9999)
+    header = f"Jane Doe    |    jane.doe{number}@example.com    |    (555) 123-4567    |    Austin, TX"
+    lines = [
+        header, "", "",
+        "PROFESSIONAL SUMMARY",
+        "Backend engineer with {0} years of experience building distributed systems, data pipelines and "
+        "developer tooling for high-traffic products. Comfortable owning services end to end, from design "
+        "documents to on-call, and known for clear written communication.".format(rng.randint(4, 15)),
+        "",
+        "TECHNICAL SKILLS",
+        "Languages:      " + ", ".join(rng.sample(TECHNOLOGIES[:4], 3)),
+        "Frameworks:     " + ", ".join(rng.sample(TECHNOLOGIES[4:], 5)),
+        "Practices:      code review, observability, incident response, technical writing",
+        "",
+        "PROFESSIONAL EXPERIENCE",
+    ]
+    for job in range(2 * pages):
+        year = 2024 - 2 * job
+        lines += [
+            "",
+            f"{rng.choice(TITLES)}        {rng.choice(COMPANIES)}        {year - 2} - {year}",
+        ]
+        lines += [bullet(rng) for _ in range(rng.randint(5, 8))]
+    lines += ["", "PROJECTS"]
+    lines += [bullet(rng) for _ in range(2 * pages)]
+    lines += [
+        "", "EDUCATION",
+        "B.Sc. Computer Science, University of Texas at Austin, 2012",
+        "", "CERTIFICATIONS",
+        "AWS Certified Solutions Architect - Associate",
+    ]
+
+    # Paginate the way PDF text extraction does: footer, page marker, header again
+    lines_per_page = max(1, len(lines) // pages)
+    total_pages = (len(lines) + lines_per_page - 1) // lines_per_page
+    output = []
+    for page in range(total_pages):
+        if page:
+            output += ["", "", header, ""]
+        output += lines[page * lines_per_page:(page + 1) * lines_per_page]
+        output += ["", f"Jane Doe - Resume - jane.doe{number}@example.com", f"Page {page + 1} of {total_pages}", "", ""]
+    return "\n".join(output)
+
+
+def uncompacted_prompt(resume_text, job_description=None):
+    """prepare_analysis_prompt without compaction: the raw texts go into the prompt"""
+    prompt = ats_analyzer.build_analysis_prompt(resume_text, job_description)
+    return prompt, {"estimatedTokens": estimate_tokens(prompt)}
+
+
+async def analyze_all(resumes):
+    latencies, tokens = [], []
+    for resume in resumes:
+        start = time.perf_counter()
+        result = await ats_analyzer.analyzeResumeAsync(resume, POSTING)
+        latencies.append((time.perf_counter() - start) * 1000)
+        tokens.append(result["aiAnalysis"]["prompt"]["estimatedTokens"])
+    return latencies, tokens
+
+
+def run(resumes, compacted):
+    ats_analyzer.result_cache.clear()
+    original = ats_analyzer.prepare_analysis_prompt
+    if not compacted:
+        ats_analyzer.prepare_analysis_prompt = uncompacted_prompt
+    try:
+        return asyncio.run(analyze_all(resumes))
+    finally:
+        ats_analyzer.prepare_analysis_prompt = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes-per-size", type=int, default=10)
+    parser.add_argument("--max-pages", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05, help="fixed stub model latency in seconds")
+    parser.add_argument("--seconds-per-1k-tokens", type=float, default=0.1)
+    args = parser.parse_args()
+
+    model = StubModel(latency=args.latency, seconds_per_1k_tokens=args.seconds_per_1k_tokens)
+    model_registry.set_gemini_model(ats_analyzer.MODEL_NAME, model)
+    rng = random.Random(7)
+    failed = False
+
+    print(f"stub model: {args.latency * 1000:.0f} ms + {args.seconds_per_1k_tokens * 1000:.0f} ms per 1k prompt tokens; "
+          f"resume budget {PROMPT_RESUME_TOKEN_BUDGET} tokens")
+    print(f"  {'pages':>5}  {'resume tok':>10}  {'prompt tok':>10}  {'compacted':>9}  {'saved':>6}"
+          f"  {'raw p50 ms':>10}  {'p95':>7}  {'compact p50 ms':>14}  {'p95':>7}  {'compact ms':>10}")
+    for pages in range(1, args.max_pages + 1):
+        resumes = [realistic_resume(rng, pages) for _ in range(args.resumes_per_size)]
+
+        start = time.perf_counter()
+        compacted = [compact_text(resume, PROMPT_RESUME_TOKEN_BUDGET) for resume in resumes]
+        compact_ms = (time.perf_counter() - start) * 1000 / len(resumes)
+        for result in compacted:
+            if result.tokens > PROMPT_RESUME_TOKEN_BUDGET:
+                print(f"FAIL: compacted resume has {result.tokens} tokens, over the {PROMPT_RESUME_TOKEN_BUDGET} budget")
+                failed = True
+            sections, _ = scan_sections(result.text)
+            if not (sections["Skills"] and sections["Work Experience"]):
+                print("FAIL: compaction lost the Skills or Work Experience section")
+                failed = True
+
+        raw_latencies, raw_tokens = run(resumes, compacted=False)
+        compact_latencies, compact_tokens = run(resumes, compacted=True)
+        resume_tokens = sum(estimate_tokens(resume) for resume in resumes) / len(resumes)
+        raw_avg = sum(raw_tokens) / len(raw_tokens)
+        compact_avg = sum(compact_tokens) / len(compact_tokens)
+        print(f"  {pages:>5}  {resume_tokens:>10.0f}  {raw_avg:>10.0f}  {compact_avg:>9.0f}  {100 * (1 - compact_avg / raw_avg):>5.0f}%"
+              f"  {percentile(raw_latencies, 50):>10.1f}  {percentile(raw_latencies, 95):>7.1f}"
+              f"  {percentile(compact_latencies, 50):>14.1f}  {percentile(compact_latencies, 95):>7.1f}  {compact_ms:>10.2f}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
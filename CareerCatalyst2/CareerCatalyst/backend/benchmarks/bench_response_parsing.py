@@ -0,0 +1,106 @@
+"""
+AI response parsing: validation cost and local repair rate for malformed model output.
+
+Builds model responses the way Gemini gets them wrong: clean JSON, JSON in a
+code fence, JSON wrapped in prose, trailing commas, fractional scores, and
+truncated (unrepairable) output. Parses each one with parse_analysis and
+with the old first-"{"-to-last-"}" slice. Reports time per response and how
+many of each kind come out as a valid analysis. Exits non-zero if a
+repairable kind is not repaired, or if an invalid response is accepted.
+
+Run from the backend directory:
+    python benchmarks/bench_response_parsing.py [--responses 2000]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_response import AnalysisParseError, parse_analysis, parse_stats  # noqa: E402
+from stub_model import STUB_ANALYSIS  # noqa: E402
+
+
+def with_trailing_commas(text):
+    """A comma after the last item of every array and object"""
+    return re.sub(r'(["\d\]}])(\n\s*[}\]])', r"\1,\2", text)
+
+
+RESPONSE_KINDS = {
+    "clean": (lambda text: text, True),
+    "code fence": (lambda text: f"```json\n{text}\n```", True),
+    "prose around": (lambda text: f"Here is the analysis you asked for:\n{text}\nLet me know if you need more.", True),
+    "trailing commas": (with_trailing_commas, True),
+    "fractional scores": (lambda text: text.replace('"ats_score": 78', '"ats_score": 77.6'), True),
+    "truncated": (lambda text: text[:len(text) // 2], False),
+    "score out of range": (lambda text: text.replace('"ats_score": 78', '"ats_score": 780'), False),
+}
+
+
+def legacy_parse(response_text):
+    """The old parser: slice from the first { to the last } and json.loads it"""
+    response_text = response_text.strip()
+    json_start = response_text.find('{')
+    json_end = response_text.rfind('}') + 1
+    return json.loads(response_text[json_start:json_end])
+
+
+def variant_analysis(rng):
+    analysis = json.loads(json.dumps(STUB_ANALYSIS))
+    analysis["improvement_suggestions"] = [
+        f"Suggestion {rng.randint(1, 1000)} about {rng.choice(['metrics', 'keywords', 'formatting'])}"
+        for _ in range(rng.randint(2, 8))
+    ]
+    return json.dumps(analysis, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=int, default=2000, help="responses per kind")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    failed = False
+    print(f"  {'response':<20}  {'parse us':>9}  {'valid':>6}  {'legacy us':>9}  {'legacy ok':>9}")
+    for kind, (mangle, repairable) in RESPONSE_KINDS.items():
+        responses = [mangle(variant_analysis(rng)) for _ in range(args.responses)]
+
+        valid = 0
+        start = time.perf_counter()
+        for response in responses:
+            try:
+                parse_analysis(response)
+                valid += 1
+            except AnalysisParseError:
+                pass
+        parse_us = (time.perf_counter() - start) / len(responses) * 1e6
+
+        legacy_ok = 0
+        start = time.perf_counter()
+        for response in responses:
+            try:
+                legacy_parse(response)
+                legacy_ok += 1
+            except ValueError:
+                pass
+        legacy_us = (time.perf_counter() - start) / len(responses) * 1e6
+
+        print(f"  {kind:<20}  {parse_us:>9.1f}  {valid:>6}  {legacy_us:>9.1f}  {legacy_ok:>9}")
+        if repairable and valid != len(responses):
+            print(f"FAIL: {len(responses) - valid} '{kind}' responses were not repaired")
+            failed = True
+        if not repairable and valid:
+            print(f"FAIL: {valid} invalid '{kind}' responses were accepted")
+            failed = True
+
+    print(f"  counters: {parse_stats.stats()}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Semantic matching: embedding throughput, cache reuse and cosine top-k latency.
+
+Embeds synthetic listings into a fresh on-disk embedding cache. It then
+embeds them again from the cache and reopens the memory-mapped cache the
+way a restarted worker would. Finally it ranks resumes against every
+listing with SemanticJobIndex and checks the partial sort against a full
+sort, and that those queries left the on-disk cache untouched. Also checks
+that two workers appending to one cache keep each other's rows, and that a
+skill alias ("k8s") scores closer to its canonical name than to an
+unrelated job. Exits non-zero if a check fails.
+
+Run from the backend directory:
+    python benchmarks/bench_semantic_matching.py [--listings 100000] [--encoder hashing]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_job_matching import percentile, synthetic_listings, synthetic_texts  # noqa: E402
+from bench_keyword_matching import synthetic_terms  # noqa: E402
+import model_registry  # noqa: E402
+from job_matching import listing_text  # noqa: E402
+from semantic_matching import (  # noqa: E402
+    SEMANTIC_MODEL_NAME, EmbeddingCache, Embedder, HashingEncoder, SemanticJobIndex, SentenceEncoder
+)
+
+
+def make_encoder(name):
+    if name == "sentence-transformers":
+        model = model_registry.get_sentence_encoder(SEMANTIC_MODEL_NAME)
+        if model is None:
+            sys.exit("sentence-transformers model unavailable")
+        return SentenceEncoder(model)
+    return HashingEncoder()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--listings", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--encoder", choices=["hashing", "sentence-transformers"], default="hashing")
+    args = parser.parse_args()
+
+    encoder = make_encoder(args.encoder)
+    vocabulary = [term.split()[0] for term in synthetic_terms(random.Random(7), 50000)]
+    rng = np.random.default_rng(7)
+    listings = synthetic_listings(rng, vocabulary, args.listings)
+    resumes = synthetic_texts(rng, vocabulary, args.queries, 600)
+    texts = [listing_text(job) for _, job in listings]
+    failed = False
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, encoder.name)
+        embedder = Embedder(encoder, EmbeddingCache(encoder.dim, path))
+
+        start = time.perf_counter()
+        index = SemanticJobIndex.build(listings, embedder=embedder)
+        cold_s = time.perf_counter() - start
+        start = time.perf_counter()
+        SemanticJobIndex.build(listings, embedder=embedder)
+        warm_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reopened = Embedder(encoder, EmbeddingCache(encoder.dim, path))
+        reopen_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        restored = reopened.embed(texts, persist=True)
+        restored_s = time.perf_counter() - start
+        if not np.array_equal(restored, index._vectors):
+            print("FAIL: embeddings read back from the memory-mapped cache differ")
+            failed = True
+
+        size_mb = os.path.getsize(path + ".f32") / 2 ** 20
+        print(f"{args.listings} listings, {encoder.name}, cache file {size_mb:.0f} MB")
+        print(f"  embed (cold)            {cold_s:8.2f} s   {args.listings / cold_s:9.0f} listings/s")
+        print(f"  embed (cached)          {warm_s:8.2f} s   {args.listings / warm_s:9.0f} listings/s")
+        print(f"  reopen cache            {reopen_ms:8.1f} ms")
+        print(f"  embed after reopen      {restored_s:8.2f} s")
+
+        latencies = []
+        for resume in resumes:
+            start = time.perf_counter()
+            ranked = index.rank(resume, args.limit)
+            latencies.append((time.perf_counter() - start) * 1000)
+            expected = np.argsort(-index.scores(resume), kind="stable")[:len(ranked)]
+            if [match["listingId"] for match in ranked] != expected.tolist():
+                print("FAIL: top-k differs from a full sort")
+                failed = True
+                break
+        print(f"  top-{args.limit} query (new resume) p50 {percentile(latencies, 50):.2f} ms"
+              f"  p95 {percentile(latencies, 95):.2f} ms  p99 {percentile(latencies, 99):.2f} ms")
+        if len(EmbeddingCache(encoder.dim, path)) != len(set(texts)):
+            print("FAIL: resume queries were written to the on-disk cache")
+            failed = True
+
+        shared = os.path.join(workdir, "shared")
+        first, second = (Embedder(encoder, EmbeddingCache(encoder.dim, shared)) for _ in range(2))
+        batches = [texts[i:i + 500] for i in range(0, 1500, 500)]
+        for worker, batch in zip([first, second, first], batches):
+            worker.embed(batch, persist=True)
+        merged = Embedder(encoder, EmbeddingCache(encoder.dim, shared))
+        written = [text for batch in batches for text in batch]
+        if not np.allclose(merged.embed(written, persist=True), encoder.encode(written), atol=1e-6):
+            print("FAIL: workers sharing a cache overwrote each other's rows")
+            failed = True
+
+        alias, canonical, unrelated = embedder.embed([
+            "deployed services on k8s",
+            "deployed services on kubernetes",
+            "baked pastries for a busy restaurant",
+        ])
+        print(f"  similarity k8s/kubernetes {alias @ canonical:.2f}, k8s/unrelated {alias @ unrelated:.2f}")
+        if alias @ canonical <= alias @ unrelated:
+            print("FAIL: an alias is not closer to its canonical skill than to unrelated text")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
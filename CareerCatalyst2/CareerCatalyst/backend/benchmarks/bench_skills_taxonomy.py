@@ -0,0 +1,77 @@
+"""
+Skills taxonomy: compile time, load time and extraction cost by taxonomy size.
+
+Writes synthetic taxonomies (the bundled one padded with made-up skills and
+aliases) to a temporary directory, compiles and memory-maps each, and times
+skill extraction on synthetic resumes. Extraction cost should stay flat as
+the taxonomy grows.
+
+Run from the backend directory:
+    python benchmarks/bench_skills_taxonomy.py [--max-skills 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_keyword_matching import synthetic_terms  # noqa: E402
+from bench_section_detection import synthetic_resume  # noqa: E402
+from skills_taxonomy import SKILLS_TAXONOMY_PATH, SkillTaxonomy, compile_taxonomy  # noqa: E402
+
+
+def write_taxonomy(path, rng, extra_skills):
+    with open(SKILLS_TAXONOMY_PATH, encoding="utf-8") as bundled:
+        lines = bundled.read().splitlines()
+    # Two aliases per made-up skill
+    terms = synthetic_terms(rng, extra_skills * 3)
+    for i in range(extra_skills):
+        lines.append(f"{terms[3 * i]}: {terms[3 * i + 1]}, {terms[3 * i + 2]}")
+    with open(path, "w", encoding="utf-8") as taxonomy:
+        taxonomy.write("\n".join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--max-skills", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    corpus = [synthetic_resume(rng, args.words) for _ in range(args.resumes)]
+
+    print(f"{args.resumes} resumes, {args.words} words each")
+    print(f"  {'skills':>8}  {'index KB':>9}  {'compile ms':>10}  {'load ms':>8}  {'us/resume':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        extra = 0
+        while True:
+            source = os.path.join(workdir, f"taxonomy_{extra}.txt")
+            index = os.path.join(workdir, f"taxonomy_{extra}.idx")
+            write_taxonomy(source, rng, extra)
+
+            start = time.perf_counter()
+            skills = compile_taxonomy(source, index)
+            compile_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            taxonomy = SkillTaxonomy.open(index)
+            load_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            for text in corpus:
+                taxonomy.skills_in(text)
+            per_resume = (time.perf_counter() - start) / len(corpus) * 1e6
+
+            size_kb = os.path.getsize(index) / 1024
+            print(f"  {skills:>8}  {size_kb:>9.0f}  {compile_ms:>10.1f}  {load_ms:>8.3f}  {per_resume:>10.1f}")
+            if extra >= args.max_skills:
+                break
+            extra = extra * 10 if extra else 1000
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cold-start cost of the backend: import time and time to first healthy /health.
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter and lists
+the slowest imports, then starts uvicorn on a free port and polls /health
+until it reports healthy. Heavy clients (Gemini, spaCy) are loaded lazily by
+model_registry and should not show up in either measurement.
+
+Run from the backend directory (needs the backend requirements installed):
+    python benchmarks/bench_startup.py [--module app] [--runs 3] [--top 15]
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module):
+    """(total seconds, [(cumulative seconds, module name)]) for importing module"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1e6, name.strip()))
+    total = next((seconds for seconds, name in reversed(rows) if name == module), 0.0)
+    return total, rows
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_healthy(module, timeout):
+    """Seconds from process start until GET /health answers with status healthy"""
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{module}:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if json.load(response).get("status") == "healthy":
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.02)
+        raise RuntimeError(f"/health not healthy after {timeout} seconds")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app", help="backend module exposing the FastAPI `app`")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    totals = []
+    for _ in range(args.runs):
+        total, rows = import_times(args.module)
+        totals.append(total)
+    print(f"import {args.module}: {min(totals) * 1000:.0f} ms (best of {args.runs})")
+    print("\nSlowest imports (cumulative, last run)")
+    for seconds, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+    healthy = [time_to_healthy(args.module, args.timeout) for _ in range(args.runs)]
+    print(f"\nFirst healthy /health: {min(healthy) * 1000:.0f} ms best, {max(healthy) * 1000:.0f} ms worst")
+
+
+if __name__ == "__main__":
+    main()
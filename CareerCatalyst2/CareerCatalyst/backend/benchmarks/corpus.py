@@ -0,0 +1,200 @@
+"""
+Synthetic resume and job description corpus for the benchmarks.
+
+Resumes have a contact line, summary, skills, dated experience entries with
+bullets, education and projects; the size sets how many entries there are
+(one, two and four PDF pages). Each resume is also rendered as PDF, DOCX
+and TXT so text extraction can be measured on real file formats. The same
+seed always gives the same corpus.
+
+Run from the backend directory to write the corpus to a folder:
+    python benchmarks/corpus.py --out /tmp/corpus [--per-size 10] [--seed 7]
+"""
+import argparse
+import io
+import json
+import os
+import random
+import textwrap
+from typing import Dict, List, NamedTuple
+
+# Experience entries and bullets per entry for each resume size
+RESUME_SIZES = {"small": (2, 3), "medium": (5, 5), "large": (16, 7)}
+
+# Responsibilities and requirements per job description size
+JOB_DESCRIPTION_SIZES = {"short": 5, "long": 20}
+
+FIRST_NAMES = ["Jane", "Arjun", "Maria", "Wei", "Fatima", "Lucas", "Priya", "Tom"]
+LAST_NAMES = ["Doe", "Sharma", "Garcia", "Chen", "Khan", "Silva", "Iyer", "Novak"]
+TITLES = ["Software Engineer", "Data Analyst", "Backend Developer", "ML Engineer", "DevOps Engineer"]
+COMPANIES = ["Example Corp", "Acme Analytics", "Globex", "Initech", "Umbrella Labs", "Hooli"]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "SQL", "PostgreSQL", "MongoDB", "Docker",
+    "Kubernetes", "AWS", "Azure", "GCP", "React", "Node.js", "FastAPI", "Django", "Spark",
+    "Kafka", "TensorFlow", "PyTorch", "scikit-learn", "Git", "Linux", "Terraform", "Airflow",
+]
+VERBS = ["Built", "Designed", "Led", "Reduced", "Automated", "Migrated", "Improved", "Launched"]
+OBJECTS = [
+    "a payments API serving 2M requests per day", "the CI pipeline for 40 services",
+    "an ETL job processing 5 TB of events", "dashboards used by the sales team",
+    "a recommendation model for 300k users", "on-call runbooks and alerting",
+]
+RESULTS = ["cutting latency by {}%", "saving ${}k a year", "raising conversion by {}%", "for a team of {} engineers"]
+DEGREES = ["B.Tech Computer Science", "B.Sc. Mathematics", "M.Sc. Data Science", "MBA"]
+
+
+class CorpusResume(NamedTuple):
+    name: str
+    size: str
+    text: str
+
+
+def bullet(rng: random.Random) -> str:
+    result = rng.choice(RESULTS).format(rng.randint(5, 60))
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}, {result}"
+
+
+def generate_resume(rng: random.Random, size: str) -> str:
+    """A plausible resume of the given RESUME_SIZES size"""
+    entries, bullets = RESUME_SIZES[size]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        f" | linkedin.com/in/{first.lower()}{last.lower()}",
+        "",
+        "PROFESSIONAL SUMMARY",
+        f"{rng.choice(TITLES)} with {entries + 1} years of experience in "
+        f"{', '.join(rng.sample(SKILLS, 3))} and a record of shipping reliable systems.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, min(len(SKILLS), 6 + entries))),
+        "",
+        "WORK EXPERIENCE",
+    ]
+    year = 2024
+    for _ in range(entries):
+        start = year - rng.randint(1, 3)
+        lines.append(f"{rng.choice(TITLES)} | {rng.choice(COMPANIES)} | {start} - {year}")
+        lines.extend(bullet(rng) for _ in range(bullets))
+        lines.append("")
+        year = start
+    lines += ["EDUCATION", f"{rng.choice(DEGREES)}, Example University, {year - 4} - {year}", "", "PROJECTS"]
+    for _ in range(max(2, entries // 2)):
+        lines.append(f"- {rng.choice(OBJECTS).capitalize()} using {', '.join(rng.sample(SKILLS, 2))}")
+    lines += ["", "CERTIFICATIONS", f"- AWS Certified Developer ({year + 2})"]
+    return "\n".join(lines)
+
+
+def generate_job_description(rng: random.Random, size: str) -> str:
+    """A job posting with responsibilities and required skills, of the given JOB_DESCRIPTION_SIZES size"""
+    items = JOB_DESCRIPTION_SIZES[size]
+    lines = [f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}", "", "Responsibilities:"]
+    lines.extend(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}" for _ in range(items))
+    lines += ["", "Requirements:"]
+    lines.extend(f"- {rng.randint(1, 6)}+ years with {skill}" for skill in rng.sample(SKILLS, min(items, len(SKILLS))))
+    return "\n".join(lines)
+
+
+def generate_corpus(seed: int = 7, per_size: int = 10) -> List[CorpusResume]:
+    rng = random.Random(seed)
+    return [
+        CorpusResume(f"{size}-{index:03d}", size, generate_resume(rng, size))
+        for size in RESUME_SIZES for index in range(per_size)
+    ]
+
+
+def _pdf_string(line: str) -> bytes:
+    return line.encode("cp1252", "replace").replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def to_pdf(text: str, lines_per_page: int = 52, width: int = 95) -> bytes:
+    """A minimal text-only PDF (Helvetica, one text line per Tj), readable by pdfplumber"""
+    lines = [wrapped for line in text.splitlines() for wrapped in (textwrap.wrap(line, width) or [""])]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id, first_page_id = 3, 4
+    page_ids = [first_page_id + 2 * i for i in range(len(pages))]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % pid for pid in page_ids)
+           + b"] /Count %d >>" % len(pages),
+        font_id: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    for page_id, page_lines in zip(page_ids, pages):
+        stream = b"BT /F1 10 Tf 14 TL 50 800 Td\n" + b"".join(
+            b"(" + _pdf_string(line) + b") Tj T*\n" for line in page_lines
+        ) + b"ET"
+        objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents %d 0 R "
+                            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (page_id + 1, font_id))
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = out.tell()
+        out.write(b"%d 0 obj\n" % object_id + objects[object_id] + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for object_id in sorted(objects):
+        out.write(b"%010d 00000 n \n" % offsets[object_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def to_docx(text: str) -> bytes:
+    """A DOCX with one paragraph per line, headings styled as headings"""
+    from docx import Document
+    document = Document()
+    for line in text.splitlines():
+        if line.isupper() and len(line) < 40:
+            document.add_heading(line.title(), level=2)
+        elif line.startswith("- "):
+            document.add_paragraph(line[2:], style="List Bullet")
+        else:
+            document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def to_txt(text: str) -> bytes:
+    return text.encode("utf-8")
+
+
+# File format -> renderer of resume text to file bytes
+FORMATS = {"pdf": to_pdf, "docx": to_docx, "txt": to_txt}
+
+
+def render_files(resume: CorpusResume) -> Dict[str, bytes]:
+    return {extension: render(resume.text) for extension, render in FORMATS.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", required=True, help="folder to write the corpus to")
+    parser.add_argument("--per-size", type=int, default=10, help="resumes per size")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    rng = random.Random(args.seed)
+    manifest = {"resumes": [], "jobDescriptions": []}
+    for resume in generate_corpus(args.seed, args.per_size):
+        for extension, content in render_files(resume).items():
+            with open(os.path.join(args.out, f"{resume.name}.{extension}"), "wb") as out:
+                out.write(content)
+        manifest["resumes"].append({"name": resume.name, "size": resume.size, "words": len(resume.text.split())})
+    for size in JOB_DESCRIPTION_SIZES:
+        name = f"job-{size}.txt"
+        with open(os.path.join(args.out, name), "w", encoding="utf-8") as out:
+            out.write(generate_job_description(rng, size))
+        manifest["jobDescriptions"].append({"name": name, "size": size})
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as out:
+        json.dump(manifest, out, indent=2)
+    print(f"Wrote {len(manifest['resumes'])} resumes as {', '.join(FORMATS)} and "
+          f"{len(manifest['jobDescriptions'])} job descriptions to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
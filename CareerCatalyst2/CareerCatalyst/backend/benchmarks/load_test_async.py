@@ -0,0 +1,89 @@
+"""
+Load test for the async analysis path using a local stub model.
+
+Fires batches of concurrent analyses at analyzeResumeAsync and reports
+throughput per concurrency level, next to the old behaviour of calling the
+blocking analyzeResume from the event loop. With a 200 ms stub model the
+async path should scale roughly linearly up to LLM_MAX_CONCURRENCY while
+the blocking path stays flat at ~5 requests/s.
+
+Run from the backend directory (needs the backend requirements installed):
+    python benchmarks/load_test_async.py [--latency 0.2] [--requests 32]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "stub-key")
+
+import ats_analyzer  # noqa: E402
+import model_registry  # noqa: E402
+from stub_model import BlockingStubModel, StubModel  # noqa: E402
+
+SAMPLE_RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567
+
+SUMMARY
+Backend engineer with 6 years of Python experience.
+
+SKILLS
+Python, SQL, Docker, FastAPI
+
+EXPERIENCE
+Senior Engineer | Example Corp | 2019 - 2024
+- Cut API latency by 40% by introducing caching
+
+EDUCATION
+B.Sc. Computer Science, Example University
+"""
+
+
+async def run_async(requests, concurrency):
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with limiter:
+            # Unique text per request so the result cache never answers
+            await ats_analyzer.analyzeResumeAsync(f"{SAMPLE_RESUME}\nref-{index}-{time.time_ns()}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - start
+
+
+async def run_blocking(requests, concurrency):
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with limiter:
+            ats_analyzer.analyzeResume(f"{SAMPLE_RESUME}\nref-{index}-{time.time_ns()}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="stub model latency in seconds")
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--levels", default="1,2,4,8,16")
+    parser.add_argument("--blocking-client", action="store_true",
+                        help="stub without generate_content_async, to exercise the executor path")
+    args = parser.parse_args()
+
+    model_class = BlockingStubModel if args.blocking_client else StubModel
+    model_registry.set_gemini_model(ats_analyzer.MODEL_NAME, model_class(latency=args.latency))
+
+    print(f"{'concurrency':>11}  {'async req/s':>11}  {'blocking req/s':>14}")
+    for level in (int(value) for value in args.levels.split(",")):
+        async_elapsed = asyncio.run(run_async(args.requests, level))
+        blocking_elapsed = asyncio.run(run_blocking(args.requests, level))
+        print(f"{level:>11}  {args.requests / async_elapsed:>11.1f}  {args.requests / blocking_elapsed:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
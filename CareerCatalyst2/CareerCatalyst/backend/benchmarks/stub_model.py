@@ -0,0 +1,127 @@
+"""
+Deterministic stand-in for genai.GenerativeModel used by the benchmarks.
+
+It answers every prompt with a fixed, schema-valid analysis after a
+configurable delay, so pipeline timings can be measured offline. The delay
+can grow with prompt length, the way input processing time does for real
+models. FaultyStubModel adds seeded faults (errors, slow and hung calls)
+for testing the resilience of the LLM client.
+"""
+import asyncio
+import json
+import random
+import time
+
+STUB_ANALYSIS = {
+    "ats_score": 78,
+    "keyword_analysis": {
+        "matched_keywords": ["python", "sql", "docker"],
+        "missing_keywords": ["kubernetes", "aws"],
+        "keyword_match_percentage": 60,
+        "technical_keywords": ["python", "sql", "docker"],
+        "soft_skills": ["communication"],
+        "industry_terms": ["agile"]
+    },
+    "content_strength": {
+        "action_verbs_score": 7,
+        "quantified_achievements": 4,
+        "relevance_score": 7,
+        "professional_language_score": 8
+    },
+    "improvement_suggestions": [
+        "Add cloud platform experience",
+        "Quantify more achievements"
+    ],
+    "role_fit_analysis": "Reasonable match for the role.",
+    "inferred_role": "Software Engineer",
+    "general_feedback": "Solid technical background.",
+    "critical_gaps": ["No cloud experience"]
+}
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class BlockingStubModel:
+    """Fake Gemini model that only offers the blocking generate_content API"""
+
+    def __init__(self, latency=0.2, analysis=None, seconds_per_1k_tokens=0.0):
+        self.latency = latency
+        self.seconds_per_1k_tokens = seconds_per_1k_tokens
+        self.response_text = json.dumps(analysis or STUB_ANALYSIS)
+        self.calls = 0
+
+    def delay(self, prompt):
+        # ~4 characters per token, as in llm_client.estimate_tokens
+        return self.latency + self.seconds_per_1k_tokens * len(prompt) / 4000
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay(prompt))
+        return StubResponse(self.response_text)
+
+
+class StubModel(BlockingStubModel):
+    """Fake Gemini model with fixed latency and a canned JSON answer"""
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay(prompt))
+        return StubResponse(self.response_text)
+
+
+class ServiceUnavailable(Exception):
+    """Stand-in for google.api_core.exceptions.ServiceUnavailable (HTTP 503)"""
+    code = 503
+
+
+class FaultyStubModel(StubModel):
+    """
+    StubModel that misbehaves like a real provider on a share of calls:
+    retryable errors, slow answers, and requests that hang. Setting `down`
+    makes every call fail, as during an outage.
+    """
+
+    def __init__(self, latency=0.05, error_rate=0.0, slow_rate=0.0, slow_latency=2.0,
+                 hang_rate=0.0, hang_latency=3600.0, seed=7, **kwargs):
+        super().__init__(latency=latency, **kwargs)
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.hang_rate = hang_rate
+        self.hang_latency = hang_latency
+        self.down = False
+        self.failures = 0
+        self._rng = random.Random(seed)
+
+    def _plan(self, prompt):
+        """(delay, fail) for the next call"""
+        roll = self._rng.random()
+        if self.down or roll < self.error_rate:
+            self.failures += 1
+            return self.latency, True
+        roll -= self.error_rate
+        if roll < self.hang_rate:
+            return self.hang_latency, False
+        roll -= self.hang_rate
+        if roll < self.slow_rate:
+            return self.slow_latency, False
+        return self.delay(prompt), False
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        delay, fail = self._plan(prompt)
+        time.sleep(delay)
+        if fail:
+            raise ServiceUnavailable("503 The model is overloaded. Please try again later.")
+        return StubResponse(self.response_text)
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        delay, fail = self._plan(prompt)
+        await asyncio.sleep(delay)
+        if fail:
+            raise ServiceUnavailable("503 The model is overloaded. Please try again later.")
+        return StubResponse(self.response_text)
@@ -0,0 +1,222 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from analysis_limits import BUDGET_CHECK_INTERVAL, check_cpu_budget
+
+
+class FormattingRule(NamedTuple):
+    signal: str
+    message: str
+    # Fires when the signal was not found (missing contact details) instead of when it was
+    when_missing: bool = False
+
+
+# Every formatting check, in the order its issue is reported
+FORMATTING_RULES = [
+    FormattingRule("tables", "Contains table formatting which may not be ATS-friendly"),
+    FormattingRule("fileReferences", "Contains image/file references - ATS systems cannot read embedded images"),
+    FormattingRule(
+        "specialBullets", "Uses special bullet characters - consider using standard hyphens (-) or asterisks (*)"
+    ),
+    FormattingRule(
+        "columns", "Possible multi-column layout detected - use single column format for better ATS compatibility"
+    ),
+    FormattingRule("email", "Missing or improperly formatted email address", when_missing=True),
+    FormattingRule("phone", "Missing or improperly formatted phone number", when_missing=True),
+]
+
+DATE_FORMATS_MESSAGE = "Inconsistent date formats detected - use consistent format throughout"
+
+# Using more distinct date formats than this is reported as inconsistent
+MAX_DATE_FORMATS = 2
+
+
+class DateFormat(NamedTuple):
+    label: str
+    # The date starts with the last min_digits to max_digits digits of a run of digits...
+    min_digits: int
+    max_digits: int
+    # ...followed by this, or for tail None, the run is a year after a word ("May 2021")
+    tail: Optional[Pattern]
+
+
+DATE_FORMATS = [
+    DateFormat("MM/DD/YYYY", 1, 2, re.compile(r'/\d{1,2}/\d{4}')),
+    DateFormat("YYYY-MM-DD", 4, 4, re.compile(r'-\d{2}-\d{2}')),
+    DateFormat("Month YYYY", 4, 4, None),
+    DateFormat("YYYY - YYYY", 4, 4, re.compile(r'\s*-\s*\d{4}')),
+]
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+EMAIL_DOMAIN = re.compile(r'[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+EMAIL_LOCAL_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-")
+
+# A phone number is ten or more of these in a row (an optional "+" may precede them)
+PHONE_RUN = re.compile(r'[\d\s\-()]*')
+PHONE_MIN_LENGTH = 10
+PHONE_PUNCTUATION = "-()"
+
+# Everything a rule can start at, found in one pass: runs of digits (phone
+# numbers, dates), long runs of blanks (columns, tables, and phone numbers,
+# whose characters they are made of), tab pairs, "@", file extensions and
+# bullet characters. The alternatives start with different characters and
+# none backtracks over more than its own short match, so the scan takes
+# linear time; the checks made at each anchor only look at text next to it
+# that no other anchor looks at. The lookahead lets the scanner skip letters
+# without trying every alternative. These patterns stay on re rather than
+# regex_engine: the checks call match() at many offsets, and each such call
+# costs RE2's Python binding a pass over the whole text.
+ANCHOR_REGEX = re.compile(
+    r"(?=[\d\s\-()@.•◦▪■●○])"
+    r"(?:(?P<digits>\d+)"
+    r"|(?P<blank>[\s\-()]{10,})"
+    r"|(?P<tabs>\t\t)"
+    r"|(?P<at>@)"
+    r"|(?P<file>\.(?i:jpe?g|png|svg|gif|pdf))"
+    r"|(?P<bullet>[•◦▪■●○]))"
+)
+
+
+def _is_word(char: str) -> bool:
+    # What \w matches
+    return char.isalnum() or char == "_"
+
+
+def _email_at(text: str, at: int) -> Optional[int]:
+    """Start of the email address whose "@" is at `at`, if there is one"""
+    domain = EMAIL_DOMAIN.match(text, at + 1)
+    if not domain:
+        return None
+    start = at
+    while start and text[start - 1] in EMAIL_LOCAL_CHARS:
+        start -= 1
+    # Only the local part and domain, plus one character for the closing \b
+    match = EMAIL_PATTERN.search(text, start, domain.end() + 1)
+    return match.start() if match else None
+
+
+def find_email(text: str) -> Optional[int]:
+    """Offset of the first email address, as EMAIL_PATTERN.search finds it, in linear time"""
+    at = text.find("@")
+    while at != -1:
+        start = _email_at(text, at)
+        if start is not None:
+            return start
+        at = text.find("@", at + 1)
+    return None
+
+
+def _date_start(date_format: DateFormat, text: str, start: int, end: int) -> Optional[int]:
+    """Where a date in this format built on the digits text[start:end] begins, if there is one"""
+    if date_format.tail is not None:
+        if not date_format.tail.match(text, end):
+            return None
+        return end - min(end - start, date_format.max_digits)
+    # A year after whitespace after a word
+    position = start
+    while position and text[position - 1].isspace():
+        position -= 1
+    if position == start or not position or not _is_word(text[position - 1]):
+        return None
+    while position and _is_word(text[position - 1]):
+        position -= 1
+    return position
+
+
+def scan_formatting(text: str) -> Dict:
+    """
+    Offset of the first hit of every formatting rule (None if it never
+    fires), found in one pass over the text:
+    {"tables": None, ..., "email": 24, "phone": 50, "dateFormats": {"Month YYYY": 310}}
+    """
+    signals: Dict = {rule.signal: None for rule in FORMATTING_RULES}
+    dates: Dict[str, int] = {}
+    # End of the last run of phone characters already measured
+    phone_run_end = 0
+
+    def phone_run(start: int, end: int) -> None:
+        nonlocal phone_run_end
+        phone_run_end = PHONE_RUN.match(text, end).end()
+        if phone_run_end - start >= PHONE_MIN_LENGTH:
+            signals["phone"] = start - 1 if start and text[start - 1] == "+" else start
+
+    for number, match in enumerate(ANCHOR_REGEX.finditer(text)):
+        if not number % BUDGET_CHECK_INTERVAL:
+            check_cpu_budget()
+        kind = match.lastgroup
+        start, end = match.span()
+        if kind == "digits":
+            if signals["phone"] is None and start >= phone_run_end:
+                run_start = start
+                while run_start and (text[run_start - 1].isspace() or text[run_start - 1] in PHONE_PUNCTUATION):
+                    run_start -= 1
+                phone_run(run_start, end)
+            for date_format in DATE_FORMATS:
+                if date_format.label not in dates and end - start >= date_format.min_digits:
+                    date_start = _date_start(date_format, text, start, end)
+                    if date_start is not None:
+                        dates[date_format.label] = date_start
+        elif kind == "blank":
+            blank = match.group()
+            if signals["phone"] is None and start >= phone_run_end:
+                phone_run(start, end)
+            if signals["columns"] is None and " " * 10 in blank:
+                signals["columns"] = start + blank.index(" " * 10)
+            if signals["tables"] is None and "\t\t" in blank:
+                signals["tables"] = start + blank.index("\t\t")
+        elif kind == "tabs":
+            if signals["tables"] is None:
+                signals["tables"] = start
+        elif kind == "at":
+            if signals["email"] is None:
+                signals["email"] = _email_at(text, start)
+        elif kind == "file":
+            if signals["fileReferences"] is None:
+                signals["fileReferences"] = start
+        elif kind == "bullet":
+            if signals["specialBullets"] is None:
+                signals["specialBullets"] = start
+
+    # Report order, not the order they were found in
+    signals["dateFormats"] = {
+        date_format.label: dates[date_format.label] for date_format in DATE_FORMATS if date_format.label in dates
+    }
+    return signals
+
+
+def _fired_rules(signals: Dict) -> List[Tuple[str, Optional[int]]]:
+    """(message, offset of the hit or None) of every issue the signals report"""
+    fired = []
+    for rule in FORMATTING_RULES:
+        offset = signals[rule.signal]
+        if rule.when_missing and offset is None:
+            fired.append((rule.message, None))
+        elif not rule.when_missing and offset is not None:
+            fired.append((rule.message, offset))
+    if len(signals["dateFormats"]) > MAX_DATE_FORMATS:
+        # Where the first format too many is first used
+        fired.append((DATE_FORMATS_MESSAGE, sorted(signals["dateFormats"].values())[MAX_DATE_FORMATS]))
+    return fired
+
+
+def formatting_issues_from_signals(signals: Dict) -> List[str]:
+    return [message for message, _ in _fired_rules(signals)]
+
+
+def line_and_column(text: str, offset: int) -> Tuple[int, int]:
+    """1-based line and column of a character offset"""
+    line_start = text.rfind("\n", 0, offset) + 1
+    return text.count("\n", 0, line_start) + 1, offset - line_start + 1
+
+
+def formatting_issue_locations(text: str, signals: Dict) -> List[Dict]:
+    """
+    formatting_issues_from_signals with where each issue was first seen:
+    [{"issue": ..., "line": 3, "column": 14}]. Line and column are None for
+    missing contact details.
+    """
+    locations = []
+    for message, offset in _fired_rules(signals):
+        line, column = line_and_column(text, offset) if offset is not None else (None, None)
+        locations.append({"issue": message, "line": line, "column": column})
+    return locations
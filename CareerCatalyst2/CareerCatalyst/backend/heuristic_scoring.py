@@ -0,0 +1,194 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from skills_taxonomy import skill_taxonomy
+from job_descriptions import JobDescription, job_description_skills
+from regex_engine import compile_detector
+from analysis_limits import BUDGET_CHECK_INTERVAL, check_cpu_budget
+
+ACTION_VERBS = {
+    'achieved', 'analyzed', 'architected', 'automated', 'built', 'collaborated', 'created', 'cut',
+    'delivered', 'deployed', 'designed', 'developed', 'drove', 'enhanced', 'established', 'executed',
+    'grew', 'implemented', 'improved', 'increased', 'launched', 'led', 'managed', 'mentored',
+    'migrated', 'optimized', 'orchestrated', 'organized', 'owned', 'planned', 'reduced', 'refactored',
+    'resolved', 'scaled', 'shipped', 'spearheaded', 'streamlined', 'supervised', 'trained', 'transformed'
+}
+
+# Role inferred from the keywords found when no job description is given (first match wins)
+ROLE_HINTS = [
+    ('Data Scientist', {'machine learning', 'data science', 'artificial intelligence'}),
+    ('DevOps Engineer', {'docker', 'kubernetes', 'aws', 'azure'}),
+    ('Frontend Developer', {'react', 'vue', 'angular', 'css', 'html'}),
+    ('Backend Developer', {'django', 'flask', 'node', 'api', 'postgresql', 'mongodb', 'sql'}),
+    ('Software Developer', {'python', 'java', 'javascript', 'typescript'}),
+]
+
+ESSENTIAL_SECTIONS = ["Contact Info", "Work Experience", "Skills", "Education"]
+
+# Nouns counted by "N+ people/users/..." style achievements
+COUNT_NOUNS = r'(?:users|customers|clients|people|engineers|developers|members|projects|countries|requests|transactions)'
+
+# Percentages, currency amounts, multipliers and "N+ people/users/..." style
+# counts. The alternatives that start at a digit match the character before
+# the number too, so they only start at the first digit of a run of digits
+# (or digits and commas): a long run is scanned once instead of once from
+# each of its positions, which keeps re linear on hostile input. A count
+# starts at a digit after a non-word character or after a comma. With re,
+# the lookahead skips every position but currency signs and the character
+# before a digit or comma.
+QUANTIFIED_PATTERN = compile_detector(
+    r'(?:^|\D)\d+(?:\.\d+)?\s*%'
+    r'|[$€£₹]\s?\d[\d,]*(?:\.\d+)?\s*[kmb]?\b'
+    r'|(?:^|\W)\d+(?:\.\d+)?x\b'
+    rf'|(?:^|[^\w,])\d[\d,]*\+?\s+{COUNT_NOUNS}\b'
+    rf'|(?:^|[^\d,])(?:,+\d|\d+,+\d)[\d,]*\+?\s+{COUNT_NOUNS}\b',
+    re.IGNORECASE,
+    prefilter=r'(?=[$€£₹]|\D[\d,]|^[\d,])'
+)
+FIRST_PERSON_PATTERN = compile_detector(r'\b(?:i|me|my|mine)\b', re.IGNORECASE)
+BULLET_CHARS = '-*•◦▪■●○> \t'
+
+class ContentSignals(NamedTuple):
+    """
+    Line counts behind the content scores. They are additive: the signals of
+    a resume are the sum of the signals of its sections.
+    """
+    descriptive_lines: int
+    action_verb_lines: int
+    quantified_lines: int
+    first_person_pronouns: int
+
+def content_signals(resume_text: str) -> ContentSignals:
+    descriptive = 0
+    with_verb = 0
+    quantified = 0
+    for number, line in enumerate(resume_text.splitlines()):
+        if not number % BUDGET_CHECK_INTERVAL:
+            check_cpu_budget()
+        if QUANTIFIED_PATTERN.search(line):
+            quantified += 1
+        words = line.strip(BULLET_CHARS).split()
+        if len(words) < 4:
+            continue
+        descriptive += 1
+        if words[0].lower().rstrip('.,:;') in ACTION_VERBS:
+            with_verb += 1
+    return ContentSignals(descriptive, with_verb, quantified, len(FIRST_PERSON_PATTERN.findall(resume_text)))
+
+def sum_signals(signals: Iterable[ContentSignals]) -> ContentSignals:
+    return ContentSignals(*(sum(counts) for counts in zip(*signals, (0, 0, 0, 0))))
+
+def _action_verbs_score(signals: ContentSignals) -> int:
+    """0-10: share of descriptive lines (4+ words) that open with an action verb"""
+    if not signals.descriptive_lines:
+        return 0
+    # Half of all descriptive lines starting with an action verb earns full marks
+    return round(min(1.0, (signals.action_verb_lines / signals.descriptive_lines) / 0.5) * 10)
+
+def _professional_language_score(signals: ContentSignals) -> int:
+    """0-10: starts at 9 and drops with first-person pronouns"""
+    return max(3, 9 - signals.first_person_pronouns // 3)
+
+def infer_role(skills: Iterable[str]) -> str:
+    """Role suggested by the skills found, for resumes analyzed without a job description"""
+    found = set(skills)
+    return next((role for role, hints in ROLE_HINTS if found & hints), "General Professional")
+
+def generate_heuristic_analysis(
+    resume_text: str,
+    job_description: Optional[JobDescription] = None,
+    sections: Optional[Dict[str, bool]] = None
+) -> Dict:
+    """
+    Deterministic stand-in for generate_ai_analysis: fills the same schema
+    from keyword matching, action verbs, quantified achievements and
+    section completeness without calling the LLM
+    """
+    return heuristic_analysis(
+        skill_taxonomy.skills_by_category(resume_text), content_signals(resume_text), job_description, sections
+    )
+
+def heuristic_analysis(
+    resume_skills: Dict[str, List[str]],
+    signals: ContentSignals,
+    job_description: Optional[JobDescription] = None,
+    sections: Optional[Dict[str, bool]] = None
+) -> Dict:
+    """generate_heuristic_analysis from skills and content signals that were already collected"""
+    sections = sections or {}
+
+    found_technical = resume_skills["technical"]
+    found_soft = resume_skills["soft"]
+    action_verbs_score = _action_verbs_score(signals)
+    quantified = signals.quantified_lines
+    present_essential = sum(1 for section in ESSENTIAL_SECTIONS if sections.get(section, False))
+
+    suggestions = []
+    if action_verbs_score < 6:
+        suggestions.append("Start more bullet points with strong action verbs (e.g. Led, Built, Reduced)")
+    if quantified < 3:
+        suggestions.append("Add quantified achievements with specific numbers, percentages or amounts")
+    for section in ESSENTIAL_SECTIONS:
+        if not sections.get(section, False):
+            suggestions.append(f"Add a clear {section} section")
+
+    ats_score = 40 + present_essential * 5 + round(action_verbs_score * 1.5) + min(quantified, 5) * 2
+
+    if job_description:
+        job_keywords = job_description_skills(job_description)
+        resume_keywords = set(found_technical + found_soft + resume_skills["industry"])
+        matched = [kw for kw in job_keywords if kw in resume_keywords]
+        missing = [kw for kw in job_keywords if kw not in resume_keywords]
+        match_percentage = round(len(matched) / len(job_keywords) * 100) if job_keywords else 0
+        ats_score += round(match_percentage * 0.15)
+
+        if missing:
+            suggestions.insert(0, f"Add missing job-relevant skills: {', '.join(missing[:5])}")
+
+        return {
+            "ats_score": min(ats_score, 100),
+            "keyword_analysis": {
+                "matched_keywords": matched,
+                "missing_keywords": missing,
+                "keyword_match_percentage": match_percentage
+            },
+            "content_strength": {
+                "action_verbs_score": action_verbs_score,
+                "quantified_achievements": quantified,
+                "relevance_score": round(match_percentage / 10)
+            },
+            "improvement_suggestions": suggestions,
+            "role_fit_analysis": (
+                f"Matches {len(matched)} of {len(job_keywords)} skills found in the job description "
+                f"({match_percentage}%). Scored locally without AI."
+            ),
+            "critical_gaps": [f"No mention of {kw}" for kw in missing[:3]]
+        }
+
+    ats_score += min(len(found_technical), 10)
+    if len(found_technical) < 3:
+        suggestions.append("Add more technical skills relevant to your field")
+    if len(found_soft) < 2:
+        suggestions.append("Include soft skills like communication and leadership")
+
+    inferred_role = infer_role(found_technical + found_soft)
+
+    return {
+        "ats_score": min(ats_score, 100),
+        "inferred_role": inferred_role,
+        "keyword_analysis": {
+            "technical_keywords": found_technical,
+            "soft_skills": found_soft,
+            "industry_terms": resume_skills["industry"]
+        },
+        "content_strength": {
+            "action_verbs_score": action_verbs_score,
+            "quantified_achievements": quantified,
+            "professional_language_score": _professional_language_score(signals)
+        },
+        "improvement_suggestions": suggestions,
+        "general_feedback": (
+            f"Found {len(found_technical)} technical and {len(found_soft)} soft skills, "
+            f"{quantified} quantified achievements and {present_essential} of {len(ESSENTIAL_SECTIONS)} "
+            "essential sections. Scored locally without AI."
+        )
+    }
@@ -0,0 +1,130 @@
+import importlib.util
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# Which HTML parser the aggregator uses: "auto" picks the fastest one installed
+HTML_PARSER = os.getenv("HTML_PARSER", "auto")
+
+# (tag, class) of an element, or (tag, class, attribute) to read an attribute
+# instead of the element's text. A class may list several space-separated
+# classes, all of which must be present.
+Selector = Union[Tuple[str, str], Tuple[str, str, str]]
+
+# html, card selector, field selectors -> one {field: value or None} dict per card;
+# text values have their whitespace collapsed to single spaces
+CardExtractor = Callable[[Union[str, bytes], Selector, Dict[str, Selector]], List[Dict[str, Optional[str]]]]
+
+@lru_cache(maxsize=None)
+def _installed(module: str) -> bool:
+    """Whether a parser module is installed, looked up once per process"""
+    return importlib.util.find_spec(module) is not None
+
+def _clean_text(text: str) -> str:
+    """Collapse whitespace so every backend returns the same text for an element"""
+    return " ".join(text.split())
+
+def _has_classes(classes: str) -> Callable[[Optional[str]], bool]:
+    """SoupStrainer class test: every class in `classes` is present"""
+    wanted = set(classes.split())
+    return lambda value: value is not None and wanted.issubset(value.split() if isinstance(value, str) else value)
+
+def _extract_bs4(html, card: Selector, fields: Dict[str, Selector], parse_only: bool) -> List[Dict[str, Optional[str]]]:
+    from bs4 import BeautifulSoup, SoupStrainer
+    if parse_only:
+        # Only build the card subtrees, with the fastest tree builder installed
+        builder = "lxml" if _installed("lxml") else "html.parser"
+        soup = BeautifulSoup(html, builder, parse_only=SoupStrainer(card[0], class_=_has_classes(card[1])))
+    else:
+        soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for element in soup.find_all(card[0], class_=card[1]):
+        values = {}
+        for name, selector in fields.items():
+            tag = element.find(selector[0], class_=selector[1])
+            if tag is None:
+                values[name] = None
+            elif len(selector) == 3:
+                values[name] = tag.get(selector[2])
+            else:
+                values[name] = _clean_text(tag.text)
+        cards.append(values)
+    return cards
+
+def extract_with_html_parser(html, card, fields):
+    """BeautifulSoup with the stdlib html.parser over the whole page (always available)"""
+    return _extract_bs4(html, card, fields, parse_only=False)
+
+def extract_with_soupstrainer(html, card, fields):
+    """BeautifulSoup building only the card subtrees"""
+    return _extract_bs4(html, card, fields, parse_only=True)
+
+def _xpath_class(tag: str, classes: str) -> str:
+    return tag + "".join(
+        f"[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]" for name in classes.split()
+    )
+
+def extract_with_lxml(html, card, fields):
+    """lxml.html with precompiled XPath; bytes without a charset declaration are read as UTF-8"""
+    import lxml.html
+    from lxml import etree
+    if isinstance(html, bytes):
+        root = lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(encoding="utf-8"))
+    else:
+        root = lxml.html.document_fromstring(html)
+    field_paths = {name: etree.XPath(f"(.//{_xpath_class(selector[0], selector[1])})[1]") for name, selector in fields.items()}
+    cards = []
+    for element in root.xpath(f"//{_xpath_class(card[0], card[1])}"):
+        values = {}
+        for name, selector in fields.items():
+            found = field_paths[name](element)
+            if not found:
+                values[name] = None
+            elif len(selector) == 3:
+                values[name] = found[0].get(selector[2])
+            else:
+                values[name] = _clean_text(found[0].text_content())
+        cards.append(values)
+    return cards
+
+def extract_with_selectolax(html, card, fields):
+    """selectolax (lexbor engine) CSS selectors"""
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(html)
+    field_css = {name: f"{selector[0]}.{'.'.join(selector[1].split())}" for name, selector in fields.items()}
+    cards = []
+    for element in tree.css(f"{card[0]}.{'.'.join(card[1].split())}"):
+        values = {}
+        for name, selector in fields.items():
+            found = element.css_first(field_css[name])
+            if found is None:
+                values[name] = None
+            elif len(selector) == 3:
+                values[name] = found.attributes.get(selector[2])
+            else:
+                values[name] = _clean_text(found.text(deep=True))
+        cards.append(values)
+    return cards
+
+# Fastest first; the module each one needs
+BACKENDS: Dict[str, Tuple[CardExtractor, str]] = {
+    "selectolax": (extract_with_selectolax, "selectolax"),
+    "lxml": (extract_with_lxml, "lxml"),
+    "soupstrainer": (extract_with_soupstrainer, "bs4"),
+    "html.parser": (extract_with_html_parser, "bs4"),
+}
+
+def available_backends() -> List[str]:
+    return [name for name, (_, module) in BACKENDS.items() if _installed(module)]
+
+@lru_cache(maxsize=None)
+def get_extractor(name: str = HTML_PARSER) -> CardExtractor:
+    """The card extractor for a backend name, or the fastest installed one for "auto" """
+    if name == "auto":
+        installed = available_backends()
+        if not installed:
+            raise RuntimeError("No HTML parser installed. Install beautifulsoup4, lxml or selectolax")
+        name = installed[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser '{name}'. Use one of: auto, {', '.join(BACKENDS)}")
+    return BACKENDS[name][0]
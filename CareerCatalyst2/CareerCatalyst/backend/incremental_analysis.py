@@ -0,0 +1,442 @@
+import asyncio
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from ai_response import parse_analysis_async
+from ats_analyzer import (
+    JSON_OUTPUT_CONFIG, MODEL_NAME, PROMPT_VERSION, build_analysis_result, result_cache, validate_input_size,
+    validate_scoring_mode
+)
+from analysis_limits import CpuBudget
+from formatting_rules import formatting_issue_locations, formatting_issues_from_signals, scan_formatting
+from heuristic_scoring import ContentSignals, content_signals, heuristic_analysis, infer_role, sum_signals
+from job_descriptions import CompiledJobDescription, JobDescription, job_description_skills
+from llm_client import estimate_tokens, generate_content_async
+from model_registry import get_gemini_model
+from prompt_compaction import (
+    HEADER_SECTION, PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET, PROMPT_RESUME_TOKEN_BUDGET, compact_text,
+    prompt_stats, split_sections
+)
+from result_cache import ResultCache, make_cache_key
+from section_detector import SECTION_ORDER, scan_sections
+from single_flight import SingleFlight
+from skills_taxonomy import CATEGORIES, skill_taxonomy
+
+# Findings of individual resume sections, reused while a user edits and resubmits
+SECTION_CACHE_MAX_ENTRIES = int(os.getenv("SECTION_CACHE_MAX_ENTRIES", "4096"))
+SECTION_CACHE_TTL_SECONDS = float(os.getenv("SECTION_CACHE_TTL_SECONDS", "86400"))
+
+# Sections shorter than this (e.g. a bare name and contact line) are not sent to Gemini
+SECTION_REVIEW_MIN_TOKENS = int(os.getenv("SECTION_REVIEW_MIN_TOKENS", "30"))
+
+# Bump when the findings stored per section or the section review prompt change
+SECTION_FINDINGS_VERSION = '3'
+
+section_cache = ResultCache(max_entries=SECTION_CACHE_MAX_ENTRIES, ttl_seconds=SECTION_CACHE_TTL_SECONDS)
+
+# Identical section reviews in flight (same section, same job description) share one Gemini call
+review_flights = SingleFlight()
+
+# Blank lines between the entries of a section
+BLOCK_SEPARATOR = re.compile(r"\n\s*\n")
+
+
+class IncrementalStats:
+    """Counters of reused and recomputed sections, reported by /health"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            "analyses": 0, "sections": 0, "sectionsReused": 0, "sectionReviews": 0,
+            "reviewTokens": 0, "reviewTokensSaved": 0
+        }
+
+    def record(self, sections: int, reused: int, reviews: int, review_tokens: int, tokens_saved: int) -> None:
+        with self._lock:
+            self._counters["analyses"] += 1
+            self._counters["sections"] += sections
+            self._counters["sectionsReused"] += reused
+            self._counters["sectionReviews"] += reviews
+            self._counters["reviewTokens"] += review_tokens
+            self._counters["reviewTokensSaved"] += tokens_saved
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._counters, "sectionCache": section_cache.stats()}
+
+
+incremental_stats = IncrementalStats()
+
+
+def _job_key(job_description: Optional[JobDescription]) -> Optional[str]:
+    if isinstance(job_description, CompiledJobDescription):
+        return f"compiled:{job_description.id}"
+    return job_description
+
+
+def section_key(kind: str, section: str, text: str, job_description: Optional[JobDescription] = None) -> str:
+    """Cache key of one section's findings; `kind` is "local" or the model that reviewed it"""
+    return make_cache_key(
+        f"{section}\n{text}", _job_key(job_description), f"{PROMPT_VERSION}.{SECTION_FINDINGS_VERSION}", kind
+    )
+
+
+def split_units(text: str) -> List[Tuple[str, str, str, int]]:
+    """
+    (section, label, text, offset) units of a resume: its sections, with
+    long ones split further into the entries separated by blank lines (one
+    job, one degree), so that editing one bullet only invalidates its own
+    entry. A block shorter than SECTION_REVIEW_MIN_TOKENS (such as a
+    heading line) is kept with the block after it.
+    """
+    units = []
+    position = 0
+    for section, chunk in split_sections(text) or [(HEADER_SECTION, text)]:
+        chunk_start = text.find(chunk, position)
+        position = chunk_start + len(chunk)
+        spans = []
+        block_start = 0
+        for separator in BLOCK_SEPARATOR.finditer(chunk):
+            spans.append((block_start, separator.start()))
+            block_start = separator.end()
+        spans.append((block_start, len(chunk)))
+
+        blocks: List[Tuple[int, int]] = []
+        for start, end in spans:
+            if blocks and estimate_tokens(chunk[blocks[-1][0]:blocks[-1][1]]) < SECTION_REVIEW_MIN_TOKENS:
+                blocks[-1] = (blocks[-1][0], end)
+            else:
+                blocks.append((start, end))
+        for number, (start, end) in enumerate(blocks, 1):
+            label = f"{section} ({number})" if len(blocks) > 1 else section
+            units.append((section, label, chunk[start:end], chunk_start + start))
+    return units
+
+
+def local_findings(text: str) -> Dict:
+    """
+    What the local detectors find in one section. Findings of all sections
+    merge into the findings for the whole resume, so an unchanged section
+    never has to be scanned again. Formatting is not among them: a phone
+    number or date range can span the blank line between two units, so the
+    (linear) formatting scan always covers the whole resume.
+    """
+    _, offsets = scan_sections(text)
+    return {
+        "detected": list(offsets),
+        "skills": skill_taxonomy.skills_by_category(text),
+        "content": list(content_signals(text)),
+        "tokens": estimate_tokens(text)
+    }
+
+
+def build_section_review_prompt(section: str, text: str, job_description: Optional[JobDescription] = None) -> str:
+    """Gemini prompt for one resume section, asking for the same fields as a full analysis"""
+
+    if isinstance(job_description, CompiledJobDescription):
+        job_section = f"JOB REQUIREMENTS (condensed from the posting):\n{job_description.condensed}"
+    else:
+        job_section = f"JOB DESCRIPTION:\n{job_description}"
+
+    if job_description:
+        return f"""
+You are a smart AI hiring assistant and ATS evaluator. Review one section of a resume against the provided job description. Judge only this section; other sections are reviewed separately.
+
+RESUME SECTION ({section}):
+{text}
+
+{job_section}
+
+Provide the review in this exact JSON format:
+{{
+    "ats_score": 70,
+    "keyword_analysis": {{
+        "matched_keywords": ["python", "sql"]
+    }},
+    "content_strength": {{
+        "action_verbs_score": 7,
+        "quantified_achievements": 2,
+        "relevance_score": 8
+    }},
+    "improvement_suggestions": [
+        "Quantify the impact of the migration project"
+    ],
+    "role_fit_analysis": "One sentence on how this section supports the candidate's fit for the role"
+}}
+"""
+    return f"""
+You are a smart AI hiring assistant and ATS evaluator. Review one section of a resume for ATS compatibility and professional quality. Judge only this section; other sections are reviewed separately.
+
+RESUME SECTION ({section}):
+{text}
+
+Provide the review in this exact JSON format:
+{{
+    "ats_score": 70,
+    "keyword_analysis": {{
+        "technical_keywords": ["python", "react"],
+        "soft_skills": ["leadership"],
+        "industry_terms": ["agile"]
+    }},
+    "content_strength": {{
+        "action_verbs_score": 7,
+        "quantified_achievements": 2,
+        "professional_language_score": 8
+    }},
+    "improvement_suggestions": [
+        "Quantify the impact of the migration project"
+    ],
+    "general_feedback": "One sentence on the strengths and weaknesses of this section"
+}}
+"""
+
+
+def _prompt_job_description(job_description: Optional[JobDescription]) -> Optional[JobDescription]:
+    """The job description compacted to its prompt budget, as in prepare_analysis_prompt"""
+    if isinstance(job_description, CompiledJobDescription):
+        return job_description._replace(
+            condensed=compact_text(job_description.condensed, PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET).text
+        )
+    if job_description:
+        return compact_text(job_description, PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET).text
+    return job_description
+
+
+async def review_section(model, section: str, text: str, job_description: Optional[JobDescription]) -> Dict:
+    """Gemini's review of one section, with the size of the prompt it took"""
+    compacted = compact_text(text, PROMPT_RESUME_TOKEN_BUDGET)
+    prompt = build_section_review_prompt(section, compacted.text, job_description)
+    prompt_tokens = estimate_tokens(prompt)
+    prompt_stats.record(prompt_tokens, compacted.original_tokens - compacted.tokens, bool(compacted.truncated_sections))
+
+    async def regenerate(repair_prompt: str) -> str:
+        return await generate_content_async(model, repair_prompt, generation_config=JSON_OUTPUT_CONFIG)
+
+    review = await parse_analysis_async(await regenerate(prompt), regenerate)
+    review["prompt_tokens"] = prompt_tokens
+    review["truncated"] = bool(compacted.truncated_sections or compacted.dropped_sections)
+    return review
+
+
+def _weighted_mean(values: List[Tuple[Optional[int], int]]) -> Optional[int]:
+    values = [(value, weight) for value, weight in values if value is not None]
+    total_weight = sum(weight for _, weight in values)
+    if not total_weight:
+        return None
+    return round(sum(value * weight for value, weight in values) / total_weight)
+
+
+def merge_reviews(
+    reviews: List[Tuple[str, Dict, int]],
+    resume_skills: Dict[str, List[str]],
+    job_description: Optional[JobDescription]
+) -> Dict:
+    """
+    One analysis in the generate_ai_analysis schema from (section, review,
+    section tokens) triples. Scores are averaged by section length,
+    achievements are added up, and keyword gaps are measured against the
+    skills of the whole resume.
+    """
+    def strength(name: str) -> List[Tuple[Optional[int], int]]:
+        return [(review.get("content_strength", {}).get(name), tokens) for _, review, tokens in reviews]
+
+    def keywords(name: str) -> List[str]:
+        return skill_taxonomy.normalize_all(
+            keyword for _, review, _ in reviews for keyword in review.get("keyword_analysis", {}).get(name, [])
+        )
+
+    def per_section(name: str) -> str:
+        return " ".join(f"{section}: {review[name]}" for section, review, _ in reviews if review.get(name))
+
+    suggestions = list(dict.fromkeys(
+        f"{section}: {suggestion}" for section, review, _ in reviews
+        for suggestion in review.get("improvement_suggestions", [])
+    ))
+    analysis = {
+        "ats_score": _weighted_mean([(review["ats_score"], tokens) for _, review, tokens in reviews]),
+        "content_strength": {
+            "action_verbs_score": _weighted_mean(strength("action_verbs_score")),
+            "quantified_achievements": sum(value or 0 for value, _ in strength("quantified_achievements"))
+        },
+        "improvement_suggestions": suggestions
+    }
+
+    if job_description:
+        resume_keywords = set(keywords("matched_keywords")) | {
+            skill for category in CATEGORIES for skill in resume_skills[category]
+        }
+        job_keywords = job_description_skills(job_description)
+        matched = [keyword for keyword in job_keywords if keyword in resume_keywords]
+        missing = [keyword for keyword in job_keywords if keyword not in resume_keywords]
+        analysis["keyword_analysis"] = {
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+            "keyword_match_percentage": round(len(matched) / len(job_keywords) * 100) if job_keywords else 0
+        }
+        analysis["content_strength"]["relevance_score"] = _weighted_mean(strength("relevance_score"))
+        analysis["role_fit_analysis"] = per_section("role_fit_analysis")
+        analysis["critical_gaps"] = [f"No mention of {keyword}" for keyword in missing[:3]]
+        return analysis
+
+    technical = list(dict.fromkeys(resume_skills["technical"] + keywords("technical_keywords")))
+    soft = list(dict.fromkeys(resume_skills["soft"] + keywords("soft_skills")))
+    analysis["keyword_analysis"] = {
+        "technical_keywords": technical,
+        "soft_skills": soft,
+        "industry_terms": list(dict.fromkeys(resume_skills["industry"] + keywords("industry_terms")))
+    }
+    analysis["content_strength"]["professional_language_score"] = _weighted_mean(strength("professional_language_score"))
+    analysis["inferred_role"] = infer_role(technical + soft)
+    analysis["general_feedback"] = per_section("general_feedback")
+    return analysis
+
+
+async def _reviewed_analysis(
+    units: List[Tuple[str, str, str, int]],
+    findings: List[Dict],
+    resume_skills: Dict[str, List[str]],
+    job_description: Optional[JobDescription],
+    local_analysis: Dict
+) -> Tuple[Dict, List[str]]:
+    """AI analysis merged from cached and fresh reviews of the units, and the units reviewed now"""
+    if not os.getenv('GEMINI_API_KEY'):
+        return {**local_analysis, "error": "Gemini API key not configured. Using fallback analysis."}, []
+
+    model = get_gemini_model(MODEL_NAME)
+    prompt_job_description = _prompt_job_description(job_description)
+    reviews: Dict[int, Dict] = {}
+    pending = {}
+    for index, (section, _, text, _) in enumerate(units):
+        if findings[index]["tokens"] < SECTION_REVIEW_MIN_TOKENS:
+            continue
+        key = section_key(MODEL_NAME, section, text, job_description)
+        review = section_cache.get(key)
+        if review is not None:
+            reviews[index] = review
+        else:
+            pending[index] = key
+
+    async def review(index: int) -> Dict:
+        section, _, text, _ = units[index]
+        return await review_flights.run(
+            pending[index], lambda: review_section(model, section, text, prompt_job_description)
+        )
+
+    results = await asyncio.gather(*(review(index) for index in pending), return_exceptions=True)
+    errors = []
+    for index, result in zip(pending, results):
+        if isinstance(result, BaseException):
+            errors.append(f"{units[index][1]}: {result or type(result).__name__}")
+        else:
+            section_cache.set(pending[index], result)
+            reviews[index] = result
+
+    reviewed_now = [units[index][1] for index in pending]
+    tokens_sent = sum(reviews[index]["prompt_tokens"] for index in pending if index in reviews)
+    tokens_saved = sum(review["prompt_tokens"] for index, review in reviews.items() if index not in pending)
+    prompt_usage = {
+        "estimatedTokens": tokens_sent,
+        "tokensSaved": tokens_saved,
+        "resumeTokens": sum(finding["tokens"] for finding in findings),
+        "jobDescriptionTokens": estimate_tokens(str(prompt_job_description)) if job_description else None,
+        "droppedSections": [],
+        "truncatedSections": [units[index][1] for index, review in sorted(reviews.items()) if review["truncated"]]
+    }
+
+    if errors:
+        # Reviews that did succeed stay cached for the next submission
+        analysis = {**local_analysis, "error": f"Section review failed ({'; '.join(errors)})"}
+    elif not reviews:
+        analysis = {**local_analysis, "error": "No section is long enough for an AI review. Using fallback analysis."}
+    else:
+        analysis = merge_reviews(
+            [(units[index][0], reviews[index], findings[index]["tokens"]) for index in sorted(reviews)],
+            resume_skills, job_description
+        )
+    analysis["prompt_usage"] = prompt_usage
+    return analysis, reviewed_now
+
+
+async def analyzeResumeIncremental(
+    resume_text: str,
+    job_description: Optional[JobDescription] = None,
+    scoring_mode: str = "ai"
+) -> Dict:
+    """
+    analyzeResumeAsync for the edit-and-resubmit loop. The resume is split
+    into sections and entries (split_units), and the detector findings and
+    Gemini review of each are cached by its content. After an edit, only
+    the changed units are scanned (apart from the formatting checks, which
+    always run over the whole text) and sent to Gemini; the rest come from
+    the cache and everything is merged into one result. The result's
+    "incremental" key reports what was reused.
+    """
+    validate_scoring_mode(scoring_mode)
+    validate_input_size(resume_text, job_description)
+    budget = CpuBudget()
+
+    with budget.charge():
+        units = split_units(resume_text)
+    labels = [label for _, label, _, _ in units]
+    model_name = MODEL_NAME if scoring_mode == "ai" else scoring_mode
+    cache_key = make_cache_key(resume_text, _job_key(job_description), PROMPT_VERSION, f"{model_name}:incremental")
+    cached_result = await result_cache.get_async(cache_key)
+    if cached_result is not None:
+        cached_result["incremental"] = {
+            "sections": labels,
+            "reusedSections": labels,
+            "recomputedSections": [],
+            "reviewedSections": []
+        }
+        return cached_result
+
+    findings = []
+    recomputed = []
+    with budget.charge():
+        for section, label, text, _ in units:
+            key = section_key("local", section, text)
+            finding = section_cache.get(key)
+            if finding is None:
+                finding = local_findings(text)
+                section_cache.set(key, finding)
+                recomputed.append(label)
+            findings.append(finding)
+
+        detected = {section for finding in findings for section in finding["detected"]}
+        sections = {section: section in detected for section in SECTION_ORDER}
+        formatting = scan_formatting(resume_text)
+        formatting_issues = formatting_issues_from_signals(formatting)
+        resume_skills = {
+            category: list(dict.fromkeys(skill for finding in findings for skill in finding["skills"][category]))
+            for category in CATEGORIES
+        }
+        signals = sum_signals(ContentSignals(*finding["content"]) for finding in findings)
+        local_analysis = heuristic_analysis(resume_skills, signals, job_description, sections)
+
+    if scoring_mode == "heuristic":
+        ai_analysis, reviewed = local_analysis, []
+    else:
+        ai_analysis, reviewed = await _reviewed_analysis(units, findings, resume_skills, job_description, local_analysis)
+
+    with budget.charge():
+        result = build_analysis_result(
+            resume_text, job_description, sections, formatting_issues, ai_analysis, scoring_mode,
+            formatting_issue_locations(resume_text, formatting)
+        )
+    if "error" not in ai_analysis:
+        result_cache.set(cache_key, result)
+
+    prompt_usage = ai_analysis.get("prompt_usage") or {}
+    incremental_stats.record(
+        len(units), len(units) - len(recomputed), len(reviewed),
+        prompt_usage.get("estimatedTokens", 0), prompt_usage.get("tokensSaved", 0)
+    )
+    result["incremental"] = {
+        "sections": labels,
+        "reusedSections": [label for label in labels if label not in recomputed],
+        "recomputedSections": recomputed,
+        "reviewedSections": reviewed
+    }
+    return result
@@ -0,0 +1,196 @@
+import hashlib
+import os
+import re
+import time
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from keyword_matcher import STOP_WORDS, TOKEN_PATTERN
+from llm_client import estimate_tokens
+from result_cache import ResultCache, normalize_text
+from skills_taxonomy import skill_taxonomy
+
+# Compiled job descriptions kept for reuse by ID; expired handles must be compiled again
+JOB_DESCRIPTION_MAX_ENTRIES = int(os.getenv("JOB_DESCRIPTION_MAX_ENTRIES", "256"))
+JOB_DESCRIPTION_TTL_SECONDS = float(os.getenv("JOB_DESCRIPTION_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Upper bounds for the condensed form sent to the LLM
+JOB_DESCRIPTION_MAX_REQUIREMENTS = 25
+REQUIREMENT_MAX_CHARS = 240
+KEYWORD_COUNT = 15
+
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*•◦▪■●○>]+|\d{1,2}[.)])\s+")
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9])")
+# Wording that marks a line as something the candidate must have or do
+REQUIREMENT_CUE_PATTERN = re.compile(
+    r"\b(?:require[sd]?|requirements?|must|should|experience|proficien\w*|knowledge|familiar\w*|"
+    r"degree|years?|skills?|ability|able to|understanding|qualifications?|expertise|hands-on|responsib\w*)\b",
+    re.IGNORECASE
+)
+
+
+class CompiledJobDescription(NamedTuple):
+    """
+    Everything the analyzers need from a job description, worked out once
+    per posting: the requirement lines, keywords, taxonomy-normalized
+    skills, and the condensed text that prompts carry instead of the
+    full posting.
+    """
+    id: str
+    text: str
+    title: str
+    requirements: List[str]
+    keywords: List[str]
+    skills: List[str]
+    skills_by_category: Dict[str, List[str]]
+    condensed: str
+    token_count: int
+    condensed_token_count: int
+    created_at: float
+
+    def to_dict(self) -> Dict:
+        """API representation"""
+        return {
+            "jobDescriptionId": self.id,
+            "title": self.title,
+            "requirements": self.requirements,
+            "keywords": self.keywords,
+            "skills": self.skills,
+            "skillsByCategory": self.skills_by_category,
+            "condensed": self.condensed,
+            "tokenCount": self.token_count,
+            "condensedTokenCount": self.condensed_token_count,
+            "createdAt": self.created_at
+        }
+
+    def to_record(self) -> Dict:
+        """Everything, including the full text, for the compiled job description store"""
+        return self._asdict()
+
+    @classmethod
+    def from_record(cls, record: Dict) -> "CompiledJobDescription":
+        return cls(**record)
+
+
+# A job description as the analyzers accept it: pasted text or a compiled one
+JobDescription = Union[str, CompiledJobDescription]
+
+
+def job_description_id(text: str) -> str:
+    """Content hash of a job description, so the same posting always gets the same ID"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()[:24]
+
+
+def parse_requirements(text: str) -> List[str]:
+    """
+    Lines (or sentences of long paragraphs) that state a requirement: bullet
+    points, lines with requirement wording, and lines naming a technical skill.
+    Headings and duplicates are dropped; order is kept.
+    """
+    requirements: List[str] = []
+    seen = set()
+    for line in text.splitlines():
+        bullet = BULLET_PATTERN.match(line)
+        line = BULLET_PATTERN.sub("", line).strip()
+        for sentence in SENTENCE_END_PATTERN.split(line) if len(line) > REQUIREMENT_MAX_CHARS else [line]:
+            sentence = " ".join(sentence.split())
+            if len(sentence) < 8 or (sentence.endswith(":") and len(sentence) < 60):
+                continue
+            if not (bullet or REQUIREMENT_CUE_PATTERN.search(sentence) or skill_taxonomy.skills_in(sentence, "technical")):
+                continue
+            key = sentence.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            if len(sentence) > REQUIREMENT_MAX_CHARS:
+                sentence = sentence[:REQUIREMENT_MAX_CHARS].rsplit(" ", 1)[0] + "…"
+            requirements.append(sentence)
+            if len(requirements) == JOB_DESCRIPTION_MAX_REQUIREMENTS:
+                return requirements
+    return requirements
+
+
+def extract_keywords(text: str, skills: List[str], count: int = KEYWORD_COUNT) -> List[str]:
+    """Most frequent meaningful words that are not already listed as skills"""
+    skill_words = {word for skill in skills for word in TOKEN_PATTERN.findall(skill)}
+    words = Counter(
+        word for word in TOKEN_PATTERN.findall(text.lower())
+        if len(word) > 2 and not word.isdigit() and word not in STOP_WORDS and word not in skill_words
+    )
+    return [word for word, _ in words.most_common(count)]
+
+
+def compile_job_description(text: str) -> CompiledJobDescription:
+    """Do all the job-side work for a posting once"""
+    text = normalize_text(text)
+    title = next((line.strip() for line in text.splitlines() if line.strip()), "")[:120]
+    requirements = parse_requirements(text)
+    skills_by_category = skill_taxonomy.skills_by_category(text)
+    skills = skill_taxonomy.skills_in(text)
+
+    lines = [f"Role: {title}"]
+    if skills:
+        lines.append(f"Required skills: {', '.join(skills)}")
+    if requirements:
+        lines.append("Requirements:")
+        lines.extend(f"- {requirement}" for requirement in requirements)
+    condensed = "\n".join(lines)
+    if not requirements or len(condensed) >= len(text):
+        # Nothing to gain from condensing (or nothing recognizable): send the posting itself
+        condensed = text
+
+    return CompiledJobDescription(
+        id=job_description_id(text),
+        text=text,
+        title=title,
+        requirements=requirements,
+        keywords=extract_keywords(text, skills),
+        skills=skills,
+        skills_by_category=skills_by_category,
+        condensed=condensed,
+        token_count=estimate_tokens(text),
+        condensed_token_count=estimate_tokens(condensed),
+        created_at=time.time()
+    )
+
+
+class JobDescriptionStore:
+    """Compiled job descriptions by ID, in a bounded, expiring ResultCache"""
+
+    def __init__(self, max_entries: int = JOB_DESCRIPTION_MAX_ENTRIES,
+                 ttl_seconds: float = JOB_DESCRIPTION_TTL_SECONDS, db_path: Optional[str] = None):
+        self._cache = ResultCache(max_entries=max_entries, ttl_seconds=ttl_seconds, db_path=db_path)
+
+    @classmethod
+    def from_env(cls) -> "JobDescriptionStore":
+        """Build a store from JOB_DESCRIPTION_* environment variables"""
+        return cls(db_path=os.getenv("JOB_DESCRIPTION_DB_PATH") or None)
+
+    def compile(self, text: str) -> CompiledJobDescription:
+        """Compile a posting, or return the stored compilation of the same text"""
+        compiled = self.get(job_description_id(text))
+        if compiled is None:
+            compiled = compile_job_description(text)
+            self._cache.set(compiled.id, compiled.to_record())
+        return compiled
+
+    def get(self, handle: str) -> Optional[CompiledJobDescription]:
+        record = self._cache.get(handle)
+        return CompiledJobDescription.from_record(record) if record is not None else None
+
+    def stats(self) -> Dict:
+        return self._cache.stats()
+
+
+def job_description_text(job_description: Optional[JobDescription]) -> Optional[str]:
+    """The full text of a pasted or compiled job description"""
+    if isinstance(job_description, CompiledJobDescription):
+        return job_description.text
+    return job_description
+
+
+def job_description_skills(job_description: JobDescription) -> List[str]:
+    """Canonical skills of a job description, precomputed when it is compiled"""
+    if isinstance(job_description, CompiledJobDescription):
+        return job_description.skills
+    return skill_taxonomy.skills_in(job_description)
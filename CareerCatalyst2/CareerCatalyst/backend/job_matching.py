@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from keyword_matcher import STOP_WORDS, TOKEN_PATTERN
+
+# Okapi BM25 parameters: term frequency saturation and document length normalization
+BM25_K1 = float(os.getenv("JOB_MATCH_BM25_K1", "1.2"))
+BM25_B = float(os.getenv("JOB_MATCH_BM25_B", "0.75"))
+
+# Most results one /jobs/match request may ask for
+JOB_MATCH_MAX_RESULTS = int(os.getenv("JOB_MATCH_MAX_RESULTS", "100"))
+
+
+def index_terms(text: str) -> List[str]:
+    """Word tokens of a listing or resume, stop words removed (same tokens as the keyword matcher)"""
+    return [word for word in TOKEN_PATTERN.findall(text.lower()) if word not in STOP_WORDS]
+
+
+def listing_text(job: Dict) -> str:
+    """The part of a listing that is indexed: its title and description"""
+    return f"{job.get('title') or ''} {job.get('description') or ''}"
+
+
+class JobIndex:
+    """
+    BM25 inverted index over job listings, stored as a sparse matrix.
+
+    Rows are listings and columns are terms. Each stored value is the
+    term's complete BM25 contribution for that listing, so a query is a
+    column slice followed by a sparse row sum. The matrix is kept in CSC
+    form, which makes a column (a term's posting list) a contiguous slice;
+    a query only touches the postings of its own terms. Ranking the whole
+    index against a resume is therefore one vectorized operation with no
+    per-listing Python work.
+    """
+
+    def __init__(self, weights: sparse.csc_matrix, idf: np.ndarray, vocabulary: Dict[str, int],
+                 listing_ids: np.ndarray, jobs: List[Dict], generation: int = 0):
+        self._weights = weights
+        self._idf = idf
+        self._vocabulary = vocabulary
+        self._terms = np.empty(len(vocabulary), dtype=object)
+        for term, term_id in vocabulary.items():
+            self._terms[term_id] = term
+        self.listing_ids = listing_ids
+        self.jobs = jobs
+        self.generation = generation
+
+    @classmethod
+    def build(cls, listings: Sequence[Tuple[int, Dict]], generation: int = 0,
+              k1: float = BM25_K1, b: float = BM25_B) -> "JobIndex":
+        """Index (listing id, job) pairs, e.g. JobStore.listings()"""
+        vocabulary: Dict[str, int] = {}
+        lookup = vocabulary.setdefault
+        doc_lengths = np.zeros(len(listings), dtype=np.int64)
+        term_ids: List[int] = []
+        for row, (_, job) in enumerate(listings):
+            terms = index_terms(listing_text(job))
+            doc_lengths[row] = len(terms)
+            term_ids.extend(lookup(term, len(vocabulary)) for term in terms)
+
+        rows = np.repeat(np.arange(len(listings), dtype=np.int32), doc_lengths)
+        cols = np.fromiter(term_ids, dtype=np.int32, count=len(term_ids))
+        # Duplicate (row, term) entries are summed into term frequencies
+        tf = sparse.csc_matrix(
+            (np.ones(len(cols), dtype=np.float32), (rows, cols)),
+            shape=(len(listings), len(vocabulary))
+        )
+        tf.sum_duplicates()
+
+        doc_freq = np.diff(tf.indptr)
+        idf = np.log1p((len(listings) - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        avg_length = max(doc_lengths.mean(), 1.0) if len(listings) else 1.0
+        norm = (k1 * (1 - b + b * doc_lengths / avg_length)).astype(np.float32)
+        term_of_value = np.repeat(np.arange(len(vocabulary)), doc_freq)
+        tf.data = idf[term_of_value] * tf.data * (k1 + 1) / (tf.data + norm[tf.indices])
+
+        listing_ids = np.fromiter((listing_id for listing_id, _ in listings), dtype=np.int64, count=len(listings))
+        return cls(tf, idf, vocabulary, listing_ids, [job for _, job in listings], generation)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._vocabulary)
+
+    def query_terms(self, text: str) -> np.ndarray:
+        """Ids of the indexed terms occurring in text; each counts once, however often it is repeated"""
+        vocabulary = self._vocabulary
+        found = {vocabulary[term] for term in index_terms(text) if term in vocabulary}
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def scores(self, term_ids: np.ndarray) -> np.ndarray:
+        """BM25 score of every listing for a set of query term ids"""
+        if not len(term_ids):
+            return np.zeros(len(self.jobs), dtype=np.float32)
+        return np.asarray(self._weights[:, term_ids].sum(axis=1)).ravel()
+
+    def rank(self, text: str, limit: int = 20) -> List[Dict]:
+        """
+        Best matching listings for a resume, highest score first:
+        [{"listingId", "score", "matchedTerms", "job"}]. Listings sharing no
+        terms with the resume are left out.
+        """
+        return self.rank_terms(self.query_terms(text), limit)
+
+    def rank_terms(self, term_ids: np.ndarray, limit: int = 20) -> List[Dict]:
+        if not len(term_ids) or not len(self.jobs):
+            return []
+        scores = self.scores(term_ids)
+        limit = max(1, min(limit, len(scores)))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        top = top[scores[top] > 0]
+
+        # Re-reading the few returned listings is cheaper than pulling their rows out of the index
+        query = set(self._terms[term_ids])
+        results = []
+        for row in top:
+            matched = query.intersection(index_terms(listing_text(self.jobs[row])))
+            results.append({
+                "listingId": int(self.listing_ids[row]),
+                "score": round(float(scores[row]), 3),
+                # Rarest (most telling) terms first
+                "matchedTerms": sorted(matched, key=lambda term: (-self._idf[self._vocabulary[term]], term)),
+                "job": self.jobs[row]
+            })
+        return results
+
+
+class JobMatcher:
+    """
+    Ranks the listings of a JobStore against resumes.
+
+    `builders` maps a method name to the index class used for it (anything
+    with build(listings, generation) and rank(text, limit)); BM25 is always
+    available. Each index is built on first use and rebuilt when a crawl has
+    changed the store since (BM25 weights depend on the whole collection, so
+    indexes are rebuilt rather than patched). Queries running during a
+    rebuild keep using the previous index.
+    """
+
+    def __init__(self, store, builders: Optional[Dict[str, type]] = None):
+        self.store = store
+        self.builders: Dict[str, type] = {"bm25": JobIndex, **(builders or {})}
+        self._indexes: Dict[str, object] = {}
+        self._locks = {method: threading.Lock() for method in self.builders}
+        self._builds = {method: 0 for method in self.builders}
+        self._last_build_ms = {method: 0.0 for method in self.builders}
+
+    def index(self, method: str = "bm25"):
+        if method not in self.builders:
+            raise ValueError(f"Unknown match method '{method}'. Use one of: {', '.join(self.builders)}")
+        current = self._indexes.get(method)
+        if current is not None and current.generation == self.store.generation:
+            return current
+        lock = self._locks[method]
+        # While another request rebuilds, answer from the previous index if there is one
+        if not lock.acquire(blocking=current is None):
+            return current
+        try:
+            current = self._indexes.get(method)
+            generation = self.store.generation
+            if current is None or current.generation != generation:
+                start = time.perf_counter()
+                current = self.builders[method].build(self.store.listings(), generation)
+                self._indexes[method] = current
+                self._builds[method] += 1
+                self._last_build_ms[method] = (time.perf_counter() - start) * 1000
+            return current
+        finally:
+            lock.release()
+
+    def match(self, resume_text: str, limit: int = 20, method: str = "bm25") -> Dict:
+        """Listings ranked against a resume: {"method", "matches", "indexedJobs", "elapsedMs"}"""
+        start = time.perf_counter()
+        index = self.index(method)
+        matches = index.rank(resume_text, max(1, min(limit, JOB_MATCH_MAX_RESULTS)))
+        return {
+            "method": method,
+            "matches": matches,
+            "indexedJobs": len(index),
+            "elapsedMs": round((time.perf_counter() - start) * 1000, 2)
+        }
+
+    def stats(self) -> Dict:
+        return {
+            method: {
+                "indexedJobs": len(self._indexes[method]) if method in self._indexes else 0,
+                "builds": self._builds[method],
+                "lastBuildMs": round(self._last_build_ms[method], 1)
+            }
+            for method in self.builders
+        }
@@ -0,0 +1,307 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+
+import aggregator
+from aggregator import JobSource, aggregate_jobs
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY,
+    link_key TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS listings_by_link ON listings (link_key) WHERE link_key != '';
+CREATE UNIQUE INDEX IF NOT EXISTS listings_by_title ON listings (title_key);
+CREATE TABLE IF NOT EXISTS queries (
+    key TEXT PRIMARY KEY,
+    crawled_at REAL NOT NULL,
+    report TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS query_listings (
+    query_key TEXT NOT NULL,
+    listing_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (query_key, listing_id)
+);
+"""
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_field(value: Optional[str]) -> str:
+    """Lowercase words only, so "Python Developer (Remote)" == "python developer - remote" """
+    return _NON_WORD.sub(" ", (value or "").lower()).strip()
+
+
+def normalize_link(link: Optional[str]) -> str:
+    """Host and path without scheme, query string, fragment or trailing slash"""
+    if not link:
+        return ""
+    parts = urlsplit(link.strip())
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+
+def query_key(role: str, location: str, job_type: str) -> str:
+    return "|".join(normalize_field(part) for part in (role, location, job_type))
+
+
+def dedup_keys(job: Dict) -> Tuple[str, str]:
+    """(link key, title key) identifying a listing across sources"""
+    link_key = normalize_link(job.get("link"))
+    title = normalize_field(job.get("title"))
+    company = normalize_field(job.get("company"))
+    if title in ("", "n a") or company in ("", "n a"):
+        # Too little to match on: only identical links (or, without a link, identical listings) are duplicates
+        if link_key:
+            return link_key, f"link:{link_key}"
+        content = hashlib.sha256(json.dumps(job, sort_keys=True).encode("utf-8")).hexdigest()
+        return link_key, f"content:{content}"
+    return link_key, f"{title}|{company}"
+
+
+class JobStore:
+    """
+    SQLite store of aggregated job listings with stale-while-revalidate reads.
+
+    search() answers from the store whenever the query has been crawled
+    before. Once the last crawl is older than `fresh_seconds` it also starts
+    a background refresh. A refresh fetches only the first page of each
+    source and fetches the remaining pages only where that first page has
+    listings the store has not seen. Listings are deduplicated across
+    sources by normalized link and by normalized title + company. Listings
+    not seen for `max_age_seconds` are dropped.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        fresh_seconds: float = 900,
+        max_age_seconds: float = 7 * 24 * 3600,
+        sources: Optional[Sequence[JobSource]] = None
+    ):
+        self.db_path = db_path
+        self.fresh_seconds = fresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self._sources = sources
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        # Bumped whenever listings change, so indexes over the store know to rebuild
+        self._generation = 0
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-store")
+        self._counters = {"hits": 0, "staleHits": 0, "misses": 0, "refreshes": 0, "incrementalRefreshes": 0}
+
+    @classmethod
+    def from_env(cls) -> "JobStore":
+        """Build a store from JOB_STORE_* environment variables"""
+        return cls(
+            db_path=os.getenv("JOB_STORE_DB_PATH", os.path.join(BACKEND_DIR, "var", "job_listings.db")),
+            fresh_seconds=float(os.getenv("JOB_STORE_FRESH_SECONDS", "900")),
+            max_age_seconds=float(os.getenv("JOB_STORE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+        )
+
+    @property
+    def sources(self) -> Sequence[JobSource]:
+        return aggregator.SOURCES if self._sources is None else self._sources
+
+    def search(self, role: str, location: str, job_type: str) -> Dict:
+        """
+        Listings for a query: {"jobs", "sources", "cache"}. Only a query that
+        has never been crawled waits for the job boards.
+        """
+        key = query_key(role, location, job_type)
+        cached = self._read(key)
+        if cached is None:
+            self._count("misses")
+            result = self.refresh(role, location, job_type)
+            cached = self._read(key)
+            if cached is None:
+                # Nothing could be fetched; report why without caching the failure
+                return {**result, "cache": {"status": "miss", "crawledAt": None, "refreshing": False}}
+            status = "miss"
+        elif time.time() - cached[0] <= self.fresh_seconds:
+            self._count("hits")
+            status = "fresh"
+        else:
+            self._count("staleHits")
+            self._refresh_in_background(role, location, job_type)
+            status = "stale"
+
+        crawled_at, report, jobs = cached
+        with self._lock:
+            refreshing = key in self._refreshing
+        return {
+            "jobs": jobs,
+            "sources": report,
+            "cache": {"status": status, "crawledAt": crawled_at, "refreshing": refreshing}
+        }
+
+    def refresh(self, role: str, location: str, job_type: str) -> Dict:
+        """Crawl the job boards for a query now and store what comes back"""
+        key = query_key(role, location, job_type)
+        with self._lock:
+            crawled_before = self._db.execute("SELECT 1 FROM queries WHERE key = ?", (key,)).fetchone() is not None
+
+        if not crawled_before:
+            result = aggregate_jobs(role, location, job_type, self.sources)
+        else:
+            result = aggregate_jobs(role, location, job_type, self.sources, pages=slice(0, 1))
+            # Boards list newest first: a first page with nothing new means the later pages are unchanged too
+            with self._lock:
+                changed = {job["source"] for job in result["jobs"] if not self._is_known(job)}
+            more = [source for source in self.sources if source.name in changed]
+            if more:
+                rest = aggregate_jobs(role, location, job_type, more, pages=slice(1, None))
+                result = _merge_results(result, rest)
+            self._count("incrementalRefreshes")
+
+        self._save(key, result)
+        self._count("refreshes")
+        return result
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def listings(self) -> List[Tuple[int, Dict]]:
+        """(listing id, job) for every stored listing, oldest first"""
+        with self._lock:
+            rows = self._db.execute("SELECT id, data FROM listings ORDER BY id").fetchall()
+        return [(listing_id, json.loads(data)) for listing_id, data in rows]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.executescript("DELETE FROM query_listings; DELETE FROM queries; DELETE FROM listings;")
+            self._generation += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            listings = self._db.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+            queries = self._db.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+            return {
+                **self._counters,
+                "listings": listings,
+                "queries": queries,
+                "refreshing": len(self._refreshing),
+                "freshSeconds": self.fresh_seconds
+            }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _read(self, key: str) -> Optional[Tuple[float, Dict, List[Dict]]]:
+        """(crawled_at, source report, jobs) for a crawled query, newest crawl first"""
+        with self._lock:
+            row = self._db.execute("SELECT crawled_at, report FROM queries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            rows = self._db.execute(
+                "SELECT l.data FROM query_listings q JOIN listings l ON l.id = q.listing_id "
+                "WHERE q.query_key = ? ORDER BY q.last_seen DESC, q.position",
+                (key,)
+            ).fetchall()
+        return row[0], json.loads(row[1]), [json.loads(data) for (data,) in rows]
+
+    def _find(self, job: Dict) -> Optional[int]:
+        # Caller must hold self._lock
+        link_key, title_key = dedup_keys(job)
+        row = self._db.execute(
+            "SELECT id FROM listings WHERE (link_key = ? AND link_key != '') OR title_key = ? LIMIT 1",
+            (link_key, title_key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _is_known(self, job: Dict) -> bool:
+        # Caller must hold self._lock
+        return self._find(job) is not None
+
+    def _save(self, key: str, result: Dict) -> None:
+        now = time.time()
+        fetched = any(report["pagesFetched"] for report in result["sources"].values())
+        with self._lock:
+            for position, job in enumerate(result["jobs"]):
+                listing_id = self._find(job)
+                if listing_id is None:
+                    link_key, title_key = dedup_keys(job)
+                    listing_id = self._db.execute(
+                        "INSERT INTO listings (link_key, title_key, data, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)",
+                        (link_key, title_key, json.dumps(job), now, now)
+                    ).lastrowid
+                else:
+                    self._db.execute(
+                        "UPDATE listings SET data = ?, last_seen = ? WHERE id = ?", (json.dumps(job), now, listing_id)
+                    )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO query_listings (query_key, listing_id, position, last_seen) VALUES (?, ?, ?, ?)",
+                    (key, listing_id, position, now)
+                )
+            if fetched:
+                # A crawl where every source failed leaves the query stale so the next search retries
+                self._db.execute(
+                    "INSERT OR REPLACE INTO queries (key, crawled_at, report) VALUES (?, ?, ?)",
+                    (key, now, json.dumps(result["sources"]))
+                )
+            cutoff = now - self.max_age_seconds
+            self._db.execute("DELETE FROM query_listings WHERE last_seen < ?", (cutoff,))
+            self._db.execute(
+                "DELETE FROM listings WHERE last_seen < ? AND id NOT IN (SELECT listing_id FROM query_listings)",
+                (cutoff,)
+            )
+            self._db.commit()
+            self._generation += 1
+
+    def _refresh_in_background(self, role: str, location: str, job_type: str) -> None:
+        key = query_key(role, location, job_type)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(role, location, job_type)
+            except Exception as e:
+                logger.warning("Background refresh of job listings for '%s' failed: %s", key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresher.submit(run)
+
+
+def _merge_results(first: Dict, rest: Dict) -> Dict:
+    """Combine aggregate_jobs results for the first and the remaining pages"""
+    sources = {name: dict(report) for name, report in first["sources"].items()}
+    for name, report in rest["sources"].items():
+        merged = sources[name]
+        merged["pages"] += report["pages"]
+        merged["pagesFetched"] += report["pagesFetched"]
+        merged["jobs"] += report["jobs"]
+        merged["errors"] = merged["errors"] + report["errors"]
+        merged["elapsedMs"] += report["elapsedMs"]
+        if merged["pagesFetched"] == merged["pages"]:
+            merged["status"] = "ok"
+        elif merged["pagesFetched"]:
+            merged["status"] = "partial"
+    return {"jobs": first["jobs"] + rest["jobs"], "sources": sources}
@@ -0,0 +1,92 @@
+import re
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
+
+# Words are runs of letters/digits plus '+' and '#' so "c++" and "c#" survive;
+# everything else (spaces, '-', '.', '/') separates words. "problem-solving"
+# therefore matches "problem solving", and "java" never matches "javascript".
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+# Built-in vocabularies; the skills taxonomy falls back to these when its file is missing
+TECHNICAL_KEYWORDS = ['python', 'java', 'javascript', 'sql', 'html', 'css', 'react', 'node', 'api', 'database', 'git', 'docker', 'kubernetes', 'aws', 'azure', 'mongodb', 'postgresql', 'django', 'flask', 'vue', 'angular', 'typescript', 'machine learning', 'data science', 'artificial intelligence', 'blockchain']
+SOFT_SKILLS = ['communication', 'leadership', 'teamwork', 'problem-solving', 'analytical', 'creative', 'project management', 'time management', 'adaptability', 'critical thinking']
+INDUSTRY_TERMS = ['agile', 'scrum', 'kanban', 'ci/cd', 'devops', 'microservices', 'saas', 'b2b', 'stakeholder', 'roadmap']
+
+# Words too common in resumes and job descriptions to say anything about fit
+STOP_WORDS = frozenset("""
+a about above after all also am an and any are as at be been being below between both but by can could
+did do does doing down during each etc few for from further had has have having he her here hers him his
+how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+ours out over own per same she should so some such than that the their theirs them then there these they
+this those through to too under until up us very via was we were what when where which while who whom why
+will with within would you your yours
+""".split())
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Lowercase word tokens, as used for both terms and documents"""
+    return tuple(TOKEN_PATTERN.findall(text.lower()))
+
+class KeywordMatcher:
+    """
+    Whole-word, multi-word keyword matcher built once and reused.
+
+    Terms are indexed by their token sequence, so a document is scanned in
+    a single tokenizing pass with one dict lookup per word; the cost does not
+    grow with the number of terms. Longest match wins and matches do not overlap.
+    `terms` is either a list of keywords or a mapping of alias -> canonical name.
+    """
+
+    def __init__(self, terms: Union[Iterable[str], Mapping[str, str]]):
+        pairs = terms.items() if isinstance(terms, Mapping) else ((term, term) for term in terms)
+        self._phrases: Dict[Tuple[str, ...], str] = {}
+        # First word -> phrase lengths starting with it, longest first
+        self._lengths_by_first: Dict[str, List[int]] = {}
+        for alias, canonical in pairs:
+            tokens = tokenize(alias)
+            if not tokens:
+                continue
+            self._phrases[tokens] = canonical
+            lengths = self._lengths_by_first.setdefault(tokens[0], [])
+            if len(tokens) not in lengths:
+                lengths.append(len(tokens))
+                lengths.sort(reverse=True)
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def _match(self, words: List[str]) -> List[Tuple[str, int, int]]:
+        """(canonical, first word index, word count) for each non-overlapping match"""
+        starters = self._lengths_by_first
+        matches = []
+        next_free = 0
+        for i in [i for i, word in enumerate(words) if word in starters]:
+            if i < next_free:
+                continue
+            for length in starters[words[i]]:
+                key = (words[i],) if length == 1 else tuple(words[i:i + length])
+                canonical = self._phrases.get(key)
+                if canonical is not None:
+                    matches.append((canonical, i, length))
+                    next_free = i + length
+                    break
+        return matches
+
+    def find(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Map each matched canonical term to its (start, end) spans, in order of first appearance"""
+        text_lower = text.lower()
+        spans = [match.span() for match in TOKEN_PATTERN.finditer(text_lower)]
+        words = [text_lower[start:end] for start, end in spans]
+        hits: Dict[str, List[Tuple[int, int]]] = {}
+        for canonical, i, length in self._match(words):
+            hits.setdefault(canonical, []).append((spans[i][0], spans[i + length - 1][1]))
+        return hits
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Number of occurrences of each matched canonical term, in order of first appearance"""
+        counts: Dict[str, int] = {}
+        for canonical, _, _ in self._match(TOKEN_PATTERN.findall(text.lower())):
+            counts[canonical] = counts.get(canonical, 0) + 1
+        return counts
+
+    def terms_in(self, text: str) -> List[str]:
+        """Matched canonical terms, in order of first appearance"""
+        return list(self.counts(text))
@@ -0,0 +1,324 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Optional
+
+from metrics import llm_errors, llm_tokens, time_stage
+
+# Maximum number of LLM calls in flight per worker process
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Per-request deadline for an LLM call, including retries and time spent waiting for a slot
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+# Deadline for one attempt; a hung request is abandoned after this and retried
+LLM_ATTEMPT_TIMEOUT_SECONDS = float(os.getenv("LLM_ATTEMPT_TIMEOUT_SECONDS", "25"))
+
+# Retries of retryable errors (rate limits, 5xx, timeouts) with jittered exponential backoff
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+
+# Consecutive failed attempts that open the circuit breaker, and how long it stays open
+LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+LLM_CIRCUIT_RESET_SECONDS = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30"))
+
+# Send a second, identical request when the first has not answered after this many seconds (0 disables)
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0"))
+
+# Used for clients that only offer the blocking generate_content API, and for blocking callers
+_executor = ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix="llm")
+
+# Rough characters per token of English text for Gemini-style tokenizers
+CHARS_PER_TOKEN = 4
+
+# google.api_core exception names (and HTTP status codes) of errors worth retrying;
+# matched by name so this module does not import the Gemini SDK
+RETRYABLE_ERROR_NAMES = frozenset({
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "BadGateway",
+})
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Return the concurrency limiter for the running event loop"""
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        _semaphore_loop = loop
+    return _semaphore
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count of text, without a tokenizer round trip"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the provider while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a provider that keeps failing. After `failure_threshold`
+    consecutive failed attempts the circuit opens and calls are rejected
+    straight away; after `reset_seconds` one trial call is let through and
+    its outcome closes the circuit or opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = LLM_CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds: float = LLM_CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._counters = {"opened": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_seconds:
+                # Half-open: one trial call at a time (a trial that never reports back expires)
+                if self._probe_started is None or now - self._probe_started >= self.reset_seconds:
+                    self._probe_started = now
+                    return True
+            self._counters["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = self._probe_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probe_started is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    self._counters["opened"] += 1
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if self._probe_started is not None else "open"
+
+    def stats(self) -> Dict:
+        state = self.state
+        with self._lock:
+            return {**self._counters, "state": state, "consecutiveFailures": self._failures}
+
+
+llm_breaker = CircuitBreaker()
+
+_stats_lock = threading.Lock()
+_counters = {"calls": 0, "failedAttempts": 0, "retries": 0, "timeouts": 0, "hedges": 0, "hedgeWins": 0}
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _counters[name] += 1
+
+
+def llm_stats() -> Dict:
+    """Call, retry, hedge and circuit breaker counters, reported by /health"""
+    with _stats_lock:
+        counters = dict(_counters)
+    return {**counters, "circuitBreaker": llm_breaker.stats()}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, dropped connections, rate limits and server errors are worth another try"""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES or getattr(error, "code", None) in RETRYABLE_STATUS_CODES
+
+
+def backoff_delay(retry: int) -> float:
+    """Full-jitter exponential backoff: uniform in [0, base * 2^retry], capped"""
+    return random.uniform(0, min(LLM_RETRY_MAX_SECONDS, LLM_RETRY_BASE_SECONDS * 2 ** retry))
+
+
+def _check_circuit() -> None:
+    if not llm_breaker.allow():
+        raise CircuitOpenError("LLM provider unavailable (circuit breaker open)")
+
+
+def _retry_delay(error: Exception, retry: int, deadline: float) -> float:
+    """Record a failed attempt; return the backoff before the next one, or re-raise `error`"""
+    if not is_retryable(error):
+        # The provider answered; the request itself was at fault
+        llm_breaker.record_success()
+        raise error
+    llm_breaker.record_failure()
+    _count("failedAttempts")
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        _count("timeouts")
+    delay = backoff_delay(retry)
+    if retry >= LLM_MAX_RETRIES or time.monotonic() + delay >= deadline:
+        raise error
+    _count("retries")
+    return delay
+
+
+def _response_text(prompt: str, response) -> str:
+    """Text of a model response; counts its tokens, as reported by Gemini or else estimated"""
+    usage = getattr(response, "usage_metadata", None)
+    llm_tokens.inc(getattr(usage, "prompt_token_count", 0) or estimate_tokens(prompt), kind="prompt")
+    llm_tokens.inc(getattr(usage, "candidates_token_count", 0) or estimate_tokens(response.text), kind="response")
+    return response.text
+
+
+async def _call(model, prompt: str, kwargs: Dict) -> str:
+    async with _get_semaphore():
+        if hasattr(model, "generate_content_async"):
+            response = await model.generate_content_async(prompt, **kwargs)
+        else:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(_executor, lambda: model.generate_content(prompt, **kwargs))
+        return _response_text(prompt, response)
+
+
+async def _attempt(model, prompt: str, kwargs: Dict) -> str:
+    """One attempt; with hedging on, a second request races a slow first one"""
+    tasks = {asyncio.ensure_future(_call(model, prompt, kwargs))}
+    hedge = None
+    error: Optional[BaseException] = None
+    try:
+        while tasks:
+            hedge_wait = LLM_HEDGE_AFTER_SECONDS if LLM_HEDGE_AFTER_SECONDS > 0 and hedge is None else None
+            done, tasks = await asyncio.wait(tasks, timeout=hedge_wait, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        _count("hedgeWins")
+                    return task.result()
+                error = task.exception()
+            if not done and hedge is None:
+                _count("hedges")
+                hedge = asyncio.ensure_future(_call(model, prompt, kwargs))
+                tasks.add(hedge)
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _generate_with_retries(model, prompt: str, kwargs: Dict, deadline: float) -> str:
+    retry = 0
+    while True:
+        _check_circuit()
+        try:
+            text = await asyncio.wait_for(_attempt(model, prompt, kwargs), LLM_ATTEMPT_TIMEOUT_SECONDS)
+        except Exception as error:
+            await asyncio.sleep(_retry_delay(error, retry, deadline))
+            retry += 1
+        else:
+            llm_breaker.record_success()
+            return text
+
+
+async def generate_content_async(
+    model, prompt: str, timeout: Optional[float] = None, generation_config: Optional[Dict] = None
+) -> str:
+    """
+    Run one generation without blocking the event loop and return the response text.
+
+    Calls are limited to LLM_MAX_CONCURRENCY at a time. Each attempt has its
+    own deadline; retryable errors are retried with jittered backoff, and
+    the whole call raises asyncio.TimeoutError if no response arrives within
+    `timeout` seconds (LLM_TIMEOUT_SECONDS by default). Raises
+    CircuitOpenError without calling the model while the provider is down.
+    `generation_config` is passed through to the model (e.g. to ask for JSON output).
+    """
+    _count("calls")
+    timeout = timeout or LLM_TIMEOUT_SECONDS
+    kwargs = {"generation_config": generation_config} if generation_config else {}
+    with time_stage("llm_call"):
+        try:
+            return await asyncio.wait_for(
+                _generate_with_retries(model, prompt, kwargs, time.monotonic() + timeout), timeout
+            )
+        except Exception as error:
+            llm_errors.inc(error=type(error).__name__)
+            raise
+
+
+def _call_blocking(model, prompt: str, kwargs: Dict) -> str:
+    return _response_text(prompt, model.generate_content(prompt, **kwargs))
+
+
+def _attempt_blocking(model, prompt: str, kwargs: Dict, timeout: float) -> str:
+    end = time.monotonic() + timeout
+    hedge_at = time.monotonic() + LLM_HEDGE_AFTER_SECONDS if LLM_HEDGE_AFTER_SECONDS > 0 else None
+    first = _executor.submit(_call_blocking, model, prompt, kwargs)
+    pending = {first}
+    error: Optional[BaseException] = None
+    while pending:
+        wake = min(end, hedge_at) if hedge_at else end
+        done, pending = wait(pending, timeout=max(0.0, wake - time.monotonic()), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is not first:
+                    _count("hedgeWins")
+                return future.result()
+            error = future.exception()
+        if not pending:
+            break
+        if hedge_at and time.monotonic() >= hedge_at:
+            _count("hedges")
+            pending.add(_executor.submit(_call_blocking, model, prompt, kwargs))
+            hedge_at = None
+        elif time.monotonic() >= end:
+            # The worker thread is abandoned; the SDK's own timeout eventually frees it
+            raise TimeoutError("LLM request timed out")
+    raise error
+
+
+def _generate_blocking_with_retries(
+    model, prompt: str, generation_config: Optional[Dict], timeout: Optional[float]
+) -> str:
+    deadline = time.monotonic() + (timeout or LLM_TIMEOUT_SECONDS)
+    kwargs = {"generation_config": generation_config} if generation_config else {}
+    retry = 0
+    while True:
+        _check_circuit()
+        remaining = deadline - time.monotonic()
+        try:
+            if remaining <= 0:
+                raise TimeoutError("LLM request timed out")
+            text = _attempt_blocking(model, prompt, kwargs, min(LLM_ATTEMPT_TIMEOUT_SECONDS, remaining))
+        except Exception as error:
+            time.sleep(_retry_delay(error, retry, deadline))
+            retry += 1
+        else:
+            llm_breaker.record_success()
+            return text
+
+
+def generate_content(
+    model, prompt: str, timeout: Optional[float] = None, generation_config: Optional[Dict] = None
+) -> str:
+    """Blocking generate_content_async for synchronous callers: same deadlines, retries, breaker and hedging"""
+    _count("calls")
+    with time_stage("llm_call"):
+        try:
+            return _generate_blocking_with_retries(model, prompt, generation_config, timeout)
+        except Exception as error:
+            llm_errors.inc(error=type(error).__name__)
+            raise
@@ -0,0 +1,137 @@
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets, from detector-fast to LLM-slow
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Pipeline stages timed by time_stage, in pipeline order
+STAGES = (
+    "extraction", "section_detection", "formatting_checks", "prompt_building",
+    "llm_call", "scoring", "report_rendering",
+)
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with one series per label value combination"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(tuple(labels[name] for name in self.label_names), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                labels = _labels(self.label_names, key)
+                lines.append(f"{self.name}{{{labels}}} {_number(value)}" if labels else f"{self.name} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with one series per label value, rendered with
+    cumulative buckets like a Prometheus client histogram
+    """
+
+    def __init__(self, name: str, help_text: str, label_name: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_name = label_name
+        self.buckets = tuple(buckets)
+        # label value -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label: str, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def summary(self, label: str) -> Dict:
+        """Count and total seconds observed for one label value"""
+        with self._lock:
+            counts, total = self._series.get(label, ([0], 0.0))
+            return {"count": sum(counts), "sum": total}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((label, list(counts), total) for label, (counts, total) in self._series.items())
+        for label, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(float(bound))
+                lines.append(f"{self.name}_bucket{{{_labels((self.label_name, 'le'), (label, le))}}} {cumulative}")
+            labels = _labels((self.label_name,), (label,))
+            lines.append(f"{self.name}_sum{{{labels}}} {_number(total)}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+stage_seconds = Histogram(
+    "careercatalyst_stage_duration_seconds", "Time spent in each analysis pipeline stage.", "stage"
+)
+llm_tokens = Counter(
+    "careercatalyst_llm_tokens_total", "LLM tokens sent (prompt) and received (response).", ("kind",)
+)
+llm_errors = Counter(
+    "careercatalyst_llm_errors_total", "LLM calls that failed after retries, by error type.", ("error",)
+)
+
+REGISTRY = (stage_seconds, llm_tokens, llm_errors)
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    """Record the wall time of the block in the stage latency histogram, even if it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(stage, time.perf_counter() - start)
+
+
+def timed(stage: str) -> Callable:
+    """Decorator form of time_stage for functions that are one whole stage"""
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with time_stage(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> str:
+    """All metrics of this process in the Prometheus text exposition format"""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
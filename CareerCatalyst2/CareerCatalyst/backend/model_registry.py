@@ -0,0 +1,89 @@
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Heavy clients and pipelines, created on first use and shared by the whole
+# process. Importing this module (or anything that imports it) stays cheap, so
+# cold starts and worker processes only pay for what they actually use.
+
+_loaders: Dict[str, Callable[[], Any]] = {}
+_resources: Dict[str, Any] = {}
+# Reentrant so a loader may fetch another resource
+_lock = threading.RLock()
+
+def register(name: str, loader: Callable[[], Any]) -> None:
+    """Register a loader to run on the first get(name); loaders return None when unavailable"""
+    with _lock:
+        _loaders.setdefault(name, loader)
+
+def get(name: str) -> Any:
+    """Return the shared resource, loading it on first use"""
+    try:
+        return _resources[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _resources:
+            _resources[name] = _loaders[name]()
+        return _resources[name]
+
+def put(name: str, resource: Any) -> None:
+    """Use resource for name instead of loading it (e.g. a stub model in benchmarks)"""
+    with _lock:
+        _resources[name] = resource
+
+def loaded() -> List[str]:
+    """Names of the resources loaded so far (failed loads included)"""
+    with _lock:
+        return sorted(_resources)
+
+def _load_gemini_model(model_name: str):
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return None
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+def get_gemini_model(model_name: str):
+    """Shared Gemini client for model_name, or None without a GEMINI_API_KEY"""
+    name = f"gemini:{model_name}"
+    if name not in _resources:
+        register(name, lambda: _load_gemini_model(model_name))
+    return get(name)
+
+def set_gemini_model(model_name: str, model) -> None:
+    """Replace the Gemini client for model_name"""
+    put(f"gemini:{model_name}", model)
+
+def _load_spacy_pipeline():
+    try:
+        import spacy
+        return spacy.load("en_core_web_sm")
+    except (ImportError, OSError):
+        logger.warning("spaCy model not found. Install with: python -m spacy download en_core_web_sm")
+        return None
+
+register("spacy", _load_spacy_pipeline)
+
+def get_spacy_pipeline():
+    """Shared spaCy en_core_web_sm pipeline, or None if it is not installed"""
+    return get("spacy")
+
+def _load_sentence_encoder(model_name: str):
+    try:
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name, device="cpu")
+    except (ImportError, OSError) as e:
+        logger.warning("sentence-transformers model '%s' unavailable (%s). Using hashed embeddings.", model_name, e)
+        return None
+
+def get_sentence_encoder(model_name: str):
+    """Shared local sentence-transformers model, or None if it cannot be loaded"""
+    name = f"sentence-transformers:{model_name}"
+    if name not in _resources:
+        register(name, lambda: _load_sentence_encoder(model_name))
+    return get(name)
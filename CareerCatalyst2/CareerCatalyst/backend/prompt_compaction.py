@@ -0,0 +1,192 @@
+import os
+import re
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+from llm_client import CHARS_PER_TOKEN, estimate_tokens
+from section_detector import scan_sections
+
+# Token budgets for the resume and the job description inside one analysis prompt
+PROMPT_RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", "2000"))
+PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET", "1000"))
+
+# Text before the first detected heading: usually the candidate's name and contact line
+HEADER_SECTION = "Header"
+
+# Sections kept first when a text is over budget; anything not listed comes last
+SECTION_PRIORITY = [
+    HEADER_SECTION,
+    "Contact Info",
+    "Skills",
+    "Work Experience",
+    "Summary / Objective",
+    "Projects",
+    "Certifications",
+    "Education",
+    "Languages",
+]
+
+# Repeated lines with at least this many words are page headers and footers from
+# PDF extraction; shorter repeats (job titles, dates, skill names) are content
+DUPLICATE_MIN_WORDS = 4
+PAGE_MARKER_PATTERN = re.compile(r"^(?:page\s+\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s*(?:of|/)\s*\d+|-\s*\d+\s*-)$", re.IGNORECASE)
+
+# Appended where a section was cut to fit the budget
+TRUNCATION_MARKER = "[...]"
+# Sections that would get fewer tokens than this are dropped instead of cut
+MIN_SECTION_TOKENS = 16
+
+
+class CompactedText(NamedTuple):
+    """Text cut down for a prompt, with what it cost and what was left out"""
+    text: str
+    original_tokens: int
+    tokens: int
+    dropped_sections: List[str]
+    truncated_sections: List[str]
+
+
+def clean_lines(text: str) -> str:
+    """
+    Collapse runs of whitespace, keep at most one blank line in a row, and
+    drop page markers and repeated header/footer lines.
+    """
+    lines: List[str] = []
+    seen = set()
+    blank = True
+    for raw_line in text.splitlines():
+        line = " ".join(raw_line.split())
+        if not line:
+            if not blank:
+                lines.append("")
+            blank = True
+            continue
+        if PAGE_MARKER_PATTERN.match(line):
+            continue
+        if len(line.split()) >= DUPLICATE_MIN_WORDS:
+            key = line.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+        lines.append(line)
+        blank = False
+    while lines and not lines[-1]:
+        lines.pop()
+    return "\n".join(lines)
+
+
+def section_rank(section: str) -> int:
+    return SECTION_PRIORITY.index(section) if section in SECTION_PRIORITY else len(SECTION_PRIORITY)
+
+
+def is_heading(line: str) -> bool:
+    """Short line that can be a section heading ("EXPERIENCE", "Technical Skills:")"""
+    line = line.rstrip(":")
+    return len(line) <= 40 and len(line.split()) <= 4 and ":" not in line
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    (section, text) chunks in document order. Each chunk starts at a heading
+    line that detect_resume_sections recognizes; the section detector is run
+    on heading lines only, because the first hit in the whole text is often
+    a word inside another section ("experience" in the summary).
+    """
+    starts: Dict[int, str] = {0: HEADER_SECTION}
+    seen = set()
+    position = 0
+    for line in text.split("\n"):
+        if is_heading(line):
+            _, offsets = scan_sections(line)
+            # Two sections in one heading: the chunk takes the name that ranks higher
+            section = min(offsets, key=section_rank, default=None)
+            if section and section not in seen:
+                seen.add(section)
+                starts[position] = section
+        position += len(line) + 1
+
+    bounds = sorted(starts)
+    chunks = []
+    for start, end in zip(bounds, bounds[1:] + [len(text)]):
+        chunk = text[start:end].strip("\n")
+        if chunk:
+            chunks.append((starts[start], chunk))
+    return chunks
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """The start of text that fits in `tokens`, cut at a line (or failing that, word) boundary"""
+    max_chars = tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    head = text[:max_chars]
+    newline = head.rfind("\n")
+    if newline > max_chars // 2:
+        return head[:newline].rstrip()
+    return head.rsplit(" ", 1)[0].rstrip()
+
+
+def compact_text(text: str, budget: int) -> CompactedText:
+    """
+    Clean text for a prompt and, if it is still over `budget` tokens, fill
+    the budget greedily in priority order: each section that fits is kept
+    whole, one that does not is cut to the tokens left (or dropped when too
+    few are left), and later, smaller sections are still kept if they fit
+    in what remains. Kept sections stay in document order.
+    """
+    original_tokens = estimate_tokens(text)
+    cleaned = clean_lines(text)
+    if estimate_tokens(cleaned) <= budget:
+        return CompactedText(cleaned, original_tokens, estimate_tokens(cleaned), [], [])
+
+    chunks = split_sections(cleaned)
+    kept: Dict[int, str] = {}
+    dropped: List[str] = []
+    truncated: List[str] = []
+    remaining = budget
+    for index in sorted(range(len(chunks)), key=lambda i: section_rank(chunks[i][0])):
+        section, chunk = chunks[index]
+        cost = estimate_tokens(chunk) + 1  # plus the blank line between chunks
+        if cost <= remaining:
+            kept[index] = chunk
+            remaining -= cost
+            continue
+        available = remaining - estimate_tokens(TRUNCATION_MARKER) - 2
+        head = truncate_to_tokens(chunk, available) if available >= MIN_SECTION_TOKENS else ""
+        if head:
+            kept[index] = f"{head}\n{TRUNCATION_MARKER}"
+            remaining -= estimate_tokens(kept[index]) + 1
+            truncated.append(section)
+        else:
+            dropped.append(section)
+
+    compacted = "\n\n".join(kept[index] for index in sorted(kept))
+    return CompactedText(compacted, original_tokens, estimate_tokens(compacted), dropped, truncated)
+
+
+class PromptStats:
+    """Running totals of prompt sizes, reported by /health"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {"prompts": 0, "promptTokens": 0, "tokensSaved": 0, "overBudgetPrompts": 0}
+
+    def record(self, prompt_tokens: int, tokens_saved: int, over_budget: bool) -> None:
+        with self._lock:
+            self._counters["prompts"] += 1
+            self._counters["promptTokens"] += prompt_tokens
+            self._counters["tokensSaved"] += tokens_saved
+            self._counters["overBudgetPrompts"] += int(over_budget)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            prompts = self._counters["prompts"]
+            return {
+                **self._counters,
+                "averagePromptTokens": round(self._counters["promptTokens"] / prompts) if prompts else 0,
+                "resumeTokenBudget": PROMPT_RESUME_TOKEN_BUDGET,
+                "jobDescriptionTokenBudget": PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET
+            }
+
+
+prompt_stats = PromptStats()
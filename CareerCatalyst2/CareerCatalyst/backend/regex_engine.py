@@ -0,0 +1,82 @@
+import logging
+import os
+import re
+import threading
+from typing import Dict, Pattern
+
+logger = logging.getLogger(__name__)
+
+# "auto" matches detector patterns with RE2 (pip install google-re2) when it
+# is installed, "re2" warns when it is not, and "re" always uses Python's re
+REGEX_ENGINE = os.getenv("REGEX_ENGINE", "auto")
+
+# re flags RE2 supports, as inline flags
+_INLINE_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+
+
+def _load_re2():
+    if REGEX_ENGINE == "re":
+        return None
+    if REGEX_ENGINE not in ("auto", "re2"):
+        logger.warning("Unknown REGEX_ENGINE '%s'. Using RE2 if it is installed.", REGEX_ENGINE)
+    try:
+        import re2
+    except ImportError:
+        if REGEX_ENGINE == "re2":
+            logger.warning("REGEX_ENGINE=re2 but google-re2 is not installed. Using re.")
+        return None
+    return re2
+
+
+_re2 = _load_re2()
+_lock = threading.Lock()
+_compiled = {"re2": 0, "re": 0}
+
+
+def _count(engine: str) -> None:
+    with _lock:
+        _compiled[engine] += 1
+
+
+def _compile_re2(pattern: str, flags: int):
+    if _re2 is None or flags & ~sum(_INLINE_FLAGS):
+        return None
+    inline = "".join(letter for flag, letter in _INLINE_FLAGS.items() if flags & flag)
+    options = _re2.Options()
+    # Patterns RE2 cannot compile fall back to re; don't log them to stderr
+    options.log_errors = False
+    try:
+        return _re2.compile(f"(?{inline}){pattern}" if inline else pattern, options)
+    except _re2.error:
+        return None
+
+
+def compile_detector(pattern: str, flags: int = 0, prefilter: str = "") -> Pattern:
+    """
+    Compile a pattern that detectors run over user-supplied text. RE2 matches
+    in time linear in the text whatever the pattern; without it (or for
+    patterns it cannot compile, e.g. with lookarounds) re is used, so these
+    patterns should be written not to backtrack either.
+
+    `prefilter` is a lookahead put in front of the pattern for re only. It
+    must not change what matches; it lets the backtracking engine skip
+    positions that cannot start a match, which RE2 does not need.
+
+    RE2's \\d, \\s, \\w and \\b only know ASCII, so non-ASCII letters, digits
+    and spaces next to a match can change the outcome. Its Python binding
+    re-encodes the whole string on every call, so searching from an offset
+    costs as much as a full scan: use it for patterns run once per text (or
+    per line), not for scanners that call match() at many offsets.
+    """
+    compiled = _compile_re2(pattern, flags)
+    if compiled is not None:
+        _count("re2")
+        return compiled
+    _count("re")
+    return re.compile(f"{prefilter}(?:{pattern})" if prefilter else pattern, flags)
+
+
+def regex_stats() -> Dict:
+    """Which engine detector patterns were compiled with, reported by /health"""
+    with _lock:
+        return {"engine": "re2" if _re2 is not None else "re", "compiled": dict(_compiled)}
@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Normalize text for cache keys without changing anything the analyzers
+    look at. Leading whitespace is kept: indentation changes the
+    formatting findings.
+    """
+    if not text:
+        return ""
+    return text.replace("\r\n", "\n").rstrip()
+
+
+def make_cache_key(
+    resume_text: str,
+    job_description: Optional[str],
+    prompt_version: str,
+    model_name: str
+) -> str:
+    """Content hash of everything that determines an analysis result"""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model_name, normalize_text(resume_text), normalize_text(job_description)):
+        encoded = part.encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") hash differently
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    # Distinguish "no job description" from an empty one
+    digest.update(b"\x01" if job_description is not None else b"\x00")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for analysis results.
+
+    The memory tier is a bounded LRU with a TTL; the optional SQLite tier
+    (enabled by passing `db_path`) survives restarts and is consulted on
+    memory misses. Writes to SQLite are queued to a background thread, so
+    set() never waits on disk; async callers use get_async() to keep disk
+    reads off the event loop. Values must be JSON-serializable and are
+    returned as fresh copies, so callers may mutate them freely.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "diskHits": 0}
+        self._db = None
+        # Serializes use of the SQLite connection between readers and the writer thread
+        self._db_lock = threading.Lock()
+        self._writes: "queue.Queue[Tuple[str, tuple]]" = queue.Queue()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM results WHERE created_at < ?", (time.time() - ttl_seconds,))
+            self._db.commit()
+            threading.Thread(target=self._write_behind, name="result-cache-writer", daemon=True).start()
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """Build a cache from ATS_CACHE_* environment variables"""
+        return cls(
+            max_entries=int(os.getenv("ATS_CACHE_MAX_ENTRIES", "512")),
+            ttl_seconds=float(os.getenv("ATS_CACHE_TTL_SECONDS", "3600")),
+            db_path=os.getenv("ATS_CACHE_DB_PATH") or None
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        payload = self._get_from_memory(key)
+        if payload is None and self._db is not None:
+            payload = self._get_from_disk(key)
+        return self._counted(payload)
+
+    async def get_async(self, key: str) -> Optional[Dict]:
+        """get() for async callers: a SQLite lookup runs in a worker thread"""
+        payload = self._get_from_memory(key)
+        if payload is None and self._db is not None:
+            payload = await asyncio.to_thread(self._get_from_disk, key)
+        return self._counted(payload)
+
+    def set(self, key: str, value: Dict) -> None:
+        payload = json.dumps(value)
+        created_at = time.time()
+        with self._lock:
+            self._store_in_memory(key, created_at, payload)
+        if self._db is not None:
+            self._writes.put((
+                "INSERT OR REPLACE INTO results (key, value, created_at) VALUES (?, ?, ?)",
+                (key, payload, created_at)
+            ))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self._db is not None:
+            self._writes.put(("DELETE FROM results", ()))
+            self.flush()
+
+    def flush(self) -> None:
+        """Wait until every queued SQLite write is committed"""
+        self._writes.join()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "diskEnabled": self._db is not None
+            }
+
+    def _get_from_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, payload = entry
+            if time.time() - created_at <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return payload
+            del self._entries[key]
+            self._counters["expirations"] += 1
+            return None
+
+    def _get_from_disk(self, key: str) -> Optional[str]:
+        with self._db_lock:
+            row = self._db.execute("SELECT value, created_at FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        payload, created_at = row
+        with self._lock:
+            if time.time() - created_at <= self.ttl_seconds:
+                self._store_in_memory(key, created_at, payload)
+                self._counters["diskHits"] += 1
+                return payload
+            self._counters["expirations"] += 1
+        self._writes.put(("DELETE FROM results WHERE key = ? AND created_at = ?", (key, created_at)))
+        return None
+
+    def _counted(self, payload: Optional[str]) -> Optional[Dict]:
+        with self._lock:
+            self._counters["hits" if payload is not None else "misses"] += 1
+        return json.loads(payload) if payload is not None else None
+
+    def _write_behind(self) -> None:
+        while True:
+            statement, params = self._writes.get()
+            try:
+                with self._db_lock:
+                    self._db.execute(statement, params)
+                    # Commit once the queue drains, so a burst of writes shares one commit
+                    if self._writes.empty():
+                        self._db.commit()
+            except sqlite3.Error as e:
+                # The memory tier still has the value; only persistence is lost
+                logger.warning("Could not write to result cache %s (%s).", self.db_path, e)
+            finally:
+                self._writes.task_done()
+
+    def _store_in_memory(self, key: str, created_at: float, payload: str) -> None:
+        # Caller must hold self._lock
+        self._entries[key] = (created_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
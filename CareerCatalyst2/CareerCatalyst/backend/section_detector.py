@@ -0,0 +1,82 @@
+import re
+from typing import Dict, Optional, Tuple
+from formatting_rules import find_email
+from regex_engine import compile_detector
+
+# Section name -> keyword patterns (matched case-insensitively on word boundaries)
+SECTION_PATTERNS = {
+    "Summary / Objective": [r'summary', r'objective', r'profile', r'about\s+me'],
+    "Skills": [r'skills', r'technical\s+skills', r'core\s+competencies', r'expertise'],
+    "Work Experience": [r'experience', r'employment', r'work\s+history', r'professional\s+experience'],
+    "Education": [r'education', r'academic', r'degree', r'university', r'college'],
+    "Certifications": [r'certifications?', r'certified', r'licenses?'],
+    "Projects": [r'projects?', r'portfolio'],
+    "Languages": [r'languages?', r'multilingual', r'fluent\s+in'],
+}
+
+# Order in which sections are reported (matches the original detector output)
+SECTION_ORDER = [
+    "Contact Info",
+    "Summary / Objective",
+    "Skills",
+    "Work Experience",
+    "Education",
+    "Certifications",
+    "Projects",
+    "Languages",
+]
+
+def _compile_section_regex(flags: int = 0) -> Tuple[re.Pattern, Dict[str, str]]:
+    """Compile every section pattern into one named-group alternation"""
+    group_to_section = {}
+    groups = []
+    for index, (section, patterns) in enumerate(SECTION_PATTERNS.items()):
+        name = f"s{index}"
+        group_to_section[name] = section
+        # Longer alternatives first so the match covers the full heading
+        alternatives = "|".join(sorted(patterns, key=len, reverse=True))
+        groups.append(f"(?P<{name}>{alternatives})")
+    # Every pattern starts with a literal letter; with re, the lookahead lets the
+    # scanner skip positions that cannot start any heading before trying the alternation.
+    first_chars = "".join(sorted({pattern[0] for patterns in SECTION_PATTERNS.values() for pattern in patterns}))
+    regex = compile_detector(f"\\b(?:{'|'.join(groups)})\\b", flags, prefilter=f"(?=[{first_chars}])")
+    return regex, group_to_section
+
+# Matched against lowercased text; the IGNORECASE variant is only used when
+# lowercasing would change the text length and so shift the offsets.
+SECTION_REGEX, _GROUP_TO_SECTION = _compile_section_regex()
+SECTION_REGEX_IGNORECASE, _ = _compile_section_regex(re.IGNORECASE)
+
+def scan_sections(resume_text: str, formatting: Optional[Dict] = None) -> Tuple[Dict[str, bool], Dict[str, int]]:
+    """
+    Scan the resume once and return (sections, offsets).
+
+    `sections` has the same shape as ats_analyzer.detect_resume_sections;
+    `offsets` maps each detected section to the character index of its first hit.
+    `formatting` is formatting_rules.scan_formatting's result for the same
+    text, if there is one; its email address is used instead of searching again.
+    """
+    offsets: Dict[str, int] = {}
+
+    email_offset = formatting["email"] if formatting is not None else find_email(resume_text)
+    if email_offset is not None:
+        offsets["Contact Info"] = email_offset
+
+    text_lower = resume_text.lower()
+    if len(text_lower) == len(resume_text):
+        matches = SECTION_REGEX.finditer(text_lower)
+    else:
+        matches = SECTION_REGEX_IGNORECASE.finditer(resume_text)
+
+    remaining = len(SECTION_PATTERNS)
+    for match in matches:
+        section = _GROUP_TO_SECTION[match.lastgroup]
+        if section not in offsets:
+            offsets[section] = match.start()
+            remaining -= 1
+            if remaining == 0:
+                break
+
+    sections = {section: section in offsets for section in SECTION_ORDER}
+    return sections, offsets
+
@@ -0,0 +1,427 @@
+import hashlib
+import importlib.util
+import logging
+import math
+import os
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+import model_registry
+from job_matching import index_terms, listing_text
+from section_detector import scan_sections
+from skills_taxonomy import skill_taxonomy
+
+try:
+    import fcntl
+except ImportError:  # Windows: no file locks, so one process should write a cache
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# "auto" uses a local sentence-transformers model when the package is installed
+# and hashed embeddings otherwise; "hashing" always hashes; "off" disables the stage
+SEMANTIC_ENCODER = os.getenv("SEMANTIC_ENCODER", "auto")
+SEMANTIC_MODEL_NAME = os.getenv("SEMANTIC_MODEL_NAME", "all-MiniLM-L6-v2")
+SEMANTIC_HASHING_DIM = int(os.getenv("SEMANTIC_HASHING_DIM", "384"))
+SEMANTIC_BATCH_SIZE = int(os.getenv("SEMANTIC_BATCH_SIZE", "64"))
+
+# Job listing embeddings are cached on disk by content hash; an empty value keeps them in memory only
+SEMANTIC_CACHE_DIR = os.getenv("SEMANTIC_CACHE_DIR", os.path.join(BACKEND_DIR, "data", "embeddings"))
+
+# Embeddings of resumes and pasted job descriptions, kept in memory only (least recently used evicted)
+SEMANTIC_MEMORY_CACHE_ENTRIES = int(os.getenv("SEMANTIC_MEMORY_CACHE_ENTRIES", "2048"))
+
+# Resume sections averaged into the semantic_match score (best matching first)
+SEMANTIC_TOP_SECTIONS = 3
+
+
+class HashingEncoder:
+    """
+    Embeddings without a model: signed feature hashing of words, their
+    character trigrams and their canonical skill names.
+
+    Trigrams let "developer" and "development" share most of their features;
+    the skill feature puts an alias and its canonical name ("k8s",
+    "kubernetes") on the same dimension. Word counts are damped with
+    1 + log(count) and every vector is L2-normalized.
+    """
+
+    def __init__(self, dim: int = SEMANTIC_HASHING_DIM):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+        self._token_features = lru_cache(maxsize=1 << 18)(self._features)
+
+    def _hash(self, feature: str) -> Tuple[int, float]:
+        value = zlib.crc32(feature.encode("utf-8"))
+        return value % self.dim, 1.0 if value & 0x80000000 else -1.0
+
+    def _features(self, token: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(dimensions, signed weights) contributed by one occurrence of a word"""
+        padded = f"<{token}>"
+        trigrams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+        features = [(f"w:{token}", 1.0)] + [(f"c:{trigram}", 1.0 / len(trigrams)) for trigram in trigrams]
+        canonical = skill_taxonomy.normalize(token)
+        if canonical is not None:
+            features.append((f"s:{canonical}", 1.0))
+        dims, weights = [], []
+        for feature, weight in features:
+            dim, sign = self._hash(feature)
+            dims.append(dim)
+            weights.append(sign * weight)
+        return np.array(dims, dtype=np.int64), np.array(weights, dtype=np.float32)
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        # Texts x words count matrix times words x dimensions feature matrix,
+        # so each distinct word in the batch is hashed (or fetched) only once
+        words: Dict[str, int] = {}
+        lookup = words.setdefault
+        lengths = np.zeros(len(texts), dtype=np.int64)
+        word_ids: List[int] = []
+        for row, text in enumerate(texts):
+            terms = index_terms(text)
+            lengths[row] = len(terms)
+            word_ids.extend(lookup(term, len(words)) for term in terms)
+        counts = sparse.csr_matrix(
+            (np.ones(len(word_ids), dtype=np.float32), (np.repeat(np.arange(len(texts)), lengths), word_ids)),
+            shape=(len(texts), len(words))
+        )
+        counts.sum_duplicates()
+        counts.data = 1 + np.log(counts.data)
+
+        features = [self._token_features(word) for word in words]
+        indptr = np.zeros(len(words) + 1, dtype=np.int64)
+        np.cumsum([len(dims) for dims, _ in features], out=indptr[1:])
+        feature_matrix = sparse.csr_matrix(
+            (
+                np.concatenate([weights for _, weights in features]) if features else np.zeros(0, np.float32),
+                np.concatenate([dims for dims, _ in features]) if features else np.zeros(0, np.int64),
+                indptr
+            ),
+            shape=(len(words), self.dim)
+        )
+        vectors = (counts @ feature_matrix).toarray()
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.where(norms > 0, norms, 1)).astype(np.float32)
+
+
+class SentenceEncoder:
+    """A small local sentence-transformers model (e.g. all-MiniLM-L6-v2) run on CPU"""
+
+    def __init__(self, model):
+        self._model = model
+        self.dim = model.get_sentence_embedding_dimension()
+        self.name = f"st-{SEMANTIC_MODEL_NAME.replace('/', '_')}-{self.dim}"
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self._model.encode(
+            list(texts), batch_size=SEMANTIC_BATCH_SIZE, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return vectors.astype(np.float32)
+
+
+class EmbeddingCache:
+    """
+    Embeddings keyed by content hash, stored as rows of a float32 matrix.
+
+    With a path the matrix is a memory-mapped file (`<path>.f32`), next to
+    an append-only list of row keys (`<path>.keys`), so embeddings survive
+    restarts and are paged in only when used. The file grows by doubling.
+    Vectors are written before their key is, so a crash never leaves a key
+    pointing at a missing row. Processes sharing a cache (uvicorn workers)
+    write under an exclusive lock on `<path>.lock`, after picking up the rows
+    the others appended.
+    """
+
+    def __init__(self, dim: int, path: Optional[str] = None):
+        self.dim = dim
+        self.path = path
+        self._rows: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        # Bytes of the keys file already read into _rows
+        self._keys_read = 0
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with self._file_lock():
+                if not os.path.exists(path + ".f32"):
+                    open(path + ".f32", "wb").close()
+                self._sync()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _sync(self) -> None:
+        """Map rows other processes added and the file as they grew it (caller holds the file lock)"""
+        data_path = self.path + ".f32"
+        capacity = os.path.getsize(data_path) // (self.dim * 4)
+        if capacity > len(self._matrix):
+            self._matrix = np.memmap(data_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        if not os.path.exists(self.path + ".keys"):
+            return
+        with open(self.path + ".keys", "rb") as key_file:
+            key_file.seek(self._keys_read)
+            appended = key_file.read()
+        # A line without its newline yet is read next time
+        appended = appended[:appended.rfind(b"\n") + 1]
+        self._keys_read += len(appended)
+        for key in appended.decode("ascii").split():
+            self._rows.setdefault(key, len(self._rows))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def lookup(self, keys: Sequence[str]) -> np.ndarray:
+        """Row of each key, -1 for keys not cached"""
+        rows = self._rows
+        return np.fromiter((rows.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        return np.asarray(self._matrix[rows])
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        with self._lock:
+            if not self.path:
+                self._add(keys, vectors)
+                return
+            with self._file_lock():
+                self._sync()
+                self._add(keys, vectors)
+
+    def _add(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        # Caller must hold self._lock (and the file lock)
+        new = [(key, vector) for key, vector in zip(keys, vectors) if key not in self._rows]
+        if not new:
+            return
+        start = len(self._rows)
+        self._reserve(start + len(new))
+        self._matrix[start:start + len(new)] = np.stack([vector for _, vector in new])
+        if self.path:
+            self._matrix.flush()
+            appended = "".join(f"{key}\n" for key, _ in new).encode("ascii")
+            with open(self.path + ".keys", "ab") as key_file:
+                key_file.write(appended)
+            self._keys_read += len(appended)
+        for offset, (key, _) in enumerate(new):
+            self._rows[key] = start + offset
+
+    def _reserve(self, rows: int) -> None:
+        # Caller must hold self._lock (and the file lock)
+        capacity = len(self._matrix)
+        if rows <= capacity:
+            return
+        capacity = max(1024, capacity * 2, rows)
+        if not self.path:
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:len(self._matrix)] = self._matrix
+            self._matrix = grown
+            return
+        data_path = self.path + ".f32"
+        with open(data_path, "r+b") as data:
+            data.truncate(capacity * self.dim * 4)
+        self._matrix = np.memmap(data_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+
+class Embedder:
+    """
+    Embeds texts in batches, reusing cached embeddings of texts seen before.
+
+    Job listings are embedded with persist=True into the shared, usually
+    on-disk EmbeddingCache. Everything else (resume sections, pasted job
+    descriptions) goes to a bounded in-memory LRU, so an analysis never
+    grows the cache file or waits on disk I/O.
+    """
+
+    def __init__(self, encoder, cache: EmbeddingCache, memory_entries: int = SEMANTIC_MEMORY_CACHE_ENTRIES):
+        self.encoder = encoder
+        self.cache = cache
+        self.memory_entries = memory_entries
+        self._recent: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def dim(self) -> int:
+        return self.encoder.dim
+
+    def content_key(self, text: str) -> str:
+        digest = hashlib.sha256(self.encoder.name.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(text.strip().encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def embed(self, texts: Sequence[str], persist: bool = False) -> np.ndarray:
+        """(len(texts), dim) L2-normalized float32 embeddings; persist=True caches them in self.cache"""
+        if not persist:
+            return self._embed_recent(texts)
+        keys = [self.content_key(text) for text in texts]
+        rows = self.cache.lookup(keys)
+        missing = {key: text for key, text, row in zip(keys, texts, rows) if row < 0}
+        with self._lock:
+            self._counters["hits"] += len(keys) - int((rows < 0).sum())
+            self._counters["misses"] += len(missing)
+        if missing:
+            pending = list(missing.items())
+            for start in range(0, len(pending), SEMANTIC_BATCH_SIZE):
+                batch = pending[start:start + SEMANTIC_BATCH_SIZE]
+                self.cache.add([key for key, _ in batch], self.encoder.encode([text for _, text in batch]))
+            rows = self.cache.lookup(keys)
+        return self.cache.vectors(rows)
+
+    def _embed_recent(self, texts: Sequence[str]) -> np.ndarray:
+        keys = [self.content_key(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._recent.get(key)
+                if vector is not None:
+                    self._recent.move_to_end(key)
+                    found[key] = vector
+            self._counters["hits"] += sum(1 for key in keys if key in found)
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            pending = list(missing.items())
+            for start in range(0, len(pending), SEMANTIC_BATCH_SIZE):
+                batch = pending[start:start + SEMANTIC_BATCH_SIZE]
+                found.update(zip((key for key, _ in batch), self.encoder.encode([text for _, text in batch])))
+            with self._lock:
+                self._counters["misses"] += len(missing)
+                for key in missing:
+                    self._recent[key] = found[key]
+                    self._recent.move_to_end(key)
+                while len(self._recent) > self.memory_entries:
+                    self._recent.popitem(last=False)
+                    self._counters["evictions"] += 1
+        if not keys:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._counters, "encoder": self.encoder.name, "cached": len(self.cache),
+                "inMemory": len(self._recent)
+            }
+
+
+def _load_embedder() -> Optional[Embedder]:
+    if SEMANTIC_ENCODER == "off":
+        return None
+    if SEMANTIC_ENCODER not in ("auto", "hashing", "sentence-transformers"):
+        logger.warning("Unknown SEMANTIC_ENCODER '%s'. Using hashed embeddings.", SEMANTIC_ENCODER)
+    encoder = None
+    if SEMANTIC_ENCODER == "sentence-transformers" or (
+        SEMANTIC_ENCODER == "auto" and importlib.util.find_spec("sentence_transformers")
+    ):
+        model = model_registry.get_sentence_encoder(SEMANTIC_MODEL_NAME)
+        if model is not None:
+            encoder = SentenceEncoder(model)
+    if encoder is None:
+        encoder = HashingEncoder()
+    path = os.path.join(SEMANTIC_CACHE_DIR, encoder.name) if SEMANTIC_CACHE_DIR else None
+    try:
+        cache = EmbeddingCache(encoder.dim, path)
+    except OSError as e:
+        logger.warning("Could not open embedding cache at %s (%s). Caching embeddings in memory.", path, e)
+        cache = EmbeddingCache(encoder.dim)
+    return Embedder(encoder, cache)
+
+
+model_registry.register("semantic-embedder", _load_embedder)
+
+
+def get_embedder() -> Optional[Embedder]:
+    """Shared embedder, or None when SEMANTIC_ENCODER is "off" """
+    return model_registry.get("semantic-embedder")
+
+
+def resume_sections(resume_text: str) -> List[str]:
+    """The resume split at each detected section heading (the part before the first one included)"""
+    _, offsets = scan_sections(resume_text)
+    cuts = sorted({0, *offsets.values(), len(resume_text)})
+    chunks = [resume_text[start:end].strip() for start, end in zip(cuts, cuts[1:])]
+    return [chunk for chunk in chunks if chunk] or [resume_text]
+
+
+def semantic_match_score(resume_text: str, job_description: Optional[str]) -> Optional[int]:
+    """
+    0-100 similarity of the resume to the job description: the mean cosine
+    similarity of the best matching resume sections. None without a job
+    description or with the semantic stage turned off.
+    """
+    if not job_description or not job_description.strip():
+        return None
+    embedder = get_embedder()
+    if embedder is None:
+        return None
+    sections = resume_sections(resume_text)
+    vectors = embedder.embed(sections + [job_description])
+    similarities = np.sort(vectors[:-1] @ vectors[-1])[-SEMANTIC_TOP_SECTIONS:]
+    return round(100 * max(0.0, float(similarities.mean())))
+
+
+class SemanticJobIndex:
+    """
+    Embeddings of every listing as one row-normalized float32 matrix, so
+    ranking all listings against a resume is a single matrix-vector product
+    followed by a partial sort. Rebuilding after a crawl only embeds the
+    listings not already in the embedding cache.
+    """
+
+    def __init__(self, vectors: np.ndarray, embedder: Embedder, listing_ids: np.ndarray,
+                 jobs: List[Dict], generation: int = 0):
+        self._vectors = vectors
+        self._embedder = embedder
+        self.listing_ids = listing_ids
+        self.jobs = jobs
+        self.generation = generation
+
+    @classmethod
+    def build(cls, listings: Sequence[Tuple[int, Dict]], generation: int = 0,
+              embedder: Optional[Embedder] = None) -> "SemanticJobIndex":
+        embedder = embedder or get_embedder()
+        if embedder is None:
+            raise ValueError("Semantic matching is turned off (SEMANTIC_ENCODER=off)")
+        if listings:
+            vectors = embedder.embed([listing_text(job) for _, job in listings], persist=True)
+        else:
+            vectors = np.zeros((0, embedder.dim), dtype=np.float32)
+        listing_ids = np.fromiter((listing_id for listing_id, _ in listings), dtype=np.int64, count=len(listings))
+        return cls(vectors, embedder, listing_ids, [job for _, job in listings], generation)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def scores(self, text: str) -> np.ndarray:
+        """Cosine similarity of every listing to text"""
+        return self._vectors @ self._embedder.embed([text])[0]
+
+    def rank(self, text: str, limit: int = 20) -> List[Dict]:
+        """Most similar listings, highest first: [{"listingId", "score", "job"}]"""
+        if not len(self.jobs):
+            return []
+        scores = self.scores(text)
+        limit = max(1, min(limit, len(scores)))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {"listingId": int(self.listing_ids[row]), "score": round(float(scores[row]), 3), "job": self.jobs[row]}
+            for row in top if scores[row] > 0
+        ]
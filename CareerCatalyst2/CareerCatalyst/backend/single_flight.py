@@ -0,0 +1,50 @@
+import asyncio
+import copy
+import threading
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Concurrent callers with the same key share one in-flight computation
+    instead of each starting their own. The computation runs as a task of
+    its own, so a caller that goes away (e.g. a closed browser tab) does not
+    cancel it for the others. Once it finishes the key is forgotten; later
+    callers start a new computation (or hit a cache in front of this).
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Result of `factory()` for this key, shared with every concurrent
+        caller of the same key. Each caller gets its own copy of the result,
+        so callers may modify it.
+        """
+        task = self._tasks.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self._count("executions")
+        else:
+            self._count("coalesced")
+        self._count("calls")
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._counters, "inFlight": len(self._tasks)}
@@ -0,0 +1,298 @@
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from keyword_matcher import INDUSTRY_TERMS, SOFT_SKILLS, TECHNICAL_KEYWORDS, TOKEN_PATTERN, tokenize
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Alias dictionary (format described at the top of the file) and its compiled index
+SKILLS_TAXONOMY_PATH = os.getenv("SKILLS_TAXONOMY_PATH", os.path.join(BACKEND_DIR, "data", "skills_taxonomy.txt"))
+SKILLS_INDEX_PATH = os.getenv("SKILLS_INDEX_PATH") or os.path.splitext(SKILLS_TAXONOMY_PATH)[0] + ".idx"
+
+CATEGORIES = ("technical", "soft", "industry")
+
+# Index layout (little-endian):
+#   header  magic, version, slot count (power of two), skill count, longest alias in words
+#   slots   open-addressing hash table keyed by space-joined alias tokens, holding every
+#           alias and every word prefix of a multi-word alias (a trie flattened into a
+#           hash table): crc32, key offset, key length (0 = empty slot), 1 if longer
+#           aliases continue from this key, skill id (-1 for a prefix that is not an alias)
+#   skills  name offset, name length, category index
+#   strings UTF-8 keys and skill names, offsets relative to the start of this block
+INDEX_MAGIC = b"SKTX"
+INDEX_VERSION = 1
+HEADER = struct.Struct("<4sIIII")
+SLOT = struct.Struct("<IIHHi")
+SKILL = struct.Struct("<IHBx")
+
+# (category, canonical name, aliases)
+SkillEntry = Tuple[str, str, List[str]]
+
+def parse_taxonomy(lines: Iterable[str]) -> List[SkillEntry]:
+    """Parse "canonical: alias, alias" lines grouped under [category] headers"""
+    entries = []
+    category = CATEGORIES[0]
+    for line_number, raw in enumerate(lines, 1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            category = line[1:-1].strip().lower()
+            if category not in CATEGORIES:
+                raise ValueError(f"Line {line_number}: unknown category '{category}'")
+            continue
+        canonical, _, aliases = line.partition(":")
+        canonical = canonical.strip().lower()
+        if not canonical:
+            raise ValueError(f"Line {line_number}: missing skill name")
+        entries.append((category, canonical, [alias.strip() for alias in aliases.split(",") if alias.strip()]))
+    return entries
+
+def default_entries() -> List[SkillEntry]:
+    """The built-in keyword lists, used when no taxonomy file is available"""
+    return (
+        [("technical", term, []) for term in TECHNICAL_KEYWORDS]
+        + [("soft", term, []) for term in SOFT_SKILLS]
+        + [("industry", term, []) for term in INDUSTRY_TERMS]
+    )
+
+def build_index(entries: Iterable[SkillEntry]) -> bytes:
+    """Compile taxonomy entries into the binary index read by SkillTaxonomy"""
+    names: List[Tuple[str, int]] = []
+    skill_ids: Dict[str, int] = {}
+    # alias or alias prefix -> [skill id, 1 if longer aliases continue from it]
+    keys: Dict[str, List[int]] = {}
+    conflicts = 0
+    for category, canonical, aliases in entries:
+        skill_id = skill_ids.get(canonical)
+        if skill_id is None:
+            skill_id = skill_ids[canonical] = len(names)
+            names.append((canonical, CATEGORIES.index(category)))
+        for alias in [canonical] + aliases:
+            tokens = tokenize(alias)
+            if not tokens:
+                continue
+            entry = keys.setdefault(" ".join(tokens), [-1, 0])
+            if entry[0] == -1:
+                entry[0] = skill_id
+            elif entry[0] != skill_id:
+                # First definition wins
+                conflicts += 1
+            for size in range(1, len(tokens)):
+                keys.setdefault(" ".join(tokens[:size]), [-1, 0])[1] = 1
+    if conflicts:
+        logger.warning("%d skill aliases map to more than one skill; kept the first definition", conflicts)
+
+    strings = bytearray()
+    slot_count = 8
+    while slot_count < len(keys) * 2:
+        slot_count *= 2
+    slots = [None] * slot_count
+    for key, (skill_id, continues) in keys.items():
+        encoded = key.encode("utf-8")
+        key_hash = zlib.crc32(encoded)
+        index = key_hash & (slot_count - 1)
+        while slots[index] is not None:
+            index = (index + 1) & (slot_count - 1)
+        slots[index] = SLOT.pack(key_hash, len(strings), len(encoded), continues, skill_id)
+        strings += encoded
+
+    skills = bytearray()
+    for name, category_index in names:
+        encoded = name.encode("utf-8")
+        skills += SKILL.pack(len(strings), len(encoded), category_index)
+        strings += encoded
+
+    longest = max((len(key.split(" ")) for key in keys), default=0)
+    empty_slot = SLOT.pack(0, 0, 0, 0, -1)
+    return b"".join([
+        HEADER.pack(INDEX_MAGIC, INDEX_VERSION, slot_count, len(names), longest),
+        b"".join(slot or empty_slot for slot in slots),
+        bytes(skills),
+        bytes(strings)
+    ])
+
+def compile_taxonomy(source_path: str = SKILLS_TAXONOMY_PATH, index_path: str = SKILLS_INDEX_PATH) -> int:
+    """Rebuild the index file from the taxonomy file; returns the number of skills"""
+    with open(source_path, encoding="utf-8") as source:
+        entries = parse_taxonomy(source)
+    data = build_index(entries)
+    # Write then rename so concurrent workers never map a half-written file
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as index_file:
+        index_file.write(data)
+    os.replace(tmp_path, index_path)
+    return len({canonical for _, canonical, _ in entries})
+
+class SkillTaxonomy:
+    """
+    Normalized skill extraction over a compiled taxonomy index.
+
+    The index is used in place (usually a read-only memory map), so loading is
+    constant time and worker processes share the same pages. Each distinct
+    document word costs one hash-table probe regardless of taxonomy size, and
+    multi-word aliases are followed one word at a time only while a known
+    prefix continues. Aliases resolve to their canonical skill; the longest
+    alias wins.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        magic, version, slot_count, skill_count, _ = HEADER.unpack_from(buffer, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError("Not a compatible skills index")
+        self._buffer = buffer
+        self._mask = slot_count - 1
+        self._slots_offset = HEADER.size
+        self._skills_offset = self._slots_offset + slot_count * SLOT.size
+        self._strings_offset = self._skills_offset + skill_count * SKILL.size
+        self._skill_count = skill_count
+        self._names: Dict[int, Tuple[str, str]] = {}
+
+    @classmethod
+    def open(cls, index_path: str) -> "SkillTaxonomy":
+        with open(index_path, "rb") as index_file:
+            return cls(mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self._skill_count
+
+    def _lookup(self, key: str) -> Tuple[int, int]:
+        """(skill id or -1, 1 if longer aliases continue) for space-joined tokens"""
+        encoded = key.encode("utf-8")
+        key_hash = zlib.crc32(encoded)
+        buffer = self._buffer
+        index = key_hash & self._mask
+        while True:
+            slot_hash, offset, length, continues, skill_id = SLOT.unpack_from(buffer, self._slots_offset + index * SLOT.size)
+            if length == 0:
+                return -1, 0
+            if slot_hash == key_hash and length == len(encoded):
+                start = self._strings_offset + offset
+                if buffer[start:start + length] == encoded:
+                    return skill_id, continues
+            index = (index + 1) & self._mask
+
+    def _skill(self, skill_id: int) -> Tuple[str, str]:
+        """(canonical name, category) for a skill id"""
+        skill = self._names.get(skill_id)
+        if skill is None:
+            offset, length, category_index = SKILL.unpack_from(self._buffer, self._skills_offset + skill_id * SKILL.size)
+            start = self._strings_offset + offset
+            skill = self._names[skill_id] = (self._buffer[start:start + length].decode("utf-8"), CATEGORIES[category_index])
+        return skill
+
+    def _match(self, words: List[str]) -> List[Tuple[int, int, int]]:
+        """(skill id, first word index, word count) of each non-overlapping match, longest alias first"""
+        # Probe each distinct word once; resumes repeat most of their vocabulary
+        entries = {word: self._lookup(word) for word in set(words)}
+        relevant = {word for word, (skill_id, continues) in entries.items() if skill_id >= 0 or continues}
+        matches = []
+        next_free = 0
+        for i in [i for i, word in enumerate(words) if word in relevant]:
+            if i < next_free:
+                continue
+            skill_id, continues = entries[words[i]]
+            length = 1
+            phrase = words[i]
+            size = 1
+            while continues and i + size < len(words):
+                phrase = f"{phrase} {words[i + size]}"
+                size += 1
+                phrase_id, continues = self._lookup(phrase)
+                if phrase_id >= 0:
+                    skill_id, length = phrase_id, size
+            if skill_id >= 0:
+                matches.append((skill_id, i, length))
+                next_free = i + length
+        return matches
+
+    def normalize(self, term: str) -> Optional[str]:
+        """Canonical skill name for an alias, or None if it is not in the taxonomy"""
+        skill_id, _ = self._lookup(" ".join(tokenize(term)))
+        return self._skill(skill_id)[0] if skill_id >= 0 else None
+
+    def normalize_all(self, terms: Iterable[str]) -> List[str]:
+        """Canonical names for terms (unknown terms kept as given), without duplicates"""
+        return list(dict.fromkeys(self.normalize(str(term)) or term for term in terms))
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Occurrences of each canonical skill in text, in order of first appearance"""
+        counts: Dict[str, int] = {}
+        for skill_id, _, _ in self._match(list(tokenize(text))):
+            name = self._skill(skill_id)[0]
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def skills_in(self, text: str, category: Optional[str] = None) -> List[str]:
+        """Canonical skills mentioned in text, optionally limited to one category"""
+        skills = []
+        for skill_id in dict.fromkeys(skill_id for skill_id, _, _ in self._match(list(tokenize(text)))):
+            name, skill_category = self._skill(skill_id)
+            if category is None or skill_category == category:
+                skills.append(name)
+        return skills
+
+    def skills_by_category(self, text: str) -> Dict[str, List[str]]:
+        """Canonical skills mentioned in text, grouped by category"""
+        grouped: Dict[str, List[str]] = {category: [] for category in CATEGORIES}
+        for skill_id in dict.fromkeys(skill_id for skill_id, _, _ in self._match(list(tokenize(text)))):
+            name, category = self._skill(skill_id)
+            grouped[category].append(name)
+        return grouped
+
+    def find_by_category(self, text: str) -> Dict[str, Dict[str, List[Tuple[int, int]]]]:
+        """
+        Canonical skills mentioned in text with the (start, end) span of every
+        mention, grouped by category, in one pass:
+        {"technical": {"python": [(120, 126), (410, 416)]}, "soft": {}, "industry": {}}
+        """
+        text_lower = text.lower()
+        spans = [match.span() for match in TOKEN_PATTERN.finditer(text_lower)]
+        words = [text_lower[start:end] for start, end in spans]
+        grouped: Dict[str, Dict[str, List[Tuple[int, int]]]] = {category: {} for category in CATEGORIES}
+        for skill_id, i, length in self._match(words):
+            name, category = self._skill(skill_id)
+            grouped[category].setdefault(name, []).append((spans[i][0], spans[i + length - 1][1]))
+        return grouped
+
+def _index_is_current(index_path: str, source_path: str) -> bool:
+    if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(source_path):
+        return False
+    with open(index_path, "rb") as index_file:
+        header = index_file.read(HEADER.size)
+    return len(header) == HEADER.size and HEADER.unpack(header)[:2] == (INDEX_MAGIC, INDEX_VERSION)
+
+def load_taxonomy(source_path: str = SKILLS_TAXONOMY_PATH, index_path: str = SKILLS_INDEX_PATH) -> SkillTaxonomy:
+    """
+    Map the compiled index, rebuilding it first when the taxonomy file is newer.
+    Falls back to the built-in keyword lists if the taxonomy file is missing.
+    """
+    if not os.path.exists(source_path):
+        if os.path.exists(index_path):
+            return SkillTaxonomy.open(index_path)
+        logger.warning("Skills taxonomy not found at %s; using built-in keyword lists", source_path)
+        return SkillTaxonomy(build_index(default_entries()))
+
+    try:
+        if not _index_is_current(index_path, source_path):
+            compile_taxonomy(source_path, index_path)
+        return SkillTaxonomy.open(index_path)
+    except OSError as e:
+        logger.warning("Could not write skills index %s (%s); keeping it in memory", index_path, e)
+        with open(source_path, encoding="utf-8") as source:
+            return SkillTaxonomy(build_index(parse_taxonomy(source)))
+
+skill_taxonomy = load_taxonomy()
+
+if __name__ == "__main__":
+    # python skills_taxonomy.py [taxonomy file] [index file]
+    source = sys.argv[1] if len(sys.argv) > 1 else SKILLS_TAXONOMY_PATH
+    index = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + ".idx"
+    print(f"Compiled {compile_taxonomy(source, index)} skills into {index}")
@@ -0,0 +1,145 @@
+import importlib.util
+import io
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional
+
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# pdfplumber and python-docx are imported on first use; only check that docx is installed
+DOCX_AVAILABLE = importlib.util.find_spec("docx") is not None
+if not DOCX_AVAILABLE:
+    logger.warning("python-docx not installed. DOCX support disabled.")
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Limits for a single upload; pages past PDF_MAX_PAGES are ignored
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+
+# PDFs with at least this many pages are split across worker processes
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    global _page_pool
+    if _page_pool is None:
+        _page_pool = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS)
+    return _page_pool
+
+def _stream_size(stream: BinaryIO) -> int:
+    """Size of a seekable stream without reading it"""
+    position = stream.tell()
+    stream.seek(0, io.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) of the PDF at pdf_path (runs in a worker process)"""
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[start:stop]]
+
+@contextmanager
+def _file_path(stream: BinaryIO) -> Iterator[str]:
+    """
+    Path of a file with the stream's contents, for worker processes to open
+    themselves. A stream read from a named file is used as it is; any other
+    (an in-memory or anonymous spooled upload) is copied to a temporary file
+    in chunks, never held in memory whole.
+    """
+    name = getattr(stream, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        yield name
+        return
+    stream.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as copy:
+        shutil.copyfileobj(stream, copy)
+    try:
+        yield copy.name
+    finally:
+        os.remove(copy.name)
+
+def iter_pdf_pages(stream: BinaryIO, parallel: bool = True) -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order, up to PDF_MAX_PAGES.
+
+    Short PDFs are read straight from the stream in this process. Longer ones
+    are split into one page range per worker, and each worker opens the file
+    by its path (see _file_path) rather than being sent the PDF's bytes;
+    pages are yielded as soon as their range is done.
+    """
+    import pdfplumber
+    with pdfplumber.open(stream) as pdf:
+        page_count = min(len(pdf.pages), PDF_MAX_PAGES)
+        if not parallel or PDF_EXTRACT_WORKERS <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+            for page in pdf.pages[:page_count]:
+                yield page.extract_text() or ""
+            return
+
+    pool = _get_page_pool()
+    chunk_size = -(-page_count // PDF_EXTRACT_WORKERS)  # ceiling division
+    with _file_path(stream) as pdf_path:
+        futures = [
+            pool.submit(_extract_page_range, pdf_path, start, min(start + chunk_size, page_count))
+            for start in range(0, page_count, chunk_size)
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            # Ranges already running still read the file
+            wait(futures)
+
+@timed("extraction")
+def extract_text_from_stream(filename: str, stream: BinaryIO, parallel: bool = True) -> str:
+    """
+    Extract text from a PDF, DOCX or TXT file object (e.g. a spooled upload)
+    without copying it into memory first
+    """
+    filename = filename.lower()
+
+    size = _stream_size(stream)
+    if size > UPLOAD_MAX_BYTES:
+        raise ValueError(f"File is too large ({size} bytes). The limit is {UPLOAD_MAX_BYTES} bytes.")
+
+    if filename.endswith('.pdf'):
+        try:
+            return "\n".join(iter_pdf_pages(stream, parallel)).strip()
+        except Exception as e:
+            raise ValueError(f"Error processing PDF file: {str(e)}")
+
+    elif filename.endswith('.docx'):
+        if not DOCX_AVAILABLE:
+            raise ValueError("DOCX support not available. Please install python-docx: pip install python-docx")
+        try:
+            from docx import Document
+            doc = Document(stream)
+            text = "\n".join([para.text for para in doc.paragraphs])
+            return text.strip()
+        except Exception as e:
+            raise ValueError(f"Error processing DOCX file: {str(e)}")
+
+    elif filename.endswith('.txt'):
+        try:
+            text = stream.read().decode('utf-8')
+            return text.strip()
+        except Exception as e:
+            raise ValueError(f"Error processing TXT file: {str(e)}")
+    else:
+        raise ValueError("Unsupported file type. Only PDF, DOCX, and TXT files are supported.")
+
+def extract_text(filename: str, file_content: bytes, parallel: bool = True) -> str:
+    """Extract text from the raw bytes of a PDF, DOCX or TXT file"""
+    return extract_text_from_stream(filename, io.BytesIO(file_content), parallel)
@@ -2,7 +2,6 @@ import React, { useRef, useState, useEffect } from 'react';
 import { Upload, FileText, CheckCircle, Target, Sparkles, ArrowRight, Zap, Brain, BarChart3, Edit3, Plus } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
 import hiringGif from '../assets/Hiring.gif';
-import axios from 'axios';
 
 function ATSResume() {
   const navigate = useNavigate();
@@ -191,8 +190,6 @@ function ATSResume() {
       const formData = new FormData();
       formData.append('resume_file', uploadedResumeFile);
 
-      let endpoint = 'http://localhost:8000/analyze-resume-file';
-
       if (analysisMode === 'with-jd') {
         // Analysis with job description
         if (uploadedJdFile) {
@@ -200,25 +197,54 @@ function ATSResume() {
         } else if (jdText.trim()) {
           formData.append('job_description_text', jdText);
         }
-      } else {
-        // Quick analysis without job description
-        endpoint = 'http://localhost:8000/analyze-resume-quick';
+      }
+      // Quick analysis simply sends no job description
+
+      // The streaming endpoint sends one JSON line per stage: detected sections and
+      // formatting issues arrive first, then the AI analysis, score and report.
+      let response;
+      try {
+        response = await fetch('http://localhost:8000/analyze-resume-file-stream', {
+          method: 'POST',
+          body: formData,
+        });
+      } catch (networkError) {
+        setError('Could not reach backend. Is it running? (CORS/network error)');
+        return;
       }
 
-      const response = await axios.post(endpoint, formData, {
-        headers: { 'Content-Type': 'multipart/form-data' },
-      });
+      if (!response.ok) {
+        const body = await response.json().catch(() => ({}));
+        setError(body.detail || 'An error occurred while analyzing your resume.');
+        return;
+      }
 
-      setResult(response.data);
-      setShowResultsModal(true); // Auto-open modal
-    } catch (err) {
-      if (err.response) {
-        setError(err.response.data?.detail || 'An error occurred while analyzing your resume.');
-      } else if (err.request) {
-        setError('Could not reach backend. Is it running? (CORS/network error)');
-      } else {
-        setError('An unexpected error occurred.');
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+
+      const handleLine = (line) => {
+        if (!line.trim()) return;
+        const { stage, data } = JSON.parse(line);
+        if (stage === 'error') {
+          setError(data.detail || 'An error occurred while analyzing your resume.');
+          return;
+        }
+        // The results modal opens as soon as the first partial result is set
+        setResult((previous) => ({ ...(previous || {}), ...data }));
+      };
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handleLine);
       }
+      handleLine(buffer);
+    } catch (err) {
+      setError('An unexpected error occurred.');
     } finally {
       setLoading(false);
     }
@@ -1148,7 +1174,12 @@ function ATSResume() {
                 textAlign: 'center'
               }}>
                 {/* Main Score Display */}
-                {result.hasJobDescription && result.skillsAnalysis?.keywordMatchPercentage !== undefined ? (
+                {result.totalScore === undefined ? (
+                  // Streaming - sections are in, AI score still on its way
+                  <div style={{ fontSize: '1.25rem', fontWeight: '600', color: '#6b7280' }}>
+                    Calculating your score...
+                  </div>
+                ) : result.hasJobDescription && result.skillsAnalysis?.keywordMatchPercentage !== undefined ? (
                   // Job Match Analysis - Show Match Percentage
                   <>
                     <div style={{